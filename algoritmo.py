@@ -1,58 +1,627 @@
+import json
+import os
+import re
+import time
+from array import array
+from collections import Counter, OrderedDict
+from diccionario import como_diccionario, FIN_DE_PALABRA, BASE_HASH, MODULO_HASH
 
-def procesar_texto(oraciones, diccionario):
+
+def procesar_texto(oraciones, diccionario, motor="conjunto", cache=None, rechazos=None, traza=None):
     """
     Procesa una lista de oraciones y un diccionario, y devuelve una lista de oraciones segmentadas.
     :param oraciones: Lista de oraciones a procesar.
-    :param diccionario: Diccionario utilizado para la segmentación.
+    :param diccionario: Diccionario utilizado para la segmentación (Diccionario o lista de palabras).
+    :param motor: Nombre del motor de segmentación a usar (ver MOTORES).
+    :param cache: CacheSegmentaciones opcional para no recalcular oraciones ya vistas.
+    :param rechazos: Counter opcional donde se cuenta qué chequeo descartó cada oración (ver segmentar_oracion).
+    :param traza: Traza opcional que recibe los contadores de cada oración segmentada (ver trazas.Traza).
     """
-    resultado = []
+    return list(procesar_flujo(oraciones, diccionario, motor, cache, rechazos, traza))
+
 
+def procesar_flujo(oraciones, diccionario, motor="conjunto", cache=None, rechazos=None, traza=None):
+    """
+    Versión perezosa de procesar_texto: consume las oraciones de a una y va devolviendo cada resultado
+    apenas se calcula, por lo que la memoria no crece con el tamaño de la entrada.
+    :param oraciones: Iterable de oraciones (por ejemplo, las líneas de un archivo que se está leyendo).
+    :param diccionario: Diccionario utilizado para la segmentación (Diccionario o lista de palabras).
+    :param motor: Nombre del motor de segmentación a usar (ver MOTORES).
+    :param cache: CacheSegmentaciones opcional para no recalcular oraciones ya vistas.
+    :param rechazos: Counter opcional donde se cuenta qué chequeo descartó cada oración (ver segmentar_oracion).
+    :param traza: Traza opcional que recibe los contadores de cada oración segmentada; las oraciones que se
+                  toman del cache no se segmentan y no generan registro.
+    """
+    diccionario = como_diccionario(diccionario)
 
+    if cache is None:
+        for oracion in oraciones:
+            yield procesar_oracion(oracion, diccionario, motor, rechazos, traza)
+        return
+
+    huella = clave_de_cache(diccionario, motor)
     for oracion in oraciones:
-        oracion_segmentada = segmentar_oracion(oracion, diccionario)
+        clave = (huella, oracion)
+        resultado = cache.obtener(clave)
+        if resultado is None:
+            resultado = procesar_oracion(oracion, diccionario, motor, rechazos, traza)
+            cache.agregar(clave, resultado)
+        yield resultado
+
+
+def clave_de_cache(diccionario, motor):
+    """
+    Primera componente de las claves del cache. Todos los motores devuelven la misma segmentación salvo 'viterbi',
+    cuyo resultado depende además de los costos de las palabras.
+    """
+    if motor == "viterbi":
+        return f"{diccionario.huella}-viterbi-{diccionario.huella_costos}"
+    return diccionario.huella
+
+
+def procesar_oracion(oracion, diccionario, motor="conjunto", rechazos=None, traza=None):
+    """
+    Segmenta una oración y devuelve el texto de salida: las palabras separadas por espacios, o "No es un mensaje".
+    """
+    oracion_segmentada = segmentar_oracion(oracion, diccionario, motor, rechazos, traza)
+
+    if oracion and not oracion_segmentada:
+        return "No es un mensaje"
+    return " ".join(oracion_segmentada)
+
+
+class SegmentadorPorPrefijos:
+    """
+    Procesa un lote de oraciones reutilizando el estado de la programación dinámica entre oraciones que
+    comparten prefijo. Las oraciones se recorren ordenadas, así cada una comparte con la anterior el prefijo
+    común más largo posible, y las posiciones de ese prefijo no se vuelven a calcular.
+    Usa el motor por conjunto, por lo que el resultado es el mismo que el de procesar_texto.
+    """
+
+    def __init__(self, diccionario):
+        self.diccionario = como_diccionario(diccionario)
+        self.caracteres_totales = 0
+        self.caracteres_reutilizados = 0
+
+    @property
+    def tasa_reutilizacion(self):
+        """
+        Fracción de las posiciones de la programación dinámica que se tomaron de una oración anterior.
+        """
+        return self.caracteres_reutilizados / self.caracteres_totales if self.caracteres_totales else 0.0
+
+    def procesar(self, oraciones):
+        """
+        Procesa las oraciones y devuelve los resultados en el orden original (como procesar_texto).
+        :param oraciones: Lista de oraciones.
+        """
+        resultado = [None] * len(oraciones)
+        existencia_parcial = [True]
+        path = [None]
+        anterior = ""
+
+        for indice in sorted(range(len(oraciones)), key=oraciones.__getitem__):
+            oracion = oraciones[indice]
+            n = len(oracion)
+            comun = len(os.path.commonprefix([anterior, oracion]))
+
+            del existencia_parcial[comun + 1:]
+            del path[comun + 1:]
+            existencia_parcial.extend([False] * (n - comun))
+            path.extend([None] * (n - comun))
+            _avanzar_conjunto(oracion, self.diccionario, existencia_parcial, path, comun + 1)
+
+            if existencia_parcial[n]:
+                resultado[indice] = " ".join(reconstruir_segmentacion(path, n, oracion))
+            else:
+                resultado[indice] = "No es un mensaje"
+
+            self.caracteres_totales += n
+            self.caracteres_reutilizados += comun
+            anterior = oracion
+
+        return resultado
+
+
+class CacheSegmentaciones:
+    """
+    Cache LRU acotado de resultados de procesar_oracion, con clave (huella del diccionario, oración).
+    Lleva la cuenta de aciertos, fallos y desalojos, y se puede guardar en disco para reutilizarlo entre ejecuciones.
+    """
+
+    def __init__(self, capacidad=100_000):
+        """
+        :param capacidad: Cantidad máxima de resultados guardados; al superarla se desaloja el menos usado.
+        """
+        self.capacidad = capacidad
+        self._entradas = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.invalidaciones = 0
+
+    def obtener(self, clave):
+        """
+        Devuelve el resultado guardado para la clave (marcándolo como recién usado), o None si no está.
+        """
+        resultado = self._entradas.get(clave)
+        if resultado is None:
+            self.fallos += 1
+            return None
+        self._entradas.move_to_end(clave)
+        self.aciertos += 1
+        return resultado
+
+    def agregar(self, clave, resultado):
+        self._entradas[clave] = resultado
+        self._entradas.move_to_end(clave)
+        while len(self._entradas) > self.capacidad:
+            self._entradas.popitem(last=False)
+            self.desalojos += 1
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def actualizar_huella(self, huella_anterior, huella_nueva, palabras_cambiadas):
+        """
+        Adapta el cache a un diccionario modificado sin vaciarlo. La segmentación de una oración solo puede
+        cambiar si alguna palabra agregada o quitada aparece en ella: esas entradas se descartan y las demás
+        pasan a la huella nueva, conservando el orden de uso. Lo mismo vale para las claves del motor 'viterbi'
+        (ver clave_de_cache): los costos no cambian al modificar las palabras, así que se conserva su sufijo.
+        :param palabras_cambiadas: Palabras agregadas o quitadas del diccionario.
+        :return: Cantidad de entradas invalidadas.
+        """
+        if not palabras_cambiadas:
+            return 0
+        # Una única pasada por oración: el patrón es la alternativa de todas las palabras cambiadas.
+        patron = re.compile("|".join(map(re.escape, palabras_cambiadas)))
+        prefijo_viterbi = f"{huella_anterior}-viterbi-"
+        invalidadas = 0
+        entradas = OrderedDict()
+        for (huella, oracion), resultado in self._entradas.items():
+            if huella == huella_anterior or huella.startswith(prefijo_viterbi):
+                if patron.search(oracion):
+                    invalidadas += 1
+                    continue
+                huella = huella_nueva + huella[len(huella_anterior):]
+            entradas[(huella, oracion)] = resultado
+        self._entradas = entradas
+        self.invalidaciones += invalidadas
+        return invalidadas
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            "entradas": len(self._entradas),
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "desalojos": self.desalojos,
+            "invalidaciones": self.invalidaciones,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+        }
+
+    def guardar(self, path):
+        """
+        Guarda las entradas en un archivo JSON, de la menos a la más recientemente usada.
+        """
+        with open(path, 'w', encoding='utf-8') as archivo:
+            json.dump([[huella, oracion, resultado] for (huella, oracion), resultado in self._entradas.items()],
+                      archivo, ensure_ascii=False)
+
+    @classmethod
+    def cargar(cls, path, capacidad=100_000):
+        """
+        Crea un cache con las entradas guardadas en path (si el archivo existe).
+        """
+        cache = cls(capacidad)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as archivo:
+                for huella, oracion, resultado in json.load(archivo):
+                    cache.agregar((huella, oracion), resultado)
+            cache.desalojos = 0
+        return cache
+
+
+def segmentar_oracion(oracion, diccionario, motor="conjunto", rechazos=None, traza=None):
+    """
+    Segmenta una oración en palabras del diccionario.
+    Antes de la programación dinámica se aplica el prefiltro de motivo_de_rechazo, y los motores cortan
+    apenas no queda ninguna posición alcanzable entre las últimas max_long.
+    :param oracion: Oración sin espacios a segmentar.
+    :param diccionario: Diccionario ya indexado, o lista de palabras (que se indexa en cada llamada).
+    :param motor: Nombre del motor de segmentación a usar (ver MOTORES).
+    :param rechazos: Counter opcional donde se suma el motivo de cada rechazo: "inicio", "fin" o "caracter"
+                     (prefiltro), "frontera" (la programación dinámica se quedó sin posiciones alcanzables)
+                     o "sin_camino" (se llegó cerca del final pero ninguna palabra lo completa).
+    :param traza: Traza opcional (ver trazas.Traza) que recibe los contadores de la oración. Sin traza no se
+                  ejecuta ningún código de instrumentación.
+    :return: Lista de palabras segmentadas, o lista vacía si no hay segmentación posible.
+    """
+    if motor not in MOTORES:
+        raise ValueError(f"Motor de segmentación desconocido: {motor}")
+
+    diccionario = como_diccionario(diccionario)
+    if traza is not None:
+        return _segmentar_con_traza(oracion, diccionario, motor, rechazos, traza)
+    n = len(oracion)
+
+    motivo = motivo_de_rechazo(oracion, diccionario)
+    if motivo is None:
+        existencia_parcial, path = MOTORES[motor](oracion, diccionario)
+        if existencia_parcial[n]:
+            return reconstruir_segmentacion(path, n, oracion)
+        motivo = "frontera" if n - _ultimo_alcanzable(existencia_parcial, n) > diccionario.max_long else "sin_camino"
+
+    if rechazos is not None:
+        rechazos[motivo] += 1
+    return []
+
+
+def _segmentar_con_traza(oracion, diccionario, motor, rechazos, traza):
+    """
+    segmentar_oracion instrumentada. La oración se segmenta primero sin cambios, para medir el tiempo sin
+    la instrumentación, y después se vuelve a correr el motor contando sus consultas al diccionario.
+    Los motores mismos no se modifican (salvo numpy, que suma sus consultas vectorizadas una vez por longitud),
+    así que la traza siempre refleja el algoritmo que se ejecuta.
+    """
+    traza.inicio(oracion)
+    motivos = Counter()
+    inicio = time.perf_counter_ns()
+    palabras = segmentar_oracion(oracion, diccionario, motor, motivos)
+    ns = time.perf_counter_ns() - inicio
+    if rechazos is not None:
+        rechazos.update(motivos)
+
+    sondeado = _DiccionarioSondeado(diccionario, oracion, traza)
+    alcanzables = 0
+    if oracion and motivo_de_rechazo(oracion, diccionario) is None:
+        if motor == "numpy":
+            from motor_numpy import segmentar_numpy
+            existencia_parcial, _ = segmentar_numpy(oracion, diccionario, sondeado.contadores)
+        else:
+            existencia_parcial, _ = MOTORES[motor](oracion, sondeado)
+        alcanzables = sum(existencia_parcial) - 1
+
+    traza.registrar({
+        "oracion": oracion,
+        "motor": motor,
+        "longitud": len(oracion),
+        "segmentacion": palabras,
+        "motivo": next(iter(motivos), None),
+        "sondas": sondeado.contadores["sondas"],
+        "aciertos": sondeado.contadores["aciertos"],
+        "alcanzables": alcanzables,
+        "palabras": len(palabras),
+        "ns": ns,
+        "ns_por_caracter": ns / len(oracion) if oracion else 0.0,
+    })
+    return palabras
+
+
+class _DiccionarioSondeado:
+    """
+    Vista de un Diccionario igual al original salvo por las estructuras de búsqueda que consultan los motores
+    (el conjunto de palabras, el trie y las tablas de hash), que cuentan cada consulta en contadores.
+    """
+
+    def __init__(self, diccionario, oracion, traza):
+        self._diccionario = diccionario
+        self._oracion = oracion
+        self._traza = traza if traza.sondas else None
+        self.contadores = Counter(sondas=0, aciertos=0)
+        self.palabras = _PalabrasSondeadas(diccionario.palabras, self)
+
+    def __getattr__(self, nombre):
+        return getattr(self._diccionario, nombre)
+
+    @property
+    def trie(self):
+        return _NodoSondeado(self._diccionario.trie, "", self)
+
+    @property
+    def tablas_hash(self):
+        return _TablasHashSondeadas(self._diccionario, self._oracion, self)
+
+    def sonda(self, subcadena, encontrada):
+        self.contadores["sondas"] += 1
+        self.contadores["aciertos"] += encontrada
+        if self._traza is not None:
+            self._traza.sonda(self._oracion, subcadena, encontrada)
+
+
+class _PalabrasSondeadas:
+    """
+    Envoltorio del conjunto de palabras: cada consulta de una subcadena es una sonda.
+    """
+
+    def __init__(self, palabras, sondeado):
+        self._palabras = palabras
+        self._sondeado = sondeado
+
+    def __contains__(self, subcadena):
+        encontrada = subcadena in self._palabras
+        self._sondeado.sonda(subcadena, encontrada)
+        return encontrada
+
 
-        if len("".join(oracion_segmentada)) < len(oracion):
-            resultado.append("No es un mensaje")
+class _NodoSondeado:
+    """
+    Envoltorio de un nodo del trie: cada paso a un hijo es una sonda del prefijo, encontrada si el prefijo existe.
+    """
+
+    def __init__(self, nodo, prefijo, sondeado):
+        self._nodo = nodo
+        self._prefijo = prefijo
+        self._sondeado = sondeado
+
+    def get(self, caracter):
+        hijo = self._nodo.get(caracter)
+        self._sondeado.sonda(self._prefijo + caracter, hijo is not None)
+        return None if hijo is None else _NodoSondeado(hijo, self._prefijo + caracter, self._sondeado)
+
+    def __contains__(self, clave):
+        return clave in self._nodo
+
+
+class _TablasHashSondeadas:
+    """
+    Envoltorio de las tablas de hash: cada búsqueda de un hash es una sonda de la subcadena de la oración
+    que tiene ese hash, encontrada si esa subcadena está entre las candidatas.
+    """
+
+    def __init__(self, diccionario, oracion, sondeado):
+        self._tablas = diccionario.tablas_hash
+        self._potencias = diccionario.potencias_hash
+        self._oracion = oracion
+        self._sondeado = sondeado
+        self._por_longitud = {}
+        self._prefijos = [0]
+        for caracter in oracion:
+            self._prefijos.append((self._prefijos[-1] * BASE_HASH + ord(caracter)) % MODULO_HASH)
+
+    def __getitem__(self, longitud):
+        if longitud not in self._por_longitud:
+            potencia = self._potencias[longitud]
+            subcadenas = {(self._prefijos[j + longitud] - self._prefijos[j] * potencia) % MODULO_HASH:
+                          self._oracion[j:j + longitud] for j in range(len(self._oracion) - longitud + 1)}
+            self._por_longitud[longitud] = _TablaHashSondeada(self._tablas[longitud], subcadenas, self._sondeado)
+        return self._por_longitud[longitud]
+
+
+class _TablaHashSondeada:
+    def __init__(self, tabla, subcadenas, sondeado):
+        self._tabla = tabla
+        self._subcadenas = subcadenas
+        self._sondeado = sondeado
+
+    def get(self, valor):
+        candidatas = self._tabla.get(valor)
+        subcadena = self._subcadenas[valor]
+        self._sondeado.sonda(subcadena, bool(candidatas) and subcadena in candidatas)
+        return candidatas
+
+
+def motivo_de_rechazo(oracion, diccionario):
+    """
+    Prefiltro barato que descarta oraciones que no pueden segmentarse sin correr la programación dinámica:
+    la oración debe empezar con la inicial de alguna palabra, terminar con el final de alguna palabra
+    y usar solo caracteres que aparecen en el diccionario.
+    :return: None si la oración pasa el prefiltro, o el motivo del rechazo ("inicio", "fin" o "caracter").
+    """
+    if not oracion:
+        return None
+    if oracion[0] not in diccionario.iniciales:
+        return "inicio"
+    if oracion[-1] not in diccionario.longitudes_por_final:
+        return "fin"
+    if not diccionario.caracteres.issuperset(oracion):
+        return "caracter"
+    return None
+
+
+def _ultimo_alcanzable(existencia_parcial, hasta):
+    """
+    Devuelve la mayor posición j <= hasta con existencia_parcial[j] (la posición 0 siempre lo es).
+    """
+    j = hasta
+    while not existencia_parcial[j]:
+        j -= 1
+    return j
+
+
+def _segmentar_conjunto(oracion, diccionario):
+    """
+    Motor por defecto: para cada posición i prueba hacia atrás las subcadenas oracion[j:i] contra el conjunto.
+    Solo se prueban las longitudes de palabras del diccionario que terminan con el carácter oracion[i - 1],
+    en orden decreciente, de modo que los j se recorren en orden creciente como en un barrido contiguo.
+    :return: Tupla (existencia_parcial, path).
+    """
+    n = len(oracion)
+    existencia_parcial = [False] * (n + 1)
+    existencia_parcial[0] = True
+    path = [None] * (n + 1)
+
+    _avanzar_conjunto(oracion, diccionario, existencia_parcial, path, 1)
+
+    return existencia_parcial, path
+
+
+def _avanzar_conjunto(oracion, diccionario, existencia_parcial, path, desde):
+    """
+    Completa existencia_parcial y path para las posiciones desde..n, suponiendo ya calculadas las anteriores.
+    El valor en la posición i solo depende de oracion[:i], lo que permite reutilizar el estado de un prefijo.
+    """
+    conjunto_diccionario = diccionario.palabras
+    longitudes_por_final = diccionario.longitudes_por_final
+    max_long = diccionario.max_long
+    ultimo = _ultimo_alcanzable(existencia_parcial, desde - 1)
+
+    for i in range(desde, len(oracion) + 1):
+        for longitud in longitudes_por_final.get(oracion[i - 1], ()):
+            j = i - longitud
+            if j >= 0 and existencia_parcial[j] and oracion[j:i] in conjunto_diccionario:
+                existencia_parcial[i] = True
+                path[i] = j
+                ultimo = i
+                break
         else:
-            resultado.append(" ".join(oracion_segmentada))
+            if i - ultimo >= max_long:
+                break  # Ninguna de las últimas max_long posiciones es alcanzable: ya no se puede avanzar
+
+
+def _segmentar_trie(oracion, diccionario):
+    """
+    Motor basado en el trie del diccionario: desde cada posición alcanzable j recorre el trie hacia adelante,
+    visitando solo prefijos reales de palabras y sin crear subcadenas para los intentos fallidos.
+    Como las posiciones j se recorren en orden creciente, cada path[i] queda con el menor j válido,
+    igual que en el motor por conjunto, por lo que ambos devuelven la misma segmentación.
+    :return: Tupla (existencia_parcial, path).
+    """
+    n = len(oracion)
+    raiz = diccionario.trie
 
-    return resultado
+    existencia_parcial = [False] * (n + 1)
+    existencia_parcial[0] = True
+    path = [None] * (n + 1)
+
+    alcance = 0
+    for j in range(n):
+        if not existencia_parcial[j]:
+            if j > alcance:
+                break  # Ninguna posición alcanzada llega hasta j: ya no se puede avanzar
+            continue
+        nodo = raiz
+        for i in range(j, n):
+            nodo = nodo.get(oracion[i])
+            if nodo is None:
+                break
+            if FIN_DE_PALABRA in nodo and not existencia_parcial[i + 1]:
+                existencia_parcial[i + 1] = True
+                path[i + 1] = j
+                alcance = max(alcance, i + 1)
 
+    return existencia_parcial, path
 
-def segmentar_oracion(oracion, diccionario):
+
+def _segmentar_hash(oracion, diccionario):
+    """
+    Motor por hash polinomial: calcula una vez los hashes de los prefijos de la oración, y cada prueba
+    de oracion[j:i] pasa a ser una resta de enteros y una búsqueda en la tabla de hashes de esa longitud.
+    Solo ante un hash presente se compara el texto (con startswith, sin crear la subcadena).
+    Recorre las longitudes igual que el motor por conjunto, por lo que devuelve la misma segmentación.
+    :return: Tupla (existencia_parcial, path).
+    """
     n = len(oracion)
-    conjunto_diccionario = set(diccionario)
-    max_long_palabra = max(len(palabra) for palabra in diccionario)
+    tablas = diccionario.tablas_hash
+    potencias = diccionario.potencias_hash
+    longitudes_por_final = diccionario.longitudes_por_final
+
+    prefijos = [0] * (n + 1)
+    valor = 0
+    for i, caracter in enumerate(oracion, 1):
+        valor = (valor * BASE_HASH + ord(caracter)) % MODULO_HASH
+        prefijos[i] = valor
 
     existencia_parcial = [False] * (n + 1)
     existencia_parcial[0] = True
     path = [None] * (n + 1)
+    max_long = diccionario.max_long
+    ultimo = 0
 
     for i in range(1, n + 1):
-        for j in range(max(0, i - max_long_palabra), i):
-            if existencia_parcial[j] and oracion[j:i] in conjunto_diccionario:
-                existencia_parcial[i] = True
-                path[i] = (j, oracion[j:i])
+        prefijo_i = prefijos[i]
+        for longitud in longitudes_por_final.get(oracion[i - 1], ()):
+            j = i - longitud
+            if j >= 0 and existencia_parcial[j]:
+                candidatas = tablas[longitud].get((prefijo_i - prefijos[j] * potencias[longitud]) % MODULO_HASH)
+                if candidatas and any(oracion.startswith(palabra, j) for palabra in candidatas):
+                    existencia_parcial[i] = True
+                    path[i] = j
+                    ultimo = i
+                    break
+        else:
+            if i - ultimo >= max_long:
                 break
 
-    if not existencia_parcial[n]:
-        return []
+    return existencia_parcial, path
+
+
+def _segmentar_numpy(oracion, diccionario):
+    """
+    Motor vectorizado con NumPy (ver motor_numpy); numpy se importa solo si se usa este motor.
+    """
+    from motor_numpy import segmentar_numpy
+    return segmentar_numpy(oracion, diccionario)
+
+
+def _segmentar_viterbi(oracion, diccionario):
+    """
+    Motor 'viterbi': en lugar del primer j válido, path[i] guarda el j que minimiza el costo acumulado
+    costo[j] + costo(oracion[j:i]), con los costos por palabra de diccionario.costos (ver asignar_costos).
+    Los costos se guardan en un array de floats; una subcadena solo se busca en el diccionario si con el costo
+    mínimo de una palabra todavía podría mejorar el mejor valor de la posición. Ante empates gana el menor j.
+    :return: Tupla (existencia_parcial, path).
+    """
+    n = len(oracion)
+    infinito = float("inf")
+    costo = array('d', [infinito]) * (n + 1)
+    costo[0] = 0.0
+    existencia_parcial = bytearray(n + 1)
+    existencia_parcial[0] = True
+    path = array('i', [-1]) * (n + 1)
+
+    conjunto_diccionario = diccionario.palabras
+    longitudes_por_final = diccionario.longitudes_por_final
+    max_long = diccionario.max_long
+    costos = diccionario.costos or {}
+    costo_por_defecto = diccionario.costo_por_defecto
+    costo_minimo = diccionario.costo_minimo
+    ultimo = 0
+
+    for i in range(1, n + 1):
+        mejor = infinito
+        for longitud in longitudes_por_final.get(oracion[i - 1], ()):
+            j = i - longitud
+            if j >= 0 and costo[j] + costo_minimo < mejor:
+                palabra = oracion[j:i]
+                if palabra in conjunto_diccionario:
+                    candidato = costo[j] + costos.get(palabra, costo_por_defecto)
+                    if candidato < mejor:
+                        mejor = candidato
+                        path[i] = j
+        if mejor < infinito:
+            costo[i] = mejor
+            existencia_parcial[i] = True
+            ultimo = i
+        elif i - ultimo >= max_long:
+            break  # Ninguna de las últimas max_long posiciones es alcanzable: ya no se puede avanzar
+
+    return existencia_parcial, path
+
 
-    return reconstruir_segmentacion(path, n)
+MOTORES = {
+    "conjunto": _segmentar_conjunto,
+    "trie": _segmentar_trie,
+    "hash": _segmentar_hash,
+    "numpy": _segmentar_numpy,
+    "viterbi": _segmentar_viterbi,
+}
 
 
-def reconstruir_segmentacion(path, n):
+def reconstruir_segmentacion(path, n, oracion):
     """
     Reconstruye la segmentación de una oración a partir del camino dado.
-    :param path: Lista de tuplas que representan el camino de segmentación.
+    Los motores solo guardan índices, así que las palabras se recortan de la oración recién acá.
+    :param path: Lista donde path[i] es el inicio j de la palabra oracion[j:i] que termina en i.
     :param n: Longitud de la oración original.
+    :param oracion: Oración original.
     :return: Lista de palabras segmentadas.
     """
     resultado = []
     idx = n
     while idx > 0:
-        j, palabra = path[idx]
-        resultado.append(palabra)
+        j = path[idx]
+        resultado.append(oracion[j:idx])
         idx = j
 
-    return resultado[::-1]
\ No newline at end of file
+    return resultado[::-1]
@@ -0,0 +1,258 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from algoritmo import procesar_texto, procesar_flujo, MOTORES
+from corpus import GeneradorCorpus
+from diccionario import Diccionario
+from indice import cargar_diccionario
+from utils import leer_lineas, escribir_resultados
+
+# Valores fijos de cada parámetro; cada escenario varía uno solo.
+#   n: palabras por oración, k: palabras del diccionario, L: longitud máxima de palabra, m: cantidad de oraciones
+PARAMETROS_BASE = {"n": 20, "k": 2000, "L": 12, "m": 500}
+ESCENARIOS = {
+    "n": [10, 20, 40, 80, 160],
+    "k": [500, 2000, 8000, 32_000, 128_000],
+    "L": [4, 8, 16, 32, 64],
+    "m": [100, 200, 400, 800, 1600],
+}
+UMBRAL_DE_REGRESION = 0.10  # Aumento relativo de la mediana a partir del cual se informa una regresión
+
+
+def generar_caso(semilla, n, k, L, m, min_long=2):
+    """
+    Genera un diccionario y oraciones de forma determinista a partir de la semilla, sin acceso a la red
+    (ver corpus.GeneradorCorpus; una fracción de las oraciones tiene un carácter que no está en el diccionario).
+    :param n: Palabras por oración.
+    :param k: Cantidad de palabras del diccionario.
+    :param L: Longitud máxima de palabra.
+    :param m: Cantidad de oraciones.
+    :return: Tupla (palabras, oraciones).
+    """
+    corpus = GeneradorCorpus(semilla, min(min_long, L), L)
+    palabras = corpus.generar_diccionario(k)
+    return palabras, list(corpus.generar_oraciones(palabras, m, n))
+
+
+def medir(oraciones, diccionario, motor, repeticiones, calentamiento=1):
+    """
+    Mide procesar_texto con time.perf_counter, descartando las primeras corridas de calentamiento.
+    :return: Diccionario con los tiempos (en segundos) y su mínimo, mediana, media y desvío.
+    """
+    for _ in range(calentamiento):
+        procesar_texto(oraciones, diccionario, motor)
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        procesar_texto(oraciones, diccionario, motor)
+        tiempos.append(time.perf_counter() - inicio)
+    return {
+        "tiempos": tiempos,
+        "minimo": min(tiempos),
+        "mediana": statistics.median(tiempos),
+        "media": statistics.mean(tiempos),
+        "desvio": statistics.stdev(tiempos) if len(tiempos) > 1 else 0.0,
+    }
+
+
+def correr_escenario(nombre, motor="conjunto", repeticiones=5, semilla=0, valores=None):
+    """
+    Corre un escenario: para cada valor del parámetro variable genera un caso, lo indexa y mide la segmentación.
+    :return: Lista de resultados, uno por valor.
+    """
+    resultados = []
+    for valor in valores or ESCENARIOS[nombre]:
+        parametros = dict(PARAMETROS_BASE, **{nombre: valor})
+        palabras, oraciones = generar_caso(semilla, **parametros)
+        inicio = time.perf_counter()
+        diccionario = Diccionario(palabras)
+        indexado = time.perf_counter() - inicio
+        medicion = medir(oraciones, diccionario, motor, repeticiones)
+        caracteres = sum(len(oracion) for oracion in oraciones)
+        resultados.append(dict(valor=valor, parametros=parametros, indexado=indexado,
+                               caracteres_por_segundo=caracteres / medicion["mediana"] if medicion["mediana"] else 0.0,
+                               **medicion))
+        print(f"{nombre}={valor}: mediana {medicion['mediana']:.4f}s "
+              f"(mín {medicion['minimo']:.4f}s, desvío {medicion['desvio']:.4f}s)", file=sys.stderr)
+    return resultados
+
+
+def _commit_actual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def correr(escenarios, motor="conjunto", repeticiones=5, semilla=0, rapido=False):
+    """
+    Corre los escenarios indicados y devuelve los resultados junto con los metadatos de la corrida.
+    :param rapido: Si es True, solo se usan los dos primeros valores de cada escenario.
+    """
+    return {
+        "metadatos": {
+            "motor": motor,
+            "repeticiones": repeticiones,
+            "semilla": semilla,
+            "commit": _commit_actual(),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "parametros_base": PARAMETROS_BASE,
+        },
+        "resultados": {
+            nombre: correr_escenario(nombre, motor, repeticiones, semilla, ESCENARIOS[nombre][:2] if rapido else None)
+            for nombre in escenarios
+        },
+    }
+
+
+def comparar(base, candidato, umbral=UMBRAL_DE_REGRESION):
+    """
+    Compara las medianas de dos corridas (por ejemplo, dos motores o dos commits) para cada escenario y valor.
+    :return: Lista de filas (escenario, valor, mediana base, mediana candidato, cociente, es_regresion).
+    """
+    filas = []
+    for nombre, resultados in base["resultados"].items():
+        del_candidato = {resultado["valor"]: resultado for resultado in candidato["resultados"].get(nombre, [])}
+        for resultado in resultados:
+            otro = del_candidato.get(resultado["valor"])
+            if otro is None:
+                continue
+            cociente = otro["mediana"] / resultado["mediana"] if resultado["mediana"] else float("inf")
+            filas.append((nombre, resultado["valor"], resultado["mediana"], otro["mediana"], cociente,
+                          cociente > 1 + umbral))
+    return filas
+
+
+def _leer_linea_por_linea(path):
+    """
+    Lectura anterior a la capa de E/S por bloques: un rstrip por línea en un bucle de Python.
+    """
+    with open(path, 'r', encoding='utf-8') as archivo:
+        for linea in archivo:
+            yield linea.rstrip('\n')
+
+
+def _escribir_linea_por_linea(resultados, salida):
+    for i, oracion in enumerate(resultados):
+        print(f"Oración {i + 1}: {oracion}", file=salida)
+    salida.flush()
+
+
+def medir_entrada_salida(path_oraciones, path_diccionario, motor="conjunto", repeticiones=5, copias=1):
+    """
+    Compara de punta a punta (leer, segmentar y escribir a os.devnull) la E/S línea por línea con la E/S por
+    bloques de utils, y cada etapa de E/S por separado.
+    :param copias: Cantidad de veces que se repite el archivo de oraciones, para agrandar la entrada.
+    :return: Diccionario etapa -> {"linea_por_linea": mediciones, "por_bloques": mediciones}.
+    """
+    diccionario = cargar_diccionario(path_diccionario)
+    with open(path_oraciones, 'r', encoding='utf-8') as archivo:
+        contenido = archivo.read()
+    if not contenido.endswith("\n"):
+        contenido += "\n"
+    resultados = procesar_texto(list(_leer_linea_por_linea(path_oraciones)), diccionario, motor) * copias
+
+    with tempfile.TemporaryDirectory() as directorio, open(os.devnull, 'w', encoding='utf-8') as nula:
+        path = os.path.join(directorio, "oraciones.txt")
+        with open(path, 'w', encoding='utf-8') as archivo:
+            archivo.write(contenido * copias)
+
+        variantes = {
+            "linea_por_linea": (_leer_linea_por_linea, _escribir_linea_por_linea),
+            "por_bloques": (leer_lineas, escribir_resultados),
+        }
+        etapas = {
+            "lectura": lambda leer, escribir: sum(1 for _ in leer(path)),
+            "escritura": lambda leer, escribir: escribir(resultados, nula),
+            "completo": lambda leer, escribir: escribir(procesar_flujo(leer(path), diccionario, motor), nula),
+        }
+        mediciones = {}
+        for etapa, correr_etapa in etapas.items():
+            mediciones[etapa] = {}
+            for variante, (leer, escribir) in variantes.items():
+                correr_etapa(leer, escribir)
+                tiempos = []
+                for _ in range(repeticiones):
+                    inicio = time.perf_counter()
+                    correr_etapa(leer, escribir)
+                    tiempos.append(time.perf_counter() - inicio)
+                mediciones[etapa][variante] = {"mediana": statistics.median(tiempos), "minimo": min(tiempos)}
+    return mediciones
+
+
+def _describir(corrida):
+    metadatos = corrida["metadatos"]
+    return f"{metadatos['motor']}@{metadatos.get('commit') or '?'}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks reproducibles de la segmentación (sin red ni pantalla).")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    parser_correr = subcomandos.add_parser("correr", help="corre escenarios y guarda los resultados en JSON")
+    parser_correr.add_argument("--escenarios", nargs="+", choices=sorted(ESCENARIOS), default=sorted(ESCENARIOS))
+    parser_correr.add_argument("--motor", choices=sorted(MOTORES), default="conjunto")
+    parser_correr.add_argument("--repeticiones", type=int, default=5)
+    parser_correr.add_argument("--semilla", type=int, default=0)
+    parser_correr.add_argument("--rapido", action="store_true", help="solo los dos primeros valores de cada escenario")
+    parser_correr.add_argument("--salida", help="archivo JSON de resultados (por defecto, la salida estándar)")
+
+    parser_comparar = subcomandos.add_parser("comparar", help="compara dos archivos de resultados")
+    parser_comparar.add_argument("base")
+    parser_comparar.add_argument("candidato")
+    parser_comparar.add_argument("--umbral", type=float, default=UMBRAL_DE_REGRESION)
+
+    parser_es = subcomandos.add_parser("entrada-salida", help="compara la E/S línea por línea con la E/S por bloques")
+    parser_es.add_argument("--oraciones", default="casos/5000_in.txt")
+    parser_es.add_argument("--diccionario", default="casos/supergigante.txt")
+    parser_es.add_argument("--motor", choices=sorted(MOTORES), default="conjunto")
+    parser_es.add_argument("--repeticiones", type=int, default=5)
+    parser_es.add_argument("--copias", type=int, default=1, help="veces que se repite el archivo de oraciones")
+
+    argumentos = parser.parse_args(argv)
+
+    if argumentos.comando == "entrada-salida":
+        mediciones = medir_entrada_salida(argumentos.oraciones, argumentos.diccionario, argumentos.motor,
+                                          argumentos.repeticiones, argumentos.copias)
+        print(f"{'Etapa':<10} {'Línea por línea':>16} {'Por bloques':>12} {'Aceleración':>12}")
+        for etapa, variantes in mediciones.items():
+            anterior, nueva = variantes["linea_por_linea"]["mediana"], variantes["por_bloques"]["mediana"]
+            print(f"{etapa:<10} {anterior:>15.4f}s {nueva:>11.4f}s {anterior / nueva if nueva else 0.0:>11.2f}x")
+        return 0
+
+    if argumentos.comando == "correr":
+        corrida = correr(argumentos.escenarios, argumentos.motor, argumentos.repeticiones, argumentos.semilla,
+                         argumentos.rapido)
+        if argumentos.salida:
+            with open(argumentos.salida, 'w', encoding='utf-8') as archivo:
+                json.dump(corrida, archivo, indent=2)
+        else:
+            json.dump(corrida, sys.stdout, indent=2)
+            print()
+        return 0
+
+    with open(argumentos.base, 'r', encoding='utf-8') as archivo:
+        base = json.load(archivo)
+    with open(argumentos.candidato, 'r', encoding='utf-8') as archivo:
+        candidato = json.load(archivo)
+
+    filas = comparar(base, candidato, argumentos.umbral)
+    print(f"{'Escenario':<10} {'Valor':>8} {_describir(base):>22} {_describir(candidato):>22} {'Cociente':>9}")
+    for nombre, valor, mediana_base, mediana_candidato, cociente, es_regresion in filas:
+        marca = "  REGRESIÓN" if es_regresion else ""
+        print(f"{nombre:<10} {valor:>8} {mediana_base:>21.4f}s {mediana_candidato:>21.4f}s {cociente:>9.2f}{marca}")
+    return 1 if any(fila[-1] for fila in filas) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,75 +1,43 @@
 from random import randint
 from tests.generador import Generador
 from algoritmo import procesar_texto
+from diccionario import como_diccionario
+from trazas import Traza
 
-def procesar_texto_explicativo(oraciones, diccionario):
-
-    def procesar_texto(oraciones, diccionario):
-        """
-        Procesa una lista de oraciones y un diccionario, y devuelve una lista de oraciones segmentadas.
-        :param oraciones: Lista de oraciones a procesar.
-        :param diccionario: Diccionario utilizado para la segmentación.
-        """
-        resultado = []
-
-
-        for oracion in oraciones:
-            oracion_segmentada = segmentar_oracion(oracion, diccionario)
-
-            if len("".join(oracion_segmentada)) < len(oracion):
-                resultado.append("No es un mensaje")
-            else:
-                resultado.append(" ".join(oracion_segmentada))
+class TrazaExplicativa(Traza):
+    """
+    Imprime paso a paso la segmentación de cada oración a partir de los eventos de la traza.
+    """
 
-        return resultado
+    sondas = True
 
-    def segmentar_oracion(oracion, diccionario):
+    def inicio(self, oracion):
         print(f"\n--- Iniciando segmentación de: '{oracion}' ---")
-        n = len(oracion)
-        conjunto_diccionario = set(diccionario)
-        max_long_palabra = max(len(palabra) for palabra in diccionario)
-        print(f"Longitud máxima de palabra en diccionario: {max_long_palabra}")
 
-        existencia_parcial = [False] * (n + 1)
-        existencia_parcial[0] = True
-        path = [None] * (n + 1)
+    def sonda(self, oracion, subcadena, encontrada):
+        if encontrada:
+            print(f"  Encontrada palabra válida: '{subcadena}'")
 
-        for i in range(1, n + 1):
-            print(f"\nAnalizando posición {i}:")
-            for j in range(max(0, i - max_long_palabra), i):
-                subcadena = oracion[j:i]
-                if existencia_parcial[j] and subcadena in conjunto_diccionario:
-                    print(f"  Encontrada palabra válida: '{subcadena}' en posición {j}-{i}")
-                    existencia_parcial[i] = True
-                    path[i] = (j, subcadena)
-                    break
+    def registrar(self, registro):
+        if registro["motivo"] is not None:
+            print(f"No se encontró una segmentación válida para la oración (motivo: {registro['motivo']})")
+        else:
+            print("\nReconstruyendo segmentación:")
+            for palabra in registro["segmentacion"]:
+                print(f"  Agregando palabra: '{palabra}'")
+        print(f"Consultas al diccionario: {registro['sondas']} ({registro['aciertos']} encontradas), "
+              f"posiciones alcanzables: {registro['alcanzables']}, {registro['ns_por_caracter']:.0f} ns por carácter")
 
 
-        if not existencia_parcial[n]:
-            print("No se encontró una segmentación válida para la oración")
-            return []
-
-        return reconstruir_segmentacion(path, n)
-
-    def reconstruir_segmentacion(path, n):
-        """
-        Reconstruye la segmentación de una oración a partir del camino dado.
-        :param path: Lista de tuplas que representan el camino de segmentación.
-        :param n: Longitud de la oración original.
-        :return: Lista de palabras segmentadas.
-        """
-        print("\nReconstruyendo segmentación:")
-        resultado = []
-        idx = n
-        while idx > 0:
-            j, palabra = path[idx]
-            print(f"  Agregando palabra: '{palabra}'")
-            resultado.append(palabra)
-            idx = j
-
-        return resultado[::-1]
-
-    return procesar_texto(oraciones, diccionario)
+def procesar_texto_explicativo(oraciones, diccionario):
+    """
+    Igual que procesar_texto, pero imprime cada paso de la segmentación.
+    :param oraciones: Lista de oraciones a procesar.
+    :param diccionario: Diccionario utilizado para la segmentación.
+    """
+    diccionario = como_diccionario(diccionario)
+    print(f"Longitud máxima de palabra en diccionario: {diccionario.max_long}")
+    return procesar_texto(oraciones, diccionario, traza=TrazaExplicativa())
 
 def test_procesar_texto():
     print("\n=== INICIANDO TEST DE PROCESAMIENTO DE TEXTO ===")
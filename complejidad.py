@@ -1,10 +1,13 @@
 import numpy as np
-import matplotlib.pyplot as plt
+import os
 import random
 import string
+import sys
 import time
 from concurrent.futures import ProcessPoolExecutor, as_completed
-from algoritmo import procesar_texto
+from corpus import GeneradorCorpus
+from diccionario import Diccionario
+from paralelo import procesar_texto_paralelo
 from utils import performance
 
 # O(m * (k + (L²) * n))
@@ -26,6 +29,21 @@ RUNS_PER_SIZE = 5  # Número de ejecuciones por tamaño
 GRAPHS_DIR = "graficosV2/"
 
 WORKERS = 12  # Número de procesos paralelos a usar
+SEED = 0  # Semilla para que los diccionarios y textos generados sean reproducibles
+
+
+def _pyplot():
+    """Importa matplotlib recién al graficar; sin pantalla usa el backend Agg y solo guarda los archivos."""
+    import matplotlib
+    if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _show(plt):
+    if plt.get_backend().lower() != "agg":
+        plt.show()
 
 def _process_size(size, runs_per_size, dictionary):
     """Función para medir el tiempo de ejecución para un tamaño específico."""
@@ -34,32 +52,22 @@ def _process_size(size, runs_per_size, dictionary):
     for _ in range(runs_per_size):
         texts = [generate_valid_text(dictionary, size) for _ in range(NUMBER_OF_SENTENCES)]
         start = time.time()
-        with ProcessPoolExecutor(max_workers=1) as executor:  # Un worker por size
-            futures = [executor.submit(_process_batch, [text], dictionary) for text in texts]
-            for future in as_completed(futures):
-                pass
+        procesar_texto_paralelo(texts, dictionary, workers=1)  # Cada size ya corre en su propio proceso
         execution_time = time.time() - start
         times.append(execution_time)
-        print(f" Tamaño {size}: Ejecución completada en {execution_time:.6f}s")
+        probes, contiguous_probes = Diccionario(dictionary).sondeos_por_caracter(texts)
+        print(f" Tamaño {size}: Ejecución completada en {execution_time:.6f}s "
+              f"({probes:.2f} sondeos/carácter, {contiguous_probes:.2f} sin buckets)")
     # Calculamos
     times_array = np.array(times)
     mean = np.mean(times_array)
     std_dev = np.std(times_array, ddof=1)
-    return size, {'mean': mean, 'std_dev': std_dev, 'times': times}
-
-def _process_batch(texts, dictionary):
-    """Función auxiliar para procesar un lote de textos."""
-    procesar_texto(texts, dictionary)
-    return time.time() - time.time()  # Devolvemos un tiempo de ejecución ficticio
+    return size, {'mean': mean, 'std_dev': std_dev, 'times': times, 'probes_per_char': probes}
 
 def generate_random_dictionary(size, min_length=3, max_length=MAX_WORD_LENGTH):
-    """Genera un diccionario aleatorio de palabras."""
-    dictionary = []
-    for _ in range(size):
-        word_length = random.randint(min_length, max_length)
-        word = ''.join(random.choice(string.ascii_lowercase) for _ in range(word_length))
-        dictionary.append(word)
-    return dictionary
+    """Genera un diccionario aleatorio de palabras con corpus.GeneradorCorpus (la semilla sale de SEED)."""
+    corpus = GeneradorCorpus(random.randrange(2 ** 32), min_length, max_length, densidad_ambigua=0.0)
+    return corpus.generar_diccionario(size)
 
 def generate_valid_text(dictionary, length):
     """Genera un texto aleatorio usando palabras del diccionario."""
@@ -116,6 +124,7 @@ def least_squares_analysis(sizes, times):
 # Visualización de resultados
 def plot_complexity_results(sizes, results, models):
     """Genera gráficos para visualizar los resultados del análisis de complejidad."""
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(10, 6))
     # Datos medidos
     means = [results[size]['mean'] for size in sizes]
@@ -128,15 +137,16 @@ def plot_complexity_results(sizes, results, models):
     ax.grid(True)
 
     x_fit = np.linspace(min(sizes), max(sizes), 100)
-    linear_model = models['Lineal']
-    a_linear, b_linear = linear_model['params']
-    y_linear_fit = a_linear * x_fit + b_linear
-    ax.plot(x_fit, y_linear_fit, '-.', label=f"Ajuste Lineal (R² = {linear_model['r_squared']:.4f})")
+    quadratic_model = models['Cuadrático']
+    a_quad, b_quad, c_quad = quadratic_model['params']
+    y_quadratic_fit = a_quad * x_fit**2 + b_quad * x_fit + c_quad
+    ax.plot(x_fit, y_quadratic_fit, ':', label=f"Ajuste Cuadrático (R² = {quadratic_model['r_squared']:.4f})")
 
     ax.legend()
     plt.tight_layout()
+    os.makedirs(GRAPHS_DIR, exist_ok=True)
     plt.savefig(f'{GRAPHS_DIR}dictionary_size_complexity_analysis_{sizes[0]}.png', dpi=300)
-    plt.show()
+    _show(plt)
 
 
 def generate_fixed_length_dictionary(size, word_length):
@@ -161,19 +171,18 @@ def _process_word_length(word_length):
 
         # Medimos tiempo de ejecución
         start = time.time()
-        with ProcessPoolExecutor(max_workers=1) as executor:
-            futures = [executor.submit(_process_batch, [text], dictionary) for text in texts]
-            for future in as_completed(futures):
-                pass
+        procesar_texto_paralelo(texts, dictionary, workers=1)  # Cada size ya corre en su propio proceso
         execution_time = time.time() - start
         times.append(execution_time)
-        print(f" Longitud {word_length}: Ejecución completada en {execution_time:.6f}s")
+        probes, contiguous_probes = Diccionario(dictionary).sondeos_por_caracter(texts)
+        print(f" Longitud {word_length}: Ejecución completada en {execution_time:.6f}s "
+              f"({probes:.2f} sondeos/carácter, {contiguous_probes:.2f} sin buckets)")
 
     # Calculamos estadísticas
     times_array = np.array(times)
     mean = np.mean(times_array)
     std_dev = np.std(times_array, ddof=1)
-    return word_length, {'mean': mean, 'std_dev': std_dev, 'times': times}
+    return word_length, {'mean': mean, 'std_dev': std_dev, 'times': times, 'probes_per_char': probes}
 
 def measure_word_length_complexity(lengths):
     """Mide el tiempo de ejecución variando la longitud de las palabras."""
@@ -193,6 +202,7 @@ def measure_word_length_complexity(lengths):
 
 def plot_word_length_results(lengths, results, models):
     """Genera gráficos para visualizar los resultados del análisis de complejidad por longitud de palabra."""
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(10, 6))
 
     # Datos medidos
@@ -223,8 +233,9 @@ def plot_word_length_results(lengths, results, models):
 
     ax.legend()
     plt.tight_layout()
+    os.makedirs(GRAPHS_DIR, exist_ok=True)
     plt.savefig(f'{GRAPHS_DIR}word_length_analysis_{lengths[0]}.png', dpi=300)
-    plt.show()
+    _show(plt)
 
 def analyze_word_length_impact(lengths):
     print(f"Iniciando análisis del impacto de la longitud de palabra con {RUNS_PER_SIZE} ejecuciones por longitud...")
@@ -306,33 +317,27 @@ def analyze_time_complexity():
     # Visualizamos los resultados
     plot_complexity_results(list(results.keys()), results, models)
 
-# Función principal modificada para usar la versión paralela de la medición
-@performance
-def main():
-    # analyze_time_complexity()
-    # print("\n\n" + "="*80)
-
-    # print("ANÁLISIS DEL IMPACTO DEL TAMAÑO DEL DICCIONARIO")
-    # print("="*80)
-
-    # analyze_dictionary_size_impact(DICTIONARY_SIZES)
-
-    # print("\n\n" + "="*80)
+ANALYSES = {
+    "tiempo": analyze_time_complexity,
+    "diccionario": lambda: analyze_dictionary_size_impact(DICTIONARY_SIZES),
+    "diccionario-enorme": lambda: analyze_dictionary_size_impact(HUGE_DICTIONARY_SIZES),
+    "longitud": lambda: analyze_word_length_impact(WORD_LENGTHS),
+}
 
-    # print("ANÁLISIS DEL IMPACTO DE LA LONGITUD DE PALABRA")
-    # print("="*80)
-
-    analyze_word_length_impact(WORD_LENGTHS)
-
-    print("\n\n" + "="*80)
-
-#    global FIXED_WORD_LENGTH
-#    global NUMBER_OF_WORDS_IN_ONE_SENTENCE
-
-#    NUMBER_OF_WORDS_IN_ONE_SENTENCE = 10
-#    FIXED_WORD_LENGTH = 23
-
-    # analyze_dictionary_size_impact(HUGE_DICTIONARY_SIZES)
+# Los análisis a correr se eligen por línea de comandos (por defecto, el de longitud de palabra).
+# Para mediciones comparables entre motores o commits usar benchmark.py.
+@performance
+def main(analyses=("longitud",)):
+    random.seed(SEED)
+    for name in analyses:
+        print("\n\n" + "="*80)
+        print(f"ANÁLISIS: {name}")
+        print("="*80)
+        ANALYSES[name]()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    unknown = [name for name in sys.argv[1:] if name not in ANALYSES]
+    if unknown:
+        print(f"Análisis desconocidos: {unknown}. Opciones: {', '.join(ANALYSES)}")
+        sys.exit(1)
+    main(sys.argv[1:] or ("longitud",))
@@ -0,0 +1,176 @@
+import argparse
+import bisect
+import itertools
+import random
+import string
+import sys
+
+ALFABETO = string.ascii_lowercase
+CARACTER_INVALIDO = "#"  # No pertenece al alfabeto, así que una oración que lo contiene no se puede segmentar
+LINEAS_POR_ESCRITURA = 4096  # Las líneas se escriben de a bloques para no pagar una llamada por línea
+
+
+class GeneradorCorpus:
+    """
+    Genera diccionarios y oraciones sintéticos de forma determinista a partir de una semilla, sin acceso a la red.
+    - Las longitudes de las palabras siguen una distribución configurable.
+    - Una fracción de las palabras son ambiguas: concatenación de dos palabras anteriores, o una palabra anterior
+      extendida con algunos caracteres. Así aparecen oraciones con varias segmentaciones y cortes que no se
+      resuelven hasta varios caracteres después.
+    - Una fracción de las oraciones es inválida: tienen un carácter que no está en el diccionario.
+    El diccionario y las oraciones salen de secuencias aleatorias independientes, por lo que las oraciones
+    no cambian al pedir más o menos de ellas, y el diccionario no depende de las oraciones generadas.
+    """
+
+    def __init__(self, semilla=0, min_long=2, max_long=12, pesos_longitud=None, densidad_ambigua=0.1,
+                 fraccion_invalidas=0.1, alfabeto=ALFABETO):
+        """
+        :param semilla: Semilla de las secuencias aleatorias.
+        :param min_long: Longitud mínima de palabra.
+        :param max_long: Longitud máxima de palabra.
+        :param pesos_longitud: Diccionario longitud -> peso relativo; por defecto, uniforme entre min_long y max_long.
+        :param densidad_ambigua: Fracción de palabras del diccionario formadas a partir de otras palabras.
+        :param fraccion_invalidas: Fracción de oraciones que no se pueden segmentar.
+        :param alfabeto: Caracteres de las palabras.
+        """
+        if CARACTER_INVALIDO in alfabeto:
+            raise ValueError(f"El alfabeto no puede contener {CARACTER_INVALIDO!r}")
+        if pesos_longitud is None:
+            pesos_longitud = {longitud: 1 for longitud in range(min_long, max_long + 1)}
+        if not pesos_longitud or min(pesos_longitud) < 1:
+            raise ValueError("Las longitudes de palabra deben ser positivas")
+        self.semilla = semilla
+        self.longitudes = sorted(pesos_longitud)
+        self.pesos_acumulados = list(itertools.accumulate(pesos_longitud[longitud] for longitud in self.longitudes))
+        self.max_long = self.longitudes[-1]
+        self.densidad_ambigua = densidad_ambigua
+        self.fraccion_invalidas = fraccion_invalidas
+        self.alfabeto = alfabeto
+
+    def _longitud(self, generador):
+        indice = bisect.bisect(self.pesos_acumulados, generador.random() * self.pesos_acumulados[-1])
+        return self.longitudes[min(indice, len(self.longitudes) - 1)]
+
+    def _palabra_ambigua(self, generador, palabras):
+        primera = generador.choice(palabras)
+        if generador.random() < 0.5:
+            segunda = generador.choice(palabras)
+        else:
+            segunda = "".join(generador.choices(self.alfabeto, k=generador.randint(1, 2)))
+        return primera + segunda
+
+    def generar_diccionario(self, cantidad):
+        """
+        :param cantidad: Cantidad de palabras distintas.
+        :return: Lista de palabras, en el orden en que se generaron.
+        :raises ValueError: Si las longitudes y el alfabeto no alcanzan para tantas palabras distintas.
+        """
+        posibles = sum(len(self.alfabeto) ** longitud for longitud in self.longitudes)
+        if cantidad > posibles // 2:
+            raise ValueError(f"No se pueden generar {cantidad} palabras distintas con esas longitudes y alfabeto")
+
+        generador = random.Random(f"{self.semilla}-diccionario")
+        palabras = []
+        vistas = set()
+        while len(palabras) < cantidad:
+            palabra = None
+            if palabras and generador.random() < self.densidad_ambigua:
+                palabra = self._palabra_ambigua(generador, palabras)
+                if len(palabra) > self.max_long:
+                    palabra = None
+            if palabra is None:
+                palabra = "".join(generador.choices(self.alfabeto, k=self._longitud(generador)))
+            if palabra not in vistas:
+                vistas.add(palabra)
+                palabras.append(palabra)
+        return palabras
+
+    def generar_oraciones(self, palabras, cantidad, palabras_por_oracion=(1, 20)):
+        """
+        Generador de oraciones formadas por palabras del diccionario, sin guardarlas en memoria.
+        :param palabras: Lista de palabras del diccionario.
+        :param cantidad: Cantidad de oraciones, o None para generar indefinidamente.
+        :param palabras_por_oracion: Cantidad de palabras por oración, o tupla (mínimo, máximo).
+        """
+        if isinstance(palabras_por_oracion, int):
+            palabras_por_oracion = (palabras_por_oracion, palabras_por_oracion)
+        minimo, maximo = palabras_por_oracion
+        generador = random.Random(f"{self.semilla}-oraciones")
+        for _ in itertools.repeat(None) if cantidad is None else range(cantidad):
+            oracion = "".join(generador.choices(palabras, k=generador.randint(minimo, maximo)))
+            if generador.random() < self.fraccion_invalidas:
+                posicion = generador.randrange(len(oracion) + 1)
+                oracion = oracion[:posicion] + CARACTER_INVALIDO + oracion[posicion:]
+            yield oracion
+
+    def escribir_diccionario(self, path, cantidad):
+        """
+        Genera el diccionario y lo escribe en path, una palabra por línea.
+        :return: Lista de palabras generadas.
+        """
+        palabras = self.generar_diccionario(cantidad)
+        escribir_lineas(path, palabras)
+        return palabras
+
+    def escribir_oraciones(self, path, palabras, cantidad, palabras_por_oracion=(1, 20)):
+        """
+        Genera las oraciones y las escribe en path a medida que se producen, una por línea.
+        :return: Cantidad de bytes escritos.
+        """
+        return escribir_lineas(path, self.generar_oraciones(palabras, cantidad, palabras_por_oracion))
+
+
+def escribir_lineas(path, lineas):
+    """
+    Escribe las líneas de un iterable en bloques de LINEAS_POR_ESCRITURA, sin cargarlas todas en memoria.
+    :return: Cantidad de bytes escritos.
+    """
+    escritos = 0
+    with open(path, 'w', encoding='utf-8', newline='\n') as archivo:
+        iterador = iter(lineas)
+        while bloque := list(itertools.islice(iterador, LINEAS_POR_ESCRITURA)):
+            texto = "\n".join(bloque) + "\n"
+            archivo.write(texto)
+            escritos += len(texto.encode('utf-8'))
+    return escritos
+
+
+def parsear_pesos(texto):
+    """
+    Convierte 'longitud:peso,longitud:peso' en un diccionario longitud -> peso.
+    """
+    pesos = {}
+    for par in filter(None, texto.split(",")):
+        longitud, _, peso = par.partition(":")
+        pesos[int(longitud)] = float(peso)
+    return pesos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera un diccionario y oraciones sintéticos reproducibles.")
+    parser.add_argument("diccionario", help="archivo de diccionario a escribir")
+    parser.add_argument("oraciones", help="archivo de oraciones a escribir")
+    parser.add_argument("--palabras", type=int, default=10_000, help="cantidad de palabras del diccionario")
+    parser.add_argument("--cantidad", type=int, default=1000, help="cantidad de oraciones")
+    parser.add_argument("--por-oracion", type=int, nargs=2, default=(1, 20), metavar=("MIN", "MAX"),
+                        help="cantidad de palabras por oración")
+    parser.add_argument("--min-long", type=int, default=2)
+    parser.add_argument("--max-long", type=int, default=12)
+    parser.add_argument("--pesos", type=parsear_pesos, help="distribución de longitudes, como '2:1,3:4,8:2'")
+    parser.add_argument("--ambiguas", type=float, default=0.1, help="fracción de palabras formadas con otras")
+    parser.add_argument("--invalidas", type=float, default=0.1, help="fracción de oraciones no segmentables")
+    parser.add_argument("--semilla", type=int, default=0)
+    argumentos = parser.parse_args(argv)
+
+    generador = GeneradorCorpus(argumentos.semilla, argumentos.min_long, argumentos.max_long, argumentos.pesos,
+                                argumentos.ambiguas, argumentos.invalidas)
+    palabras = generador.escribir_diccionario(argumentos.diccionario, argumentos.palabras)
+    escritos = generador.escribir_oraciones(argumentos.oraciones, palabras, argumentos.cantidad,
+                                            tuple(argumentos.por_oracion))
+    print(f"{len(palabras)} palabras en {argumentos.diccionario}, {argumentos.cantidad} oraciones "
+          f"({escritos / 2 ** 20:.1f} MiB) en {argumentos.oraciones}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,474 @@
+import hashlib
+import json
+import math
+
+FIN_DE_PALABRA = ""  # Clave que marca en el trie el final de una palabra (ningún carácter es vacío)
+BASE_HASH = 911_382_323  # Base del hash polinomial de subcadenas
+MODULO_HASH = (1 << 61) - 1  # Primo de Mersenne usado como módulo del hash polinomial
+
+
+class Diccionario:
+    """
+    Índice de un diccionario que se construye una sola vez y se reutiliza para todas las oraciones.
+    Guarda la estructura de búsqueda y las estadísticas de longitudes que usa la segmentación.
+    """
+
+    def __init__(self, palabras):
+        """
+        :param palabras: Iterable con las palabras del diccionario.
+        """
+        palabras = set(palabras)
+        self._inicializar(palabras,
+                          sorted({len(palabra) for palabra in palabras if palabra}),
+                          agrupar_longitudes_por_final(palabras))
+
+    @classmethod
+    def desde_tabla(cls, tabla, longitudes, longitudes_por_final, huella=None, caracteres=None, iniciales=None):
+        """
+        Crea el índice sobre una estructura de búsqueda ya construida (por ejemplo, un diccionario compilado),
+        sin recorrer sus palabras.
+        :param tabla: Contenedor de palabras que soporta 'in', len() e iteración.
+        :param longitudes: Lista ordenada de las longitudes de palabra presentes.
+        :param longitudes_por_final: Longitudes agrupadas por último carácter (ver agrupar_longitudes_por_final).
+        :param huella: Huella ya calculada de las palabras, si se conoce.
+        :param caracteres: Caracteres que aparecen en las palabras, si se conocen.
+        :param iniciales: Primeros caracteres de las palabras, si se conocen.
+        """
+        diccionario = cls.__new__(cls)
+        diccionario._inicializar(tabla, list(longitudes), longitudes_por_final)
+        diccionario._huella = huella
+        diccionario._caracteres = set(caracteres) if caracteres is not None else None
+        diccionario._iniciales = set(iniciales) if iniciales is not None else None
+        return diccionario
+
+    def _inicializar(self, palabras, longitudes, longitudes_por_final):
+        self.palabras = palabras
+        self.longitudes_por_final = longitudes_por_final
+        self.version = 0  # Aumenta con cada modificación; permite invalidar estructuras derivadas externas
+        self._longitudes = longitudes
+        self._conteo_por_final = None
+        self._conteo_por_caracter = None
+        self._conteo_por_inicial = None
+        self._caracteres = None
+        self._iniciales = None
+        self._trie = None
+        self._tablas_hash = None
+        self._potencias_hash = None
+        self._huella = None
+        self.costos = None
+        self.costo_por_defecto = 1.0
+        self.costo_minimo = 1.0
+        self.huella_costos = None
+
+    def asignar_costos(self, costos, costo_por_defecto=None):
+        """
+        Asigna un costo a cada palabra para el motor 'viterbi', que elige la segmentación de menor costo total.
+        Sin costos asignados toda palabra cuesta 1, es decir, se prefieren las segmentaciones con menos palabras.
+        :param costos: Diccionario palabra -> costo (no negativo); las palabras que no figuran usan el costo por defecto.
+        :param costo_por_defecto: Costo de las palabras sin entrada (por defecto, el mayor de los costos dados).
+        """
+        self.costos = dict(costos)
+        if costo_por_defecto is None:
+            costo_por_defecto = max(self.costos.values(), default=1.0)
+        self.costo_por_defecto = float(costo_por_defecto)
+        self.costo_minimo = min(min(self.costos.values(), default=self.costo_por_defecto), self.costo_por_defecto)
+        contenido = json.dumps([sorted(self.costos.items()), self.costo_por_defecto]).encode('utf-8')
+        self.huella_costos = hashlib.blake2b(contenido, digest_size=8).hexdigest()
+
+    @property
+    def longitudes(self):
+        """
+        Lista ordenada de las longitudes de palabra presentes. Después de quitar palabras se recalcula
+        la primera vez que se consulta.
+        """
+        if self._longitudes is None:
+            self._longitudes = sorted({longitud for conteo in self._conteo_por_final.values() for longitud in conteo})
+        return self._longitudes
+
+    @property
+    def max_long(self):
+        return self.longitudes[-1] if self.longitudes else 0
+
+    @property
+    def min_long(self):
+        return self.longitudes[0] if self.longitudes else 0
+
+    def agregar_palabras(self, palabras, cache=None):
+        """
+        Agrega palabras actualizando de forma incremental la estructura de búsqueda, las estadísticas de
+        longitudes y los índices ya construidos (trie, tablas de hash y huella).
+        :param palabras: Iterable de palabras a agregar.
+        :param cache: CacheSegmentaciones opcional; se invalidan solo las oraciones que contienen alguna
+                      palabra agregada y el resto pasa a la huella nueva.
+        :return: Conjunto de las palabras que no estaban y se agregaron.
+        """
+        nuevas = {palabra for palabra in palabras if palabra and palabra not in self.palabras}
+        self._modificar(nuevas, set(), cache)
+        return nuevas
+
+    def quitar_palabras(self, palabras, cache=None):
+        """
+        Quita palabras de forma incremental. Si desaparece la última palabra de alguna longitud,
+        la lista de longitudes (y con ella max_long) se recalcula recién cuando se vuelve a consultar.
+        :param palabras: Iterable de palabras a quitar.
+        :param cache: CacheSegmentaciones opcional (ver agregar_palabras).
+        :return: Conjunto de las palabras que estaban y se quitaron.
+        """
+        quitadas = {palabra for palabra in palabras if palabra and palabra in self.palabras}
+        self._modificar(set(), quitadas, cache)
+        return quitadas
+
+    def _modificar(self, agregadas, quitadas, cache):
+        if not agregadas and not quitadas:
+            return
+        huella_anterior = self.huella if cache is not None else None
+        conteo_por_final = self._conteos()
+
+        if not isinstance(self.palabras, (set, TablaSuperpuesta)):
+            self.palabras = TablaSuperpuesta(self.palabras)  # Tabla de solo lectura (diccionario compilado)
+        self.palabras.update(agregadas)
+        self.palabras.difference_update(quitadas)
+
+        finales = set()
+        for palabra, delta in [(palabra, 1) for palabra in agregadas] + [(palabra, -1) for palabra in quitadas]:
+            conteo = conteo_por_final.setdefault(palabra[-1], {})
+            conteo[len(palabra)] = conteo.get(len(palabra), 0) + delta
+            if not conteo[len(palabra)]:
+                del conteo[len(palabra)]
+                self._longitudes = None  # Puede haber desaparecido una longitud (por ejemplo, la máxima)
+            finales.add(palabra[-1])
+
+        for caracter in finales:
+            if conteo_por_final[caracter]:
+                self.longitudes_por_final[caracter] = tuple(sorted(conteo_por_final[caracter], reverse=True))
+            else:
+                del conteo_por_final[caracter]
+                self.longitudes_por_final.pop(caracter, None)
+        if agregadas and self._longitudes is not None:
+            self._longitudes = sorted(set(self._longitudes).union(len(palabra) for palabra in agregadas))
+
+        self._actualizar_indices(agregadas, quitadas)
+        self.version += 1
+        if cache is not None:
+            cache.actualizar_huella(huella_anterior, self.huella, agregadas | quitadas)
+
+    def _conteos(self):
+        """
+        Cantidad de palabras por (último carácter, longitud), por carácter que contienen y por carácter inicial;
+        se construyen en la primera modificación y desde entonces se mantienen en cada una.
+        """
+        if self._conteo_por_final is None:
+            conteo_por_final = {}
+            conteo_por_caracter = {}
+            conteo_por_inicial = {}
+            for palabra in self.palabras:
+                if palabra:
+                    conteo = conteo_por_final.setdefault(palabra[-1], {})
+                    conteo[len(palabra)] = conteo.get(len(palabra), 0) + 1
+                    for caracter in set(palabra):
+                        conteo_por_caracter[caracter] = conteo_por_caracter.get(caracter, 0) + 1
+                    conteo_por_inicial[palabra[0]] = conteo_por_inicial.get(palabra[0], 0) + 1
+            self._conteo_por_final = conteo_por_final
+            self._conteo_por_caracter = conteo_por_caracter
+            self._conteo_por_inicial = conteo_por_inicial
+            self.longitudes_por_final = dict(self.longitudes_por_final)
+        return self._conteo_por_final
+
+    def _actualizar_indices(self, agregadas, quitadas):
+        if self._huella is not None:
+            total = int(self._huella, 16)
+            total += sum(_hash_palabra(palabra) for palabra in agregadas)
+            total -= sum(_hash_palabra(palabra) for palabra in quitadas)
+            self._huella = f"{total % 2 ** 64:016x}"
+        if self._trie is not None:
+            for palabra in agregadas:
+                _insertar_en_trie(self._trie, palabra)
+            for palabra in quitadas:
+                _quitar_del_trie(self._trie, palabra)
+        if self._tablas_hash is not None:
+            for palabra in agregadas:
+                tabla = self._tablas_hash.setdefault(len(palabra), {})
+                valor = hash_polinomial(palabra)
+                tabla[valor] = tabla.get(valor, ()) + (palabra,)
+            for palabra in quitadas:
+                tabla = self._tablas_hash[len(palabra)]
+                valor = hash_polinomial(palabra)
+                tabla[valor] = tuple(otra for otra in tabla[valor] if otra != palabra)
+                if not tabla[valor]:
+                    del tabla[valor]
+        # Un carácter sale de caracteres (o de iniciales) recién cuando su conteo llega a 0.
+        for conteos, conjunto, claves in ((self._conteo_por_caracter, self._caracteres, set),
+                                          (self._conteo_por_inicial, self._iniciales, _inicial)):
+            for palabra in agregadas:
+                for caracter in claves(palabra):
+                    conteos[caracter] = conteos.get(caracter, 0) + 1
+                    if conjunto is not None:
+                        conjunto.add(caracter)
+            for palabra in quitadas:
+                for caracter in claves(palabra):
+                    conteos[caracter] -= 1
+                    if not conteos[caracter]:
+                        del conteos[caracter]
+                        if conjunto is not None:
+                            conjunto.discard(caracter)
+
+    @property
+    def tablas_hash(self):
+        """
+        Hashes polinomiales de las palabras agrupados por longitud: longitud -> {hash: tupla de palabras}.
+        Se construyen la primera vez que se usan.
+        """
+        if self._tablas_hash is None:
+            self._tablas_hash = construir_tablas_hash(self.palabras)
+        return self._tablas_hash
+
+    @property
+    def potencias_hash(self):
+        """
+        Potencias BASE_HASH ** l módulo MODULO_HASH para l = 0..max_long.
+        """
+        if self._potencias_hash is None or len(self._potencias_hash) <= self.max_long:
+            potencias = [1]
+            for _ in range(self.max_long):
+                potencias.append(potencias[-1] * BASE_HASH % MODULO_HASH)
+            self._potencias_hash = potencias
+        return self._potencias_hash
+
+    @property
+    def huella(self):
+        """
+        Huella (hash) del conjunto de palabras, independiente del orden; se calcula la primera vez que se usa.
+        Dos diccionarios con las mismas palabras tienen la misma huella.
+        """
+        if self._huella is None:
+            self._huella = calcular_huella(self.palabras)
+        return self._huella
+
+    @property
+    def caracteres(self):
+        """
+        Conjunto de todos los caracteres que aparecen en alguna palabra.
+        """
+        if self._caracteres is None:
+            if self._conteo_por_caracter is not None:
+                self._caracteres = set(self._conteo_por_caracter)
+            else:
+                self._caracteres = {caracter for palabra in self.palabras for caracter in palabra}
+        return self._caracteres
+
+    @property
+    def iniciales(self):
+        """
+        Conjunto de los primeros caracteres de las palabras.
+        """
+        if self._iniciales is None:
+            if self._conteo_por_inicial is not None:
+                self._iniciales = set(self._conteo_por_inicial)
+            else:
+                self._iniciales = {palabra[0] for palabra in self.palabras if palabra}
+        return self._iniciales
+
+    @property
+    def trie(self):
+        """
+        Trie de caracteres del diccionario como diccionarios anidados; se construye la primera vez que se usa.
+        """
+        if self._trie is None:
+            self._trie = construir_trie(self.palabras)
+        return self._trie
+
+    def estadisticas_buckets(self):
+        """
+        Resume la agrupación de longitudes por último carácter que usa el motor por conjunto.
+        :return: Diccionario con la cantidad de longitudes distintas, la cantidad de buckets
+                 y el tamaño medio y máximo de los buckets (sondeos por posición en el peor caso).
+        """
+        tamanios = [len(longitudes) for longitudes in self.longitudes_por_final.values()]
+        return {
+            "max_long": self.max_long,
+            "longitudes_distintas": len(self.longitudes),
+            "buckets": len(tamanios),
+            "longitudes_por_bucket_media": sum(tamanios) / len(tamanios) if tamanios else 0,
+            "longitudes_por_bucket_max": max(tamanios, default=0),
+        }
+
+    def sondeos_por_caracter(self, oraciones):
+        """
+        Cuenta cuántas subcadenas por carácter consulta como máximo el motor por conjunto sobre las oraciones,
+        comparado con el barrido contiguo de max_long posiciones hacia atrás.
+        :param oraciones: Iterable de oraciones.
+        :return: Tupla (sondeos por carácter con buckets, sondeos por carácter con barrido contiguo).
+        """
+        caracteres = sondeos = sondeos_contiguos = 0
+        for oracion in oraciones:
+            for i in range(1, len(oracion) + 1):
+                longitudes = self.longitudes_por_final.get(oracion[i - 1], ())
+                sondeos += sum(1 for longitud in longitudes if longitud <= i)
+                sondeos_contiguos += min(i, self.max_long)
+            caracteres += len(oracion)
+        if caracteres == 0:
+            return 0.0, 0.0
+        return sondeos / caracteres, sondeos_contiguos / caracteres
+
+    def __contains__(self, palabra):
+        return palabra in self.palabras
+
+    def __len__(self):
+        return len(self.palabras)
+
+    def __iter__(self):
+        return iter(self.palabras)
+
+
+class TablaSuperpuesta:
+    """
+    Conjunto modificable sobre una tabla de solo lectura (por ejemplo, un diccionario compilado mapeado en memoria):
+    guarda aparte las palabras agregadas y las quitadas, sin copiar la tabla base.
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self.agregadas = set()
+        self.quitadas = set()
+
+    def update(self, palabras):
+        for palabra in palabras:
+            self.quitadas.discard(palabra)
+            if palabra not in self.base:
+                self.agregadas.add(palabra)
+
+    def difference_update(self, palabras):
+        for palabra in palabras:
+            self.agregadas.discard(palabra)
+            if palabra in self.base:
+                self.quitadas.add(palabra)
+
+    def __contains__(self, palabra):
+        return palabra in self.agregadas or (palabra in self.base and palabra not in self.quitadas)
+
+    def __len__(self):
+        return len(self.base) - len(self.quitadas) + len(self.agregadas)
+
+    def __iter__(self):
+        for palabra in self.base:
+            if palabra not in self.quitadas:
+                yield palabra
+        yield from self.agregadas
+
+
+def costos_desde_frecuencias(frecuencias):
+    """
+    Convierte frecuencias de uso en costos de unigrama: costo = -log(frecuencia / total). Así la segmentación
+    de menor costo es la de mayor probabilidad si las palabras se eligen de forma independiente.
+    :param frecuencias: Diccionario palabra -> frecuencia (positiva).
+    :return: Tupla (costos, costo por defecto); el costo por defecto corresponde a media aparición, menos
+             probable que cualquier palabra con frecuencia conocida.
+    """
+    total = sum(frecuencias.values())
+    costos = {palabra: math.log(total / frecuencia) for palabra, frecuencia in frecuencias.items() if frecuencia > 0}
+    return costos, math.log(2 * total) if total else 1.0
+
+
+def hash_polinomial(palabra):
+    """
+    Hash polinomial de una cadena: sum(ord(c) * BASE_HASH ** (k - 1 - posición)) módulo MODULO_HASH.
+    """
+    valor = 0
+    for caracter in palabra:
+        valor = (valor * BASE_HASH + ord(caracter)) % MODULO_HASH
+    return valor
+
+
+def construir_tablas_hash(palabras):
+    """
+    Agrupa las palabras por longitud y hash polinomial.
+    :param palabras: Iterable de palabras.
+    :return: Diccionario longitud -> {hash: tupla de palabras con ese hash}.
+    """
+    tablas = {}
+    for palabra in palabras:
+        if palabra:
+            tabla = tablas.setdefault(len(palabra), {})
+            valor = hash_polinomial(palabra)
+            tabla[valor] = tabla.get(valor, ()) + (palabra,)
+    return tablas
+
+
+def _hash_palabra(palabra):
+    return int.from_bytes(hashlib.blake2b(palabra.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def calcular_huella(palabras):
+    """
+    Calcula una huella independiente del orden sumando (módulo 2^64) un hash de 64 bits de cada palabra.
+    :param palabras: Iterable de palabras distintas.
+    :return: Huella como cadena hexadecimal.
+    """
+    total = sum(_hash_palabra(palabra) for palabra in palabras if palabra) % 2 ** 64
+    return f"{total:016x}"
+
+
+def _inicial(palabra):
+    return (palabra[0],)
+
+
+def agrupar_longitudes_por_final(palabras):
+    """
+    Agrupa las longitudes de las palabras según su último carácter.
+    Las longitudes de cada grupo quedan en orden decreciente, para que al probar hacia atrás
+    desde una posición i los inicios j = i - longitud se recorran en orden creciente.
+    :param palabras: Iterable de palabras.
+    :return: Diccionario carácter -> tupla de longitudes.
+    """
+    grupos = {}
+    for palabra in palabras:
+        if palabra:
+            grupos.setdefault(palabra[-1], set()).add(len(palabra))
+    return {caracter: tuple(sorted(longitudes, reverse=True)) for caracter, longitudes in grupos.items()}
+
+
+def construir_trie(palabras):
+    """
+    Construye un trie de caracteres con diccionarios anidados.
+    Cada nodo mapea un carácter al nodo hijo, y contiene FIN_DE_PALABRA si una palabra termina ahí.
+    :param palabras: Iterable de palabras.
+    """
+    raiz = {}
+    for palabra in palabras:
+        if palabra:
+            _insertar_en_trie(raiz, palabra)
+    return raiz
+
+
+def _insertar_en_trie(raiz, palabra):
+    nodo = raiz
+    for caracter in palabra:
+        nodo = nodo.setdefault(caracter, {})
+    nodo[FIN_DE_PALABRA] = True
+
+
+def _quitar_del_trie(raiz, palabra):
+    """
+    Desmarca el final de la palabra y elimina los nodos que quedan sin hijos.
+    """
+    camino = [raiz]
+    for caracter in palabra:
+        camino.append(camino[-1].get(caracter))
+        if camino[-1] is None:
+            return
+    camino[-1].pop(FIN_DE_PALABRA, None)
+    for profundidad in range(len(palabra), 0, -1):
+        if camino[profundidad]:
+            break
+        del camino[profundidad - 1][palabra[profundidad - 1]]
+
+
+def como_diccionario(diccionario):
+    """
+    Devuelve el índice correspondiente al diccionario dado.
+    Si ya es un Diccionario se devuelve tal cual; si es una lista (o cualquier iterable) se indexa.
+    :param diccionario: Diccionario o iterable de palabras.
+    """
+    if isinstance(diccionario, Diccionario):
+        return diccionario
+    return Diccionario(diccionario)
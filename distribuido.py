@@ -0,0 +1,405 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import shutil
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from algoritmo import procesar_texto
+from servidor import LIMITE_DE_LINEA
+from utils import dividir_lineas, leer_lineas, escribir_resultados, TAMANIO_DE_BLOQUE
+
+TAMANIO_DE_FRAGMENTO = 4 * 1024 * 1024  # Bytes de entrada por fragmento (se extiende hasta el fin de línea)
+REINTENTOS = 3  # Veces que se reasigna un fragmento fallido antes de abortar el trabajo
+FACTOR_DE_REZAGO = 2.0  # Un fragmento es rezagado si su rendimiento es menor que la mediana dividida por esto
+
+
+class FragmentoFallido(RuntimeError):
+    """
+    Un fragmento falló más veces que las permitidas.
+    """
+
+    def __init__(self, fragmento, error):
+        super().__init__(f"El fragmento {fragmento} falló demasiadas veces (último error: {error})")
+        self.fragmento = fragmento
+
+
+def dividir_en_fragmentos(path, tamanio=TAMANIO_DE_FRAGMENTO):
+    """
+    Divide un archivo en rangos de bytes consecutivos de alrededor de tamanio bytes que terminan en un fin de línea,
+    sin leerlo entero: solo se lee desde cada corte aproximado hasta el siguiente salto de línea.
+    :return: Lista de tuplas (inicio, fin) que cubren el archivo.
+    """
+    total = os.path.getsize(path)
+    fragmentos = []
+    inicio = 0
+    with open(path, 'rb') as archivo:
+        while inicio < total:
+            archivo.seek(min(inicio + tamanio, total) - 1)
+            archivo.readline()
+            fin = archivo.tell()
+            fragmentos.append((inicio, fin))
+            inicio = fin
+    return fragmentos
+
+
+def leer_fragmento(path, inicio, fin):
+    """
+    Oraciones del rango de bytes [inicio, fin) de un archivo (ver dividir_en_fragmentos).
+    """
+    with open(path, 'rb') as archivo:
+        archivo.seek(inicio)
+        return dividir_lineas(archivo.read(fin - inicio).decode('utf-8'))
+
+
+class Coordinador:
+    """
+    Reparte un archivo de oraciones entre trabajadores conectados por TCP y junta los resultados en el orden original.
+    Protocolo: JSON delimitado por saltos de línea. Los trabajadores piden trabajo al conectarse y al terminar
+    cada fragmento, así los nodos más rápidos procesan más fragmentos:
+      trabajador -> {"tipo": "hola", "nodo": "n1", "huella": "..."}
+      coordinador -> {"tipo": "fragmento", "id": 3, "motor": "conjunto", "oraciones": [...]}  o  {"tipo": "fin"}
+      trabajador -> {"tipo": "resultado", "id": 3, "resultados": [...], "segundos": 0.8}  o  {"tipo": "error", ...}
+    Un fragmento cuyo trabajador informa un error, se desconecta o no responde dentro del plazo vuelve a la cola.
+    Los resultados de cada fragmento se guardan en un archivo temporal, así la memoria no depende del tamaño total.
+    """
+
+    def __init__(self, path_entrada, path_salida, motor="conjunto", tamanio_fragmento=TAMANIO_DE_FRAGMENTO,
+                 reintentos=REINTENTOS, plazo=None, huella=None):
+        """
+        :param path_entrada: Archivo de oraciones, una por línea.
+        :param path_salida: Archivo de resultados, numerados como en tp2.
+        :param motor: Motor de segmentación que usan todos los trabajadores.
+        :param tamanio_fragmento: Bytes de entrada por fragmento.
+        :param reintentos: Reasignaciones permitidas por fragmento.
+        :param plazo: Segundos que se espera la respuesta de un fragmento antes de reasignarlo (None: sin límite).
+        :param huella: Huella del diccionario esperado; se rechazan los trabajadores con otro diccionario.
+        """
+        self.path_entrada = path_entrada
+        self.path_salida = path_salida
+        self.motor = motor
+        self.reintentos = reintentos
+        self.plazo = plazo
+        self.huella = huella
+        self.fragmentos = dividir_en_fragmentos(path_entrada, tamanio_fragmento)
+        self.informes = {}  # id -> informe del fragmento terminado
+        self.intentos = [0] * len(self.fragmentos)
+        self.rechazados = []  # Nodos rechazados por tener otro diccionario
+        self._pendientes = list(range(len(self.fragmentos) - 1, -1, -1))  # Pila: se asignan en orden creciente
+        self._cambio = asyncio.Event()
+        self._terminado = asyncio.Event()
+        self._error = None
+        self._directorio = None
+        self._servidor = None
+        self._conexiones = set()
+        self._inicio = None
+        if not self.fragmentos:
+            self._terminado.set()
+
+    async def iniciar(self, host="127.0.0.1", puerto=0):
+        """
+        Empieza a escuchar trabajadores (con puerto 0 el sistema elige uno libre; ver direccion()).
+        """
+        self._directorio = tempfile.mkdtemp(prefix="fragmentos-")
+        self._inicio = time.perf_counter()
+        self._servidor = await asyncio.start_server(self._atender_trabajador, host, puerto, limit=LIMITE_DE_LINEA)
+        return self._servidor
+
+    def direccion(self):
+        return self._servidor.sockets[0].getsockname()
+
+    async def esperar(self):
+        """
+        Espera a que terminen todos los fragmentos, une los resultados en path_salida y cierra el servidor.
+        :return: Informe de la corrida (ver informe()).
+        :raises FragmentoFallido: Si algún fragmento agotó sus reintentos.
+        """
+        try:
+            await self._terminado.wait()
+            if self._error is not None:
+                raise self._error
+            await asyncio.to_thread(self._unir)
+            return self.informe()
+        finally:
+            await self.cerrar()
+
+    async def cerrar(self):
+        self._servidor.close()
+        for escritor in list(self._conexiones):
+            escritor.close()
+        await self._servidor.wait_closed()
+        shutil.rmtree(self._directorio, ignore_errors=True)
+
+    def informe(self):
+        """
+        Rendimiento de cada fragmento y de cada nodo, y los fragmentos rezagados: los de rendimiento (bytes por
+        segundo de procesamiento en el trabajador) menor que la mediana dividida por FACTOR_DE_REZAGO.
+        """
+        fragmentos = [self.informes[id_fragmento] for id_fragmento in sorted(self.informes)]
+        rendimientos = [fragmento["bytes_por_segundo"] for fragmento in fragmentos]
+        mediana = statistics.median(rendimientos) if rendimientos else 0.0
+        por_nodo = {}
+        for fragmento in fragmentos:
+            nodo = por_nodo.setdefault(fragmento["nodo"], {"fragmentos": 0, "oraciones": 0, "bytes": 0,
+                                                           "segundos": 0.0})
+            nodo["fragmentos"] += 1
+            nodo["oraciones"] += fragmento["oraciones"]
+            nodo["bytes"] += fragmento["bytes"]
+            nodo["segundos"] += fragmento["segundos"]
+        return {
+            "segundos": time.perf_counter() - self._inicio,
+            "fragmentos": fragmentos,
+            "reintentos": sum(self.intentos) - len(fragmentos),
+            "rezagados": [fragmento["id"] for fragmento in fragmentos
+                          if fragmento["bytes_por_segundo"] * FACTOR_DE_REZAGO < mediana],
+            "por_nodo": por_nodo,
+            "rechazados": self.rechazados,
+        }
+
+    async def _siguiente(self):
+        """
+        Próximo fragmento pendiente. Si no hay, espera: un fragmento en curso todavía puede fallar y volver a la cola.
+        :return: Id del fragmento, o None cuando ya no queda trabajo.
+        """
+        while True:
+            if self._terminado.is_set():
+                return None
+            if self._pendientes:
+                return self._pendientes.pop()
+            self._cambio.clear()
+            await self._cambio.wait()
+
+    def _reintentar(self, id_fragmento, error):
+        if self._terminado.is_set():
+            return
+        if self.intentos[id_fragmento] > self.reintentos:
+            self._error = FragmentoFallido(id_fragmento, error)
+            self._terminado.set()
+        else:
+            self._pendientes.append(id_fragmento)
+        self._cambio.set()
+
+    def _completar(self, id_fragmento, respuesta, nodo, oraciones, duracion):
+        if id_fragmento in self.informes or self._terminado.is_set():
+            return
+        inicio, fin = self.fragmentos[id_fragmento]
+        segundos = respuesta.get("segundos")
+        if not isinstance(segundos, (int, float)) or isinstance(segundos, bool) or segundos < 0:
+            segundos = duracion
+        self.informes[id_fragmento] = {
+            "id": id_fragmento, "nodo": nodo, "intentos": self.intentos[id_fragmento], "oraciones": oraciones,
+            "bytes": fin - inicio, "segundos": segundos, "duracion": duracion,
+            "bytes_por_segundo": (fin - inicio) / segundos if segundos else float("inf"),
+        }
+        if len(self.informes) == len(self.fragmentos):
+            self._terminado.set()
+        self._cambio.set()
+
+    def _path_de(self, id_fragmento):
+        return os.path.join(self._directorio, f"{id_fragmento:08d}.txt")
+
+    def _guardar(self, id_fragmento, resultados):
+        path = self._path_de(id_fragmento)
+        with open(path + ".parcial", 'w', encoding='utf-8') as archivo:
+            archivo.write("".join(resultado + "\n" for resultado in resultados))
+        os.replace(path + ".parcial", path)
+
+    def _unir(self):
+        resultados = itertools.chain.from_iterable(leer_lineas(self._path_de(id_fragmento))
+                                                   for id_fragmento in range(len(self.fragmentos)))
+        with open(self.path_salida, 'w', encoding='utf-8', buffering=TAMANIO_DE_BLOQUE) as salida:
+            escribir_resultados(resultados, salida)
+
+    async def _atender_trabajador(self, lector, escritor):
+        self._conexiones.add(escritor)
+        id_fragmento = None
+        try:
+            linea = await lector.readline()
+            if not linea:
+                return
+            hola = _leer_mensaje(linea)
+            nodo = hola.get("nodo")
+            if not isinstance(nodo, str) or not nodo:
+                nodo = str(escritor.get_extra_info("peername"))
+            if self.huella is not None and hola.get("huella") != self.huella:
+                self.rechazados.append(nodo)
+                await self._enviar(escritor, {"tipo": "fin", "error": "El diccionario del trabajador es otro"})
+                return
+
+            while (id_fragmento := await self._siguiente()) is not None:
+                self.intentos[id_fragmento] += 1
+                oraciones = await asyncio.to_thread(leer_fragmento, self.path_entrada, *self.fragmentos[id_fragmento])
+                enviado = time.perf_counter()
+                await self._enviar(escritor, {"tipo": "fragmento", "id": id_fragmento, "motor": self.motor,
+                                              "oraciones": oraciones})
+                linea = await asyncio.wait_for(lector.readline(), self.plazo)
+                if not linea:
+                    raise ConnectionError("El trabajador se desconectó")
+                respuesta = _leer_mensaje(linea)
+                if not _es_resultado_de(respuesta, id_fragmento, len(oraciones)):
+                    self._reintentar(id_fragmento, str(respuesta.get("error", "respuesta inválida")))
+                else:
+                    await asyncio.to_thread(self._guardar, id_fragmento, respuesta["resultados"])
+                    self._completar(id_fragmento, respuesta, nodo, len(oraciones), time.perf_counter() - enviado)
+                id_fragmento = None
+            await self._enviar(escritor, {"tipo": "fin"})
+        except Exception as error:
+            # Desconexión, plazo vencido, mensaje ilegible o cualquier otra falla al atender a este trabajador:
+            # el fragmento en curso vuelve a la cola, así ningún fragmento queda asignado a una conexión perdida.
+            if id_fragmento is not None:
+                self._reintentar(id_fragmento, repr(error))
+        finally:
+            self._conexiones.discard(escritor)
+            escritor.close()
+
+    async def _enviar(self, escritor, mensaje):
+        escritor.write(json.dumps(mensaje, ensure_ascii=False).encode('utf-8') + b"\n")
+        await escritor.drain()
+
+
+def _leer_mensaje(linea):
+    """
+    Decodifica una línea del protocolo.
+    :raises ValueError: Si no es JSON o no es un objeto.
+    """
+    mensaje = json.loads(linea)
+    if not isinstance(mensaje, dict):
+        raise ValueError(f"Se esperaba un objeto JSON y se recibió {type(mensaje).__name__}")
+    return mensaje
+
+
+def _es_resultado_de(respuesta, id_fragmento, cantidad):
+    """
+    Indica si la respuesta trae los resultados del fragmento: uno por oración, todos textos.
+    """
+    resultados = respuesta.get("resultados")
+    return (respuesta.get("tipo") == "resultado" and respuesta.get("id") == id_fragmento
+            and isinstance(resultados, list) and len(resultados) == cantidad
+            and all(isinstance(resultado, str) for resultado in resultados))
+
+
+async def coordinar(path_entrada, path_salida, host="127.0.0.1", puerto=8766, **opciones):
+    """
+    Levanta un Coordinador, espera a que los trabajadores procesen todos los fragmentos y devuelve el informe.
+    """
+    coordinador = Coordinador(path_entrada, path_salida, **opciones)
+    await coordinador.iniciar(host, puerto)
+    print(f"Coordinando {len(coordinador.fragmentos)} fragmentos en {coordinador.direccion()}", file=sys.stderr)
+    return await coordinador.esperar()
+
+
+def trabajar(diccionario, host="127.0.0.1", puerto=8766, nodo=None):
+    """
+    Trabajador: se conecta al coordinador y procesa con procesar_texto los fragmentos que recibe hasta que no
+    queda trabajo. En cada nodo se pueden correr varios trabajadores (uno por CPU).
+    :param diccionario: Diccionario ya indexado.
+    :return: Cantidad de fragmentos procesados.
+    """
+    nodo = nodo or f"{socket.gethostname()}:{os.getpid()}"
+    procesados = 0
+    with socket.create_connection((host, puerto)) as conexion, conexion.makefile('rwb') as canal:
+        canal.write(json.dumps({"tipo": "hola", "nodo": nodo, "huella": diccionario.huella}).encode('utf-8') + b"\n")
+        canal.flush()
+        while linea := canal.readline():
+            mensaje = json.loads(linea)
+            if mensaje["tipo"] == "fin":
+                break
+            inicio = time.perf_counter()
+            try:
+                respuesta = {"tipo": "resultado", "id": mensaje["id"],
+                             "resultados": procesar_texto(mensaje["oraciones"], diccionario, mensaje["motor"]),
+                             "segundos": time.perf_counter() - inicio}
+                procesados += 1
+            except Exception as error:
+                respuesta = {"tipo": "error", "id": mensaje["id"], "error": repr(error)}
+            canal.write(json.dumps(respuesta, ensure_ascii=False).encode('utf-8') + b"\n")
+            canal.flush()
+    return procesados
+
+
+def correr_trabajador(path_diccionario, host="127.0.0.1", puerto=8766, nodo=None):
+    """
+    Punto de entrada de un proceso trabajador: carga el diccionario y trabaja hasta que no queda trabajo.
+    """
+    from indice import cargar_diccionario
+
+    return trabajar(cargar_diccionario(path_diccionario), host, puerto, nodo)
+
+
+def imprimir_informe(informe, salida=sys.stderr):
+    print(f"{'Fragmento':>9} {'Nodo':<24} {'Oraciones':>9} {'MiB':>8} {'Segundos':>9} {'MiB/s':>8} {'Intentos':>8}",
+          file=salida)
+    rezagados = set(informe["rezagados"])
+    for fragmento in informe["fragmentos"]:
+        marca = "  REZAGADO" if fragmento["id"] in rezagados else ""
+        print(f"{fragmento['id']:>9} {fragmento['nodo']:<24} {fragmento['oraciones']:>9} "
+              f"{fragmento['bytes'] / 2 ** 20:>8.2f} {fragmento['segundos']:>9.3f} "
+              f"{fragmento['bytes_por_segundo'] / 2 ** 20:>8.2f} {fragmento['intentos']:>8}{marca}", file=salida)
+    for nombre, nodo in informe["por_nodo"].items():
+        print(f"Nodo {nombre}: {nodo['fragmentos']} fragmentos, {nodo['oraciones']} oraciones, "
+              f"{nodo['bytes'] / 2 ** 20 / nodo['segundos'] if nodo['segundos'] else 0.0:.2f} MiB/s", file=salida)
+    print(f"Total: {informe['segundos']:.2f}s, {informe['reintentos']} reintentos, "
+          f"{len(rezagados)} rezagados", file=salida)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Procesamiento por fragmentos repartido entre varios nodos.")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    parser_coordinar = subcomandos.add_parser("coordinar", help="reparte un archivo de oraciones y une los resultados")
+    parser_coordinar.add_argument("oraciones")
+    parser_coordinar.add_argument("salida")
+    parser_coordinar.add_argument("--host", default="0.0.0.0")
+    parser_coordinar.add_argument("--puerto", type=int, default=8766)
+    parser_coordinar.add_argument("--motor", default="conjunto")
+    parser_coordinar.add_argument("--fragmento-mib", type=float, default=TAMANIO_DE_FRAGMENTO / 2 ** 20)
+    parser_coordinar.add_argument("--reintentos", type=int, default=REINTENTOS)
+    parser_coordinar.add_argument("--plazo", type=float, help="segundos antes de reasignar un fragmento sin respuesta")
+    parser_coordinar.add_argument("--diccionario", help="si se indica, se rechazan trabajadores con otro diccionario")
+
+    parser_trabajar = subcomandos.add_parser("trabajar", help="procesa fragmentos de un coordinador")
+    parser_trabajar.add_argument("diccionario")
+    parser_trabajar.add_argument("--host", default="127.0.0.1")
+    parser_trabajar.add_argument("--puerto", type=int, default=8766)
+    parser_trabajar.add_argument("--procesos", type=int, default=1, help="trabajadores en este nodo")
+
+    argumentos = parser.parse_args(argv)
+
+    if argumentos.comando == "trabajar":
+        if argumentos.procesos == 1:
+            correr_trabajador(argumentos.diccionario, argumentos.host, argumentos.puerto)
+            return 0
+        import multiprocessing
+
+        procesos = [multiprocessing.Process(target=correr_trabajador,
+                                            args=(argumentos.diccionario, argumentos.host, argumentos.puerto))
+                    for _ in range(argumentos.procesos)]
+        for proceso in procesos:
+            proceso.start()
+        for proceso in procesos:
+            proceso.join()
+        return 0
+
+    huella = None
+    if argumentos.diccionario:
+        from indice import cargar_diccionario
+
+        huella = cargar_diccionario(argumentos.diccionario).huella
+    try:
+        informe = asyncio.run(coordinar(argumentos.oraciones, argumentos.salida, argumentos.host, argumentos.puerto,
+                                        motor=argumentos.motor,
+                                        tamanio_fragmento=max(1, int(argumentos.fragmento_mib * 2 ** 20)),
+                                        reintentos=argumentos.reintentos, plazo=argumentos.plazo, huella=huella))
+    except FragmentoFallido as error:
+        print(error, file=sys.stderr)
+        return 1
+    imprimir_informe(informe)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,320 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from diccionario import Diccionario, costos_desde_frecuencias, _hash_palabra
+from utils import leer_lineas
+
+# Formato del diccionario compilado (todos los enteros son uint32 en el orden de bytes indicado en los metadatos):
+#   MAGIA | cabecera | metadatos JSON | relleno hasta múltiplo de 4 | offsets | slots | blob
+# - blob: palabras ordenadas, codificadas en UTF-8 y concatenadas.
+# - offsets: cantidad + 1 posiciones; la palabra i ocupa blob[offsets[i]:offsets[i + 1]].
+# - slots: tabla hash con direccionamiento abierto (sondeo lineal) sobre crc32 de la palabra en UTF-8;
+#   cada slot guarda el índice de la palabra + 1, o 0 si está vacío.
+MAGIA = b"TP2DIC01"
+CABECERA = struct.Struct("<IIII")  # cantidad de palabras, cantidad de slots, bytes de metadatos, bytes del blob
+FACTOR_DE_CARGA = 2  # Slots por palabra (redondeado a potencia de 2)
+EXTENSION_COSTOS = ".costos"  # Archivo opcional junto al diccionario con la frecuencia de cada palabra
+
+
+def _cantidad_de_slots(cantidad):
+    slots = 1
+    while slots < cantidad * FACTOR_DE_CARGA:
+        slots *= 2
+    return slots
+
+
+class ConstructorTabla:
+    """
+    Construye de a una palabra los buffers de la tabla compacta: las palabras codificadas en UTF-8 y concatenadas
+    en un blob, sus offsets y una tabla hash de índices. Las repetidas se descartan consultando la misma tabla,
+    así nunca hace falta tener todas las palabras como str a la vez. Junto con la tabla acumula las
+    estadísticas que el Diccionario necesita sin recorrer las palabras.
+    """
+
+    def __init__(self):
+        self.offsets = array('I', [0])
+        self.slots = array('I', [0])
+        self.blob = bytearray()
+        self._longitudes_por_final = {}
+        self._huella = 0
+        self._caracteres = set()
+        self._iniciales = set()
+
+    def agregar(self, palabra):
+        """
+        Agrega la palabra si no es vacía y no estaba.
+        :return: True si se agregó.
+        """
+        if not palabra:
+            return False
+        codificada = palabra.encode('utf-8')
+        mascara = len(self.slots) - 1
+        slot = zlib.crc32(codificada) & mascara
+        while self.slots[slot]:
+            indice = self.slots[slot] - 1
+            if self.blob[self.offsets[indice]:self.offsets[indice + 1]] == codificada:
+                return False
+            slot = (slot + 1) & mascara
+
+        self.blob += codificada
+        self.offsets.append(len(self.blob))
+        self.slots[slot] = len(self.offsets) - 1
+        if (len(self.offsets) - 1) * FACTOR_DE_CARGA > len(self.slots):
+            self._redimensionar()
+
+        self._longitudes_por_final.setdefault(palabra[-1], set()).add(len(palabra))
+        self._huella += _hash_palabra(palabra)
+        self._caracteres.update(palabra)
+        self._iniciales.add(palabra[0])
+        return True
+
+    def _redimensionar(self):
+        cantidad = len(self.offsets) - 1
+        self.slots = array('I', bytes(4 * _cantidad_de_slots(cantidad)))
+        mascara = len(self.slots) - 1
+        for indice in range(cantidad):
+            slot = zlib.crc32(self.blob[self.offsets[indice]:self.offsets[indice + 1]]) & mascara
+            while self.slots[slot]:
+                slot = (slot + 1) & mascara
+            self.slots[slot] = indice + 1
+
+    def metadatos(self):
+        return {
+            "orden_de_bytes": sys.byteorder,
+            "longitudes": sorted({longitud for longitudes in self._longitudes_por_final.values()
+                                  for longitud in longitudes}),
+            "longitudes_por_final": {caracter: tuple(sorted(longitudes, reverse=True))
+                                     for caracter, longitudes in self._longitudes_por_final.items()},
+            "huella": f"{self._huella % 2 ** 64:016x}",
+            "caracteres": "".join(sorted(self._caracteres)),
+            "iniciales": "".join(sorted(self._iniciales)),
+        }
+
+    def tabla(self):
+        return TablaCompacta(self.offsets, self.slots, bytes(self.blob))
+
+
+def compilar_diccionario(path_diccionario, path_indice):
+    """
+    Compila un diccionario de texto (una palabra por línea) al formato binario que se puede mapear en memoria.
+    :param path_diccionario: Ruta del diccionario de texto.
+    :param path_indice: Ruta del archivo compilado a generar.
+    """
+    constructor = ConstructorTabla()
+    for palabra in sorted({palabra for palabra in leer_lineas(path_diccionario) if palabra}):
+        constructor.agregar(palabra)
+    metadatos = json.dumps(constructor.metadatos(), ensure_ascii=False).encode('utf-8')
+    relleno = b"\0" * (-(len(MAGIA) + CABECERA.size + len(metadatos)) % 4)
+
+    with open(path_indice, 'wb') as archivo:
+        archivo.write(MAGIA)
+        archivo.write(CABECERA.pack(len(constructor.offsets) - 1, len(constructor.slots), len(metadatos),
+                                    len(constructor.blob)))
+        archivo.write(metadatos)
+        archivo.write(relleno)
+        constructor.offsets.tofile(archivo)
+        constructor.slots.tofile(archivo)
+        archivo.write(constructor.blob)
+
+
+class TablaCompacta:
+    """
+    Conjunto de palabras de solo lectura sobre los buffers de ConstructorTabla: las consultas comparan bytes
+    directamente en el blob, sin crear un str por palabra.
+    """
+
+    def __init__(self, offsets, slots, blob):
+        """
+        :param offsets: Offsets de cada palabra en el blob (cantidad + 1 enteros sin signo de 32 bits).
+        :param slots: Tabla hash de índices + 1 (0 = slot vacío); su tamaño es una potencia de 2.
+        :param blob: Palabras codificadas en UTF-8 y concatenadas.
+        """
+        self.cantidad = len(offsets) - 1
+        self._offsets = offsets
+        self._slots = slots
+        self._blob = memoryview(blob)
+        self._mascara = len(slots) - 1
+
+    def _palabra(self, indice):
+        return self._blob[self._offsets[indice]:self._offsets[indice + 1]]
+
+    def __contains__(self, palabra):
+        codificada = palabra.encode('utf-8')
+        slot = zlib.crc32(codificada) & self._mascara
+        while True:
+            indice = self._slots[slot]
+            if not indice:
+                return False
+            if self._palabra(indice - 1) == codificada:
+                return True
+            slot = (slot + 1) & self._mascara
+
+    def __len__(self):
+        return self.cantidad
+
+    def __iter__(self):
+        for indice in range(self.cantidad):
+            yield bytes(self._palabra(indice)).decode('utf-8')
+
+    def __reduce__(self):
+        return TablaCompacta, (self._offsets, self._slots, self._blob.tobytes())
+
+
+class TablaCompilada(TablaCompacta):
+    """
+    Tabla compacta consultada directamente sobre el archivo compilado mapeado en memoria.
+    Varios procesos que abren el mismo archivo comparten las páginas a través del page cache.
+    """
+
+    def __init__(self, path_indice):
+        self.path = path_indice
+        with open(path_indice, 'rb') as archivo:
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mapa[:len(MAGIA)] != MAGIA:
+            raise ValueError(f"{path_indice} no es un diccionario compilado")
+
+        inicio = len(MAGIA)
+        cantidad, cantidad_slots, largo_metadatos, largo_blob = CABECERA.unpack_from(self._mapa, inicio)
+        inicio += CABECERA.size
+        self.metadatos = json.loads(self._mapa[inicio:inicio + largo_metadatos].decode('utf-8'))
+        if self.metadatos["orden_de_bytes"] != sys.byteorder:
+            raise ValueError(f"{path_indice} fue compilado con otro orden de bytes")
+        inicio += largo_metadatos
+        inicio += -inicio % 4
+
+        vista = memoryview(self._mapa)
+        offsets = vista[inicio:inicio + 4 * (cantidad + 1)].cast('I')
+        inicio += 4 * (cantidad + 1)
+        slots = vista[inicio:inicio + 4 * cantidad_slots].cast('I')
+        inicio += 4 * cantidad_slots
+        super().__init__(offsets, slots, vista[inicio:inicio + largo_blob])
+
+    def __reduce__(self):
+        # Al enviarse a otro proceso se vuelve a mapear el archivo en lugar de copiar su contenido.
+        return TablaCompilada, (self.path,)
+
+
+def es_diccionario_compilado(path):
+    with open(path, 'rb') as archivo:
+        return archivo.read(len(MAGIA)) == MAGIA
+
+
+def _diccionario_sobre_tabla(tabla, metadatos):
+    longitudes_por_final = {caracter: tuple(longitudes)
+                            for caracter, longitudes in metadatos["longitudes_por_final"].items()}
+    return Diccionario.desde_tabla(tabla, metadatos["longitudes"], longitudes_por_final, metadatos.get("huella"),
+                                   metadatos.get("caracteres"), metadatos.get("iniciales"))
+
+
+def cargar_diccionario_compilado(path_indice):
+    """
+    Abre un diccionario compilado sin leer sus palabras: las estadísticas salen de los metadatos
+    y las consultas se resuelven sobre el archivo mapeado.
+    """
+    tabla = TablaCompilada(path_indice)
+    return _diccionario_sobre_tabla(tabla, tabla.metadatos)
+
+
+def diccionario_compacto(palabras):
+    """
+    Indexa las palabras en una TablaCompacta en memoria en lugar de un set. Ocupa una fracción de la memoria
+    (útil con vocabularios de millones de palabras) a cambio de consultas más lentas.
+    :param palabras: Iterable de palabras; se consume una sola vez.
+    """
+    constructor = ConstructorTabla()
+    for palabra in palabras:
+        constructor.agregar(palabra)
+    return _diccionario_sobre_tabla(constructor.tabla(), constructor.metadatos())
+
+
+def cargar_diccionario(path, compacto=False):
+    """
+    Carga un diccionario desde un archivo de texto o desde un diccionario compilado (se detecta por su contenido).
+    :param path: Ruta del diccionario, o '-' para leer las palabras de la entrada estándar.
+    :param compacto: Si es True, un diccionario de texto se indexa con diccionario_compacto en lugar de un set.
+    Si junto al diccionario existe path + EXTENSION_COSTOS, se cargan sus frecuencias como costos (ver cargar_costos).
+    """
+    if path != "-" and es_diccionario_compilado(path):
+        diccionario = cargar_diccionario_compilado(path)
+    elif compacto:
+        diccionario = diccionario_compacto(leer_lineas(path))
+    else:
+        diccionario = Diccionario(leer_lineas(path))
+
+    if path != "-" and os.path.exists(path + EXTENSION_COSTOS):
+        cargar_costos(diccionario, path + EXTENSION_COSTOS)
+    return diccionario
+
+
+def cargar_costos(diccionario, path_costos):
+    """
+    Lee un archivo de frecuencias (una línea 'palabra frecuencia' por palabra) y asigna al diccionario
+    los costos de unigrama correspondientes, que usa el motor 'viterbi'.
+    """
+    frecuencias = {}
+    for linea in leer_lineas(path_costos):
+        if linea.strip():
+            palabra, frecuencia = linea.rsplit(maxsplit=1)
+            frecuencias[palabra] = float(frecuencia)
+    diccionario.asignar_costos(*costos_desde_frecuencias(frecuencias))
+
+
+def _memoria_de_representacion(path_diccionario, representacion, oraciones):
+    """
+    Carga el diccionario con la representación indicada, segmenta las oraciones y devuelve
+    (RSS actual, pico de RSS) del proceso en MiB. Se ejecuta en un proceso nuevo para cada representación.
+    """
+    import gc
+    from algoritmo import procesar_texto
+
+    if representacion == "conjunto":
+        diccionario = Diccionario(leer_lineas(path_diccionario))
+    elif representacion == "compacto":
+        diccionario = diccionario_compacto(leer_lineas(path_diccionario))
+    else:
+        diccionario = cargar_diccionario_compilado(path_diccionario)
+    procesar_texto(oraciones, diccionario)
+    gc.collect()
+    # VmHWM se reinicia al ejecutar el proceso nuevo (ru_maxrss en cambio se hereda del proceso padre).
+    with open("/proc/self/status") as archivo:
+        estado = dict(linea.split(":", 1) for linea in archivo)
+    return int(estado["VmRSS"].split()[0]) / 1024, int(estado["VmHWM"].split()[0]) / 1024
+
+
+def comparar_memoria(palabras, oraciones):
+    """
+    Mide la memoria residente de cada representación del diccionario (set de str, tabla compacta en memoria
+    y archivo compilado mapeado), cada una en un proceso nuevo.
+    :return: Diccionario representación -> (RSS actual, pico de RSS) en MiB.
+    """
+    import multiprocessing
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directorio:
+        path_texto = os.path.join(directorio, "diccionario.txt")
+        path_indice = os.path.join(directorio, "diccionario.idx")
+        with open(path_texto, 'w', encoding='utf-8') as archivo:
+            archivo.write("\n".join(palabras))
+        compilar_diccionario(path_texto, path_indice)
+
+        contexto = multiprocessing.get_context("spawn")
+        resultados = {}
+        for representacion, path in [("conjunto", path_texto), ("compacto", path_texto), ("compilado", path_indice)]:
+            with contexto.Pool(1) as pool:
+                resultados[representacion] = pool.apply(_memoria_de_representacion, (path, representacion, oraciones))
+        return resultados
+
+
+if __name__ == "__main__":
+    from corpus import GeneradorCorpus
+
+    corpus = GeneradorCorpus(0, 3, 23, densidad_ambigua=0.0, fraccion_invalidas=0.0)
+    palabras = corpus.generar_diccionario(1_000_000)
+    oraciones = list(corpus.generar_oraciones(palabras, 1000, 10))
+    for representacion, (actual, pico) in comparar_memoria(palabras, oraciones).items():
+        print(f"{representacion}: RSS {actual:.1f} MiB, pico {pico:.1f} MiB")
@@ -0,0 +1,174 @@
+import weakref
+import numpy as np
+from diccionario import como_diccionario
+
+BASE = 1_000_003  # Base del hash polinomial; la aritmética es módulo 2^64 (desborde natural de uint64)
+MASCARA_64 = (1 << 64) - 1
+BITS_DE_FILTRO_POR_PALABRA = 8  # Tamaño del filtro de cada longitud, en entradas por palabra
+SEPARADOR = "\0"  # Separa las oraciones al concatenar un lote; no forma parte de ninguna palabra
+
+# Hashes de las palabras de cada diccionario, agrupados por longitud, junto con la versión del diccionario
+# con la que se calcularon; se recalculan solo si el diccionario se modificó.
+_tablas_por_diccionario = weakref.WeakKeyDictionary()
+
+
+def _hash_palabra(palabra):
+    valor = 0
+    for caracter in palabra:
+        valor = (valor * BASE + ord(caracter)) & MASCARA_64
+    return valor
+
+
+def _tablas_hash(diccionario):
+    """
+    Devuelve un diccionario longitud -> (hashes ordenados, filtro, desplazamiento) para las palabras de esa longitud.
+    El filtro es un array booleano indexado por los bits altos del hash; descarta casi todas las ventanas
+    con un único acceso a memoria antes de la búsqueda binaria en los hashes ordenados.
+    """
+    version, tablas = _tablas_por_diccionario.get(diccionario, (None, None))
+    if version != diccionario.version:
+        por_longitud = {}
+        for palabra in diccionario.palabras:
+            if palabra:
+                por_longitud.setdefault(len(palabra), []).append(_hash_palabra(palabra))
+        tablas = {}
+        for longitud, hashes in por_longitud.items():
+            hashes = np.unique(np.array(hashes, dtype=np.uint64))
+            bits = min(max((len(hashes) * BITS_DE_FILTRO_POR_PALABRA).bit_length(), 10), 24)
+            desplazamiento = np.uint64(64 - bits)
+            filtro = np.zeros(1 << bits, dtype=bool)
+            filtro[hashes >> desplazamiento] = True
+            tablas[longitud] = (hashes, filtro, desplazamiento)
+        _tablas_por_diccionario[diccionario] = diccionario.version, tablas
+    return tablas
+
+
+def _coincidencias(texto, diccionario, sondas=None):
+    """
+    Calcula con operaciones vectorizadas todas las posiciones del texto donde empieza una palabra del diccionario.
+    Para cada longitud l se obtiene el hash de todas las ventanas de largo l a partir del de largo l - 1,
+    y se marca la ventana si su hash pasa el filtro y está en la tabla ordenada de esa longitud
+    (puede haber falsos positivos por colisión, que se descartan al propagar).
+    :param sondas: Counter opcional donde se suman las ventanas consultadas ("sondas") y las que coinciden
+                   con una palabra ("aciertos"), una vez por longitud (ver algoritmo._segmentar_con_traza).
+    :return: Tupla (inicios, longitudes) de arrays ordenados por inicio.
+    """
+    tablas = _tablas_hash(diccionario)
+    codigos = np.frombuffer(texto.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    n = len(codigos)
+    base = np.uint64(BASE)
+
+    inicios = []
+    longitudes = []
+    hashes = codigos.copy()
+    for longitud in range(1, min(diccionario.max_long, n) + 1):
+        if longitud > 1:
+            hashes = hashes[:-1] * base + codigos[longitud - 1:]
+        if longitud not in tablas:
+            continue
+        tabla, filtro, desplazamiento = tablas[longitud]
+        posiciones = np.flatnonzero(filtro[hashes >> desplazamiento])
+        candidatos = np.searchsorted(tabla, hashes[posiciones])
+        np.minimum(candidatos, len(tabla) - 1, out=candidatos)
+        posiciones = posiciones[tabla[candidatos] == hashes[posiciones]]
+        if sondas is not None:
+            sondas["sondas"] += len(hashes)
+            sondas["aciertos"] += len(posiciones)
+        inicios.append(posiciones)
+        longitudes.append(np.full(len(posiciones), longitud, dtype=np.int64))
+
+    if not inicios:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    inicios = np.concatenate(inicios)
+    longitudes = np.concatenate(longitudes)
+    orden = np.argsort(inicios, kind='stable')
+    return inicios[orden], longitudes[orden]
+
+
+def _propagar(oracion, palabras, inicios, longitudes):
+    """
+    Propaga la alcanzabilidad recorriendo las coincidencias en orden de inicio creciente, así cada path[i]
+    queda con el menor j válido como en el motor por conjunto. La subcadena solo se construye para confirmar
+    una coincidencia que marcaría una posición nueva (descarta colisiones del hash).
+    :return: Tupla (existencia_parcial, path).
+    """
+    n = len(oracion)
+    existencia_parcial = [False] * (n + 1)
+    existencia_parcial[0] = True
+    path = [None] * (n + 1)
+
+    alcance = 0
+    for j, longitud in zip(inicios, longitudes):
+        if j > alcance:
+            break  # Ninguna posición alcanzada llega hasta j: ya no se puede avanzar
+        if existencia_parcial[j]:
+            i = j + longitud
+            if i <= n and not existencia_parcial[i] and oracion[j:i] in palabras:
+                existencia_parcial[i] = True
+                path[i] = j
+                alcance = max(alcance, i)
+
+    return existencia_parcial, path
+
+
+def segmentar_numpy(oracion, diccionario, sondas=None):
+    """
+    Motor 'numpy' para una sola oración. Para lotes conviene procesar_lote_numpy, que vectoriza todo el lote junto.
+    :param sondas: Counter opcional de consultas a las tablas de hashes (ver _coincidencias).
+    :return: Tupla (existencia_parcial, path).
+    """
+    inicios, longitudes = _coincidencias(oracion, diccionario, sondas)
+    return _propagar(oracion, diccionario.palabras, inicios.tolist(), longitudes.tolist())
+
+
+def procesar_lote_numpy(oraciones, diccionario):
+    """
+    Procesa un lote de oraciones calculando las coincidencias de todas ellas en una única pasada vectorizada
+    sobre el texto concatenado. Devuelve lo mismo que procesar_texto.
+    :param oraciones: Lista de oraciones.
+    :param diccionario: Diccionario utilizado para la segmentación (Diccionario o lista de palabras).
+    """
+    from algoritmo import reconstruir_segmentacion
+
+    diccionario = como_diccionario(diccionario)
+    inicios, longitudes = _coincidencias(SEPARADOR.join(oraciones), diccionario)
+
+    resultado = []
+    desplazamiento = 0
+    for oracion in oraciones:
+        n = len(oracion)
+        desde, hasta = np.searchsorted(inicios, [desplazamiento, desplazamiento + n])
+        existencia_parcial, path = _propagar(oracion, diccionario.palabras,
+                                             (inicios[desde:hasta] - desplazamiento).tolist(),
+                                             longitudes[desde:hasta].tolist())
+        if existencia_parcial[n]:
+            resultado.append(" ".join(reconstruir_segmentacion(path, n, oracion)))
+        else:
+            resultado.append("No es un mensaje")
+        desplazamiento += n + len(SEPARADOR)
+
+    return resultado
+
+
+if __name__ == "__main__":
+    import time
+    from algoritmo import procesar_texto
+    from utils import wrapper_leer_archivo
+
+    for entrada, palabras in [("casos/5000_in.txt", "casos/supergigante.txt"),
+                              ("casos/2000_in.txt", "casos/supergigante.txt")]:
+        oraciones, lista = wrapper_leer_archivo(entrada, palabras)
+        diccionario = como_diccionario(lista)
+        _tablas_hash(diccionario)
+
+        inicio = time.perf_counter()
+        esperado = procesar_texto(oraciones, diccionario)
+        tiempo_python = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        obtenido = procesar_lote_numpy(oraciones, diccionario)
+        tiempo_numpy = time.perf_counter() - inicio
+
+        assert obtenido == esperado
+        print(f"{entrada}: conjunto {tiempo_python:.4f}s, numpy {tiempo_numpy:.4f}s")
@@ -0,0 +1,163 @@
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from algoritmo import procesar_texto, procesar_flujo, clave_de_cache
+from diccionario import como_diccionario
+
+CHUNKS_POR_WORKER = 4  # Cantidad de chunks por worker cuando no se indica chunk_size, para balancear la carga
+CHUNK_SIZE_FLUJO = 256  # Oraciones por chunk al procesar un flujo de longitud desconocida
+CHUNKS_EN_VUELO_POR_WORKER = 2  # Chunks pendientes por worker en modo flujo; acota la memoria usada
+
+# Estado de cada proceso worker: se carga una única vez en el initializer del pool.
+_diccionario_worker = None
+_motor_worker = None
+_registro_worker = None
+
+
+def _inicializar_worker(diccionario, motor, paths=None):
+    """
+    Initializer del pool: deja el diccionario ya indexado en el proceso worker.
+    Con el método de inicio 'fork' el diccionario se hereda sin serializarse.
+    Si se indican paths, el worker además carga su propio registro de diccionarios con nombre.
+    """
+    global _diccionario_worker, _motor_worker, _registro_worker
+    _diccionario_worker = diccionario
+    _motor_worker = motor
+    if paths:
+        from registro import RegistroDiccionarios
+
+        _registro_worker = RegistroDiccionarios()
+        for nombre, path in paths.items():
+            _registro_worker.registrar(nombre, path)
+
+
+def _procesar_chunk(oraciones):
+    rechazos = Counter()
+    return procesar_texto(oraciones, _diccionario_worker, _motor_worker, rechazos=rechazos), rechazos
+
+
+def _procesar_chunk_de(nombre, oraciones):
+    """
+    Como _procesar_chunk, pero con un diccionario del registro del worker. Antes de procesar se recarga
+    si su archivo cambió; el chunk usa de principio a fin una única versión del diccionario.
+    """
+    _registro_worker.actualizar(nombre)
+    rechazos = Counter()
+    return procesar_texto(oraciones, _registro_worker.obtener(nombre), _motor_worker, rechazos=rechazos), rechazos
+
+
+def crear_pool(diccionario, workers, motor="conjunto", paths=None):
+    """
+    Crea un pool de procesos que ya tiene el diccionario cargado en cada worker.
+    :param diccionario: Diccionario o lista de palabras.
+    :param workers: Cantidad de procesos.
+    :param motor: Motor de segmentación a usar en los workers.
+    :param paths: Diccionario opcional nombre -> path con diccionarios adicionales para _procesar_chunk_de.
+    """
+    return ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_worker,
+                               initargs=(como_diccionario(diccionario), motor, paths))
+
+
+def dividir_en_chunks(oraciones, chunk_size):
+    """
+    Divide la lista de oraciones en listas consecutivas de a lo sumo chunk_size elementos.
+    """
+    return [oraciones[i:i + chunk_size] for i in range(0, len(oraciones), chunk_size)]
+
+
+def agrupar_en_chunks(oraciones, chunk_size):
+    """
+    Generador que agrupa un iterable (posiblemente infinito) en listas de a lo sumo chunk_size oraciones.
+    """
+    iterador = iter(oraciones)
+    chunk = list(islice(iterador, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterador, chunk_size))
+
+
+def procesar_flujo_paralelo(oraciones, diccionario, workers=None, chunk_size=CHUNK_SIZE_FLUJO, motor="conjunto",
+                            cache=None, rechazos=None):
+    """
+    Versión multiproceso de procesar_flujo. Lee las oraciones de forma perezosa, mantiene a lo sumo
+    CHUNKS_EN_VUELO_POR_WORKER chunks pendientes por worker y devuelve los resultados en el orden de la entrada.
+    :param oraciones: Iterable de oraciones.
+    :param diccionario: Diccionario utilizado para la segmentación (Diccionario o lista de palabras).
+    :param workers: Cantidad de procesos (por defecto, la cantidad de CPUs). Con 1 se procesa en el proceso actual.
+    :param chunk_size: Cantidad de oraciones por tarea.
+    :param motor: Nombre del motor de segmentación.
+    :param cache: CacheSegmentaciones opcional; se consulta en el proceso principal y solo se envían los fallos.
+    :param rechazos: Counter opcional donde se acumulan los motivos de rechazo informados por los workers.
+    """
+    diccionario = como_diccionario(diccionario)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        yield from procesar_flujo(oraciones, diccionario, motor, cache, rechazos)
+        return
+
+    huella = clave_de_cache(diccionario, motor) if cache is not None else None
+    pendientes = deque()
+    with crear_pool(diccionario, workers, motor) as executor:
+        for chunk in agrupar_en_chunks(oraciones, chunk_size):
+            if cache is None:
+                resueltos = [None] * len(chunk)
+            else:
+                resueltos = [cache.obtener((huella, oracion)) for oracion in chunk]
+            faltantes = [oracion for oracion, resuelto in zip(chunk, resueltos) if resuelto is None]
+            pendientes.append((chunk, resueltos, executor.submit(_procesar_chunk, faltantes)))
+
+            if len(pendientes) >= workers * CHUNKS_EN_VUELO_POR_WORKER:
+                yield from _completar_chunk(*pendientes.popleft(), cache, huella, rechazos)
+            while pendientes and pendientes[0][2].done():
+                yield from _completar_chunk(*pendientes.popleft(), cache, huella, rechazos)
+        while pendientes:
+            yield from _completar_chunk(*pendientes.popleft(), cache, huella, rechazos)
+
+
+def _completar_chunk(chunk, resueltos, futuro, cache, huella, rechazos):
+    """
+    Combina los resultados tomados del cache con los calculados por el worker, respetando el orden del chunk.
+    """
+    calculados, rechazos_chunk = futuro.result()
+    if rechazos is not None:
+        rechazos.update(rechazos_chunk)
+    calculados = iter(calculados)
+    for oracion, resuelto in zip(chunk, resueltos):
+        if resuelto is None:
+            resuelto = next(calculados)
+            if cache is not None:
+                cache.agregar((huella, oracion), resuelto)
+        yield resuelto
+
+
+def procesar_texto_paralelo(oraciones, diccionario, workers=None, chunk_size=None, motor="conjunto", rechazos=None):
+    """
+    Versión multiproceso de procesar_texto. El diccionario se envía una sola vez a cada worker
+    y las oraciones se reparten en chunks; el resultado respeta el orden de la entrada.
+    :param oraciones: Lista de oraciones a procesar.
+    :param diccionario: Diccionario utilizado para la segmentación (Diccionario o lista de palabras).
+    :param workers: Cantidad de procesos (por defecto, la cantidad de CPUs). Con 1 se procesa en el proceso actual.
+    :param chunk_size: Cantidad de oraciones por tarea (por defecto se reparten CHUNKS_POR_WORKER chunks por worker).
+    :param motor: Nombre del motor de segmentación.
+    :param rechazos: Counter opcional donde se acumulan los motivos de rechazo informados por los workers.
+    """
+    oraciones = list(oraciones)
+    diccionario = como_diccionario(diccionario)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(oraciones) <= 1:
+        return procesar_texto(oraciones, diccionario, motor, rechazos=rechazos)
+
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(oraciones) // (workers * CHUNKS_POR_WORKER)))
+
+    resultado = []
+    with crear_pool(diccionario, workers, motor) as executor:
+        for parcial, rechazos_chunk in executor.map(_procesar_chunk, dividir_en_chunks(oraciones, chunk_size)):
+            resultado.extend(parcial)
+            if rechazos is not None:
+                rechazos.update(rechazos_chunk)
+
+    return resultado
@@ -0,0 +1,130 @@
+import os
+import threading
+import weakref
+from algoritmo import procesar_texto
+from indice import cargar_diccionario
+
+
+def firma_de_archivo(path):
+    """
+    Identifica la versión de un archivo en disco sin leerlo. Incluye el inodo para detectar
+    reemplazos por renombre aunque conserven la fecha de modificación y el tamaño.
+    """
+    estado = os.stat(path)
+    return estado.st_ino, estado.st_size, estado.st_mtime_ns
+
+
+class RegistroDiccionarios:
+    """
+    Mantiene cargados varios diccionarios con nombre y los recarga cuando cambia su archivo.
+    - Las lecturas no toman ningún lock: obtener() devuelve la versión vigente y quien la está usando
+      la conserva hasta terminar, aunque mientras tanto se publique una nueva.
+    - La recarga se hace fuera del registro y la nueva versión se publica con una única asignación.
+    - Dos nombres con las mismas palabras y los mismos costos comparten el mismo Diccionario en memoria.
+      Los diccionarios compilados además comparten sus páginas entre procesos a través del page cache.
+    Para evitar leer un archivo a medio escribir conviene reemplazarlo por renombre (os.replace).
+    """
+
+    def __init__(self):
+        self._entradas = {}  # nombre -> (path, firma, diccionario); cada tupla se reemplaza entera
+        self._por_huella = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()  # Serializa cargas y recargas, no las lecturas
+        self._vigilancia = None
+        self._detener = threading.Event()
+        self.recargas = 0
+        self.errores = {}  # nombre -> último error al recargar (se conserva la versión anterior)
+
+    def registrar(self, nombre, path):
+        """
+        Carga el diccionario de path (texto o compilado) y lo publica con el nombre dado.
+        """
+        with self._lock:
+            self._entradas[nombre] = self._cargar(path)
+
+    def quitar(self, nombre):
+        with self._lock:
+            del self._entradas[nombre]
+
+    def obtener(self, nombre):
+        """
+        Devuelve la versión vigente del diccionario. Lanza KeyError si el nombre no está registrado.
+        """
+        return self._entradas[nombre][2]
+
+    def nombres(self):
+        return list(self._entradas)
+
+    def paths(self):
+        return {nombre: entrada[0] for nombre, entrada in self._entradas.items()}
+
+    def __contains__(self, nombre):
+        return nombre in self._entradas
+
+    def procesar_texto(self, nombre, oraciones, motor="conjunto", cache=None, rechazos=None):
+        """
+        Segmenta las oraciones con la versión del diccionario vigente al momento de la llamada.
+        """
+        return procesar_texto(oraciones, self.obtener(nombre), motor, cache, rechazos)
+
+    def actualizar(self, nombre):
+        """
+        Recarga el diccionario si su archivo cambió desde la última carga.
+        :return: True si se publicó una nueva versión.
+        """
+        with self._lock:
+            if nombre not in self._entradas:
+                return False  # Se quitó mientras se esperaba el lock
+            path, firma, _ = self._entradas[nombre]
+            try:
+                if firma_de_archivo(path) == firma:
+                    return False
+                entrada = self._cargar(path)
+                if firma_de_archivo(path) != entrada[1]:
+                    return False  # El archivo cambió durante la carga; se reintenta en la próxima revisión
+            except Exception as error:
+                # Cualquier archivo inválido (por ejemplo, un compilado a medio escribir) deja la versión vigente.
+                self.errores[nombre] = error
+                return False
+            self._entradas[nombre] = entrada
+            self.errores.pop(nombre, None)
+            self.recargas += 1
+            return True
+
+    def recargar_cambiados(self):
+        """
+        Revisa todos los diccionarios registrados y recarga los que cambiaron.
+        :return: Lista con los nombres recargados.
+        """
+        return [nombre for nombre in self.nombres() if self.actualizar(nombre)]
+
+    def vigilar(self, intervalo=1.0):
+        """
+        Inicia un hilo que revisa los archivos cada intervalo segundos y recarga los que cambiaron.
+        """
+        if self._vigilancia is not None:
+            return
+        self._detener.clear()
+
+        def revisar():
+            while not self._detener.wait(intervalo):
+                self.recargar_cambiados()
+
+        self._vigilancia = threading.Thread(target=revisar, name="vigilancia-diccionarios", daemon=True)
+        self._vigilancia.start()
+
+    def detener(self):
+        if self._vigilancia is not None:
+            self._detener.set()
+            self._vigilancia.join()
+            self._vigilancia = None
+
+    def _cargar(self, path):
+        firma = firma_de_archivo(path)
+        diccionario = cargar_diccionario(path)
+        clave = (diccionario.huella, diccionario.huella_costos)
+        compartido = self._por_huella.get(clave)
+        if compartido is not None:
+            diccionario = compartido
+        else:
+            self._por_huella[clave] = diccionario
+        return path, firma, diccionario
@@ -0,0 +1,138 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from algoritmo import procesar_texto, MOTORES
+from indice import cargar_diccionario
+from utils import parsear_resultados, leer_archivo_como_list
+
+PATH_RESULTADOS = "casos/Resultados Esperados.txt"
+NO_ES_UN_MENSAJE = "No es un mensaje"
+# Presupuesto de tiempo de cada caso: un mínimo fijo más un tiempo por carácter de entrada. Deja un margen
+# amplio sobre el motor más lento, de modo que solo fallan las regresiones de orden (por ejemplo, cuadráticas).
+PRESUPUESTO_MINIMO = 0.5  # Segundos
+PRESUPUESTO_POR_CARACTER = 20e-6  # Segundos
+# Multiplica los presupuestos, para máquinas lentas o cargadas (variable de entorno).
+FACTOR_PRESUPUESTO = float(os.environ.get("REGRESION_FACTOR_PRESUPUESTO", 1.0))
+MARGEN_DE_ESPERA = 5.0  # Segundos extra antes de dar por colgados los casos que no terminaron
+
+_diccionarios_worker = {}  # path -> Diccionario, cargado una vez por proceso
+
+
+def presupuesto(caracteres):
+    """
+    Tiempo máximo de segmentación (en segundos) de un caso con la cantidad de caracteres indicada.
+    """
+    return (PRESUPUESTO_MINIMO + caracteres * PRESUPUESTO_POR_CARACTER) * FACTOR_PRESUPUESTO
+
+
+def validar_resultado(oracion, resultado, esperado, diccionario):
+    """
+    Verifica un resultado contra el esperado. Como puede haber varias segmentaciones válidas, no se exige
+    que coincidan las palabras: cada una debe estar en el diccionario, su concatenación tiene que ser la oración
+    y el veredicto (mensaje o "No es un mensaje") debe coincidir con el esperado.
+    :return: Descripción del error, o None si el resultado es correcto.
+    """
+    if (resultado == NO_ES_UN_MENSAJE) != (esperado == NO_ES_UN_MENSAJE):
+        return f"se esperaba {esperado!r} y se obtuvo {resultado!r}"
+    if resultado == NO_ES_UN_MENSAJE:
+        return None
+    palabras = resultado.split(" ") if resultado else []
+    if "".join(palabras) != oracion:
+        return f"la segmentación {resultado!r} no reconstruye la oración"
+    desconocidas = [palabra for palabra in palabras if palabra not in diccionario]
+    if desconocidas:
+        return f"palabras fuera del diccionario: {desconocidas}"
+    return None
+
+
+def verificar_caso(caso, motor):
+    """
+    Segmenta las oraciones de un caso con el motor indicado, mide el tiempo y valida cada resultado.
+    El diccionario se carga una sola vez por proceso y no cuenta en el tiempo.
+    :return: Diccionario con el caso, el motor, el tiempo, el presupuesto y la lista de errores.
+    """
+    diccionario = _diccionarios_worker.get(caso["palabras"])
+    if diccionario is None:
+        diccionario = _diccionarios_worker[caso["palabras"]] = cargar_diccionario(caso["palabras"])
+    oraciones = leer_archivo_como_list(caso["entrada"])
+
+    inicio = time.perf_counter()
+    resultados = procesar_texto(oraciones, diccionario, motor)
+    tiempo = time.perf_counter() - inicio
+
+    errores = []
+    if len(oraciones) != len(caso["mensajes"]):
+        errores.append(f"{len(oraciones)} oraciones y {len(caso['mensajes'])} resultados esperados")
+    for i, (oracion, resultado, esperado) in enumerate(zip(oraciones, resultados, caso["mensajes"]), 1):
+        error = validar_resultado(oracion, resultado, esperado, diccionario)
+        if error is not None:
+            errores.append(f"oración {i}: {error}")
+
+    limite = presupuesto(sum(len(oracion) for oracion in oraciones))
+    if tiempo > limite:
+        errores.append(f"tardó {tiempo:.3f}s y el presupuesto es {limite:.3f}s")
+    return {"entrada": caso["entrada"], "palabras": caso["palabras"], "motor": motor, "tiempo": tiempo,
+            "presupuesto": limite, "errores": errores}
+
+
+def _verificar_caso(argumentos):
+    return verificar_caso(*argumentos)
+
+
+def correr_casos(casos, motores, workers=None):
+    """
+    Verifica cada caso con cada motor en un pool de procesos. Si algún caso no termina a tiempo, el pool se
+    termina y esos casos se informan con error, así un cuelgue no bloquea la corrida.
+    :param casos: Casos como los devuelve utils.parsear_resultados.
+    :param motores: Nombres de los motores a verificar.
+    :param workers: Cantidad de procesos (por defecto, la cantidad de CPUs).
+    :return: Lista de resultados de verificar_caso, en el orden de casos y motores.
+    """
+    workers = workers or os.cpu_count() or 1
+    tareas = [(caso, motor) for caso in casos for motor in motores]
+    # Con el peor caso de presupuesto en cada tarea, el pool completo tarda a lo sumo esto.
+    espera = max((presupuesto(os.path.getsize(caso["entrada"])) for caso in casos), default=0.0)
+    espera = espera * -(-len(tareas) // workers) + MARGEN_DE_ESPERA
+
+    # multiprocessing.Pool (y no ProcessPoolExecutor) porque permite terminar los procesos de un caso colgado.
+    with multiprocessing.Pool(workers) as pool:
+        pendientes = [pool.apply_async(_verificar_caso, (tarea,)) for tarea in tareas]
+        limite = time.monotonic() + espera
+        resultados = []
+        for (caso, motor), pendiente in zip(tareas, pendientes):
+            try:
+                resultados.append(pendiente.get(max(0.0, limite - time.monotonic())))
+            except multiprocessing.TimeoutError:
+                resultados.append(_fallido(caso, motor, f"no terminó en {espera:.1f}s"))
+            except Exception as error:
+                resultados.append(_fallido(caso, motor, f"excepción: {error!r}"))
+        pool.terminate()
+    return resultados
+
+
+def _fallido(caso, motor, error):
+    return {"entrada": caso["entrada"], "palabras": caso["palabras"], "motor": motor, "tiempo": None,
+            "presupuesto": None, "errores": [error]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifica los casos de casos/ con cada motor, con presupuesto de tiempo.")
+    parser.add_argument("--resultados", default=PATH_RESULTADOS, help="archivo de resultados esperados")
+    parser.add_argument("--motores", nargs="+", choices=sorted(MOTORES), default=sorted(MOTORES))
+    parser.add_argument("--workers", type=int, default=None)
+    argumentos = parser.parse_args(argv)
+
+    resultados = correr_casos(parsear_resultados(argumentos.resultados), argumentos.motores, argumentos.workers)
+    for resultado in resultados:
+        tiempo = "-" if resultado["tiempo"] is None else f"{resultado['tiempo']:.3f}s"
+        estado = "ERROR" if resultado["errores"] else "ok"
+        print(f"{estado:<5} {resultado['motor']:<9} {tiempo:>8} {resultado['entrada']}")
+        for error in resultado["errores"]:
+            print(f"      {error}")
+    return 1 if any(resultado["errores"] for resultado in resultados) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
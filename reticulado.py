@@ -0,0 +1,189 @@
+import heapq
+from algoritmo import motivo_de_rechazo
+from diccionario import como_diccionario
+
+
+def menos_palabras(palabra):
+    """
+    Puntaje por defecto: cada palabra resta 1, así las mejores segmentaciones son las de menos palabras.
+    """
+    return -1
+
+
+def puntaje_por_longitud(palabra):
+    """
+    Premia las palabras largas: la suma de los cuadrados de las longitudes crece al usar menos palabras más largas.
+    """
+    return len(palabra) ** 2
+
+
+class Reticulado:
+    """
+    Todas las segmentaciones de una oración representadas como un grafo dirigido acíclico: los nodos son
+    las posiciones de corte y hay una arista j -> i por cada palabra oracion[j:i] del diccionario.
+    Solo se guardan las posiciones alcanzables desde 0 desde las que además se llega a n, así todo camino
+    que empieza en 0 termina en una segmentación válida. Ocupa O(n * longitudes distintas) aunque la cantidad
+    de segmentaciones sea exponencial.
+    """
+
+    def __init__(self, oracion, entrantes):
+        """
+        :param oracion: Oración segmentada.
+        :param entrantes: Diccionario posición i -> tupla de posiciones j con arista j -> i, en orden creciente.
+        """
+        self.oracion = oracion
+        self.n = len(oracion)
+        self.entrantes = entrantes
+        self._salientes = None
+
+    @property
+    def posiciones(self):
+        """
+        Posiciones de corte de alguna segmentación, en orden creciente (vacío si no hay ninguna).
+        """
+        if not self.entrantes and self.n:
+            return []
+        return sorted({0} | set(self.entrantes))
+
+    @property
+    def salientes(self):
+        """
+        Diccionario posición j -> tupla de posiciones i con arista j -> i, en orden creciente.
+        """
+        if self._salientes is None:
+            salientes = {}
+            for i in sorted(self.entrantes):
+                for j in self.entrantes[i]:
+                    salientes.setdefault(j, []).append(i)
+            self._salientes = {j: tuple(destinos) for j, destinos in salientes.items()}
+        return self._salientes
+
+    def aristas(self):
+        return [(j, i) for i in sorted(self.entrantes) for j in self.entrantes[i]]
+
+    def __bool__(self):
+        return self.n == 0 or self.n in self.entrantes
+
+    def cantidad(self):
+        """
+        Cantidad de segmentaciones distintas, contando caminos en el grafo (sin enumerarlos).
+        """
+        if not self:
+            return 0
+        caminos = {0: 1}
+        for i in sorted(self.entrantes):
+            caminos[i] = sum(caminos[j] for j in self.entrantes[i])
+        return caminos[self.n]
+
+    def enumerar(self):
+        """
+        Generador perezoso de todas las segmentaciones (listas de palabras), en orden lexicográfico de cortes.
+        Como no hay posiciones sin salida, el costo entre dos segmentaciones es proporcional a su largo.
+        """
+        if not self:
+            return
+        if self.n == 0:
+            yield []
+            return
+        salientes = self.salientes
+        cortes = [0]
+        pendientes = [iter(salientes[0])]
+        while pendientes:
+            i = next(pendientes[-1], None)
+            if i is None:
+                pendientes.pop()
+                cortes.pop()
+            elif i == self.n:
+                yield [self.oracion[j:k] for j, k in zip(cortes, cortes[1:] + [i])]
+            else:
+                cortes.append(i)
+                pendientes.append(iter(salientes[i]))
+
+    def mejores(self, k, puntaje=menos_palabras):
+        """
+        Las k segmentaciones de mayor puntaje, por programación dinámica sobre el grafo: cada posición guarda
+        sus k mejores prefijos, por lo que el costo es O(aristas * k log k) y no depende de la cantidad total.
+        :param k: Cantidad de segmentaciones a devolver.
+        :param puntaje: Función palabra -> número; el puntaje de una segmentación es la suma sobre sus palabras.
+        :return: Lista de tuplas (puntaje, palabras) de mayor a menor puntaje.
+        """
+        if not self or k <= 0:
+            return []
+        # mejores_en[i] = lista de (puntaje, j, índice en mejores_en[j]) de los k mejores prefijos que terminan en i.
+        mejores_en = {0: [(0, None, None)]}
+        for i in sorted(self.entrantes):
+            candidatos = ((puntaje_j + puntaje(self.oracion[j:i]), j, indice)
+                          for j in self.entrantes[i]
+                          for indice, (puntaje_j, _, _) in enumerate(mejores_en[j]))
+            mejores_en[i] = heapq.nlargest(k, candidatos, key=lambda candidato: candidato[0])
+
+        resultado = []
+        for total, j, indice in mejores_en[self.n]:
+            palabras = []
+            i = self.n
+            while j is not None:
+                palabras.append(self.oracion[j:i])
+                i, (_, j, indice) = j, mejores_en[j][indice]
+            resultado.append((total, palabras[::-1]))
+        return resultado
+
+    def a_dict(self):
+        """
+        Representación compacta para serializar: posiciones de corte y aristas (j, i).
+        """
+        return {"oracion": self.oracion, "posiciones": self.posiciones, "aristas": self.aristas()}
+
+
+def construir_reticulado(oracion, diccionario):
+    """
+    Construye el reticulado de segmentaciones de la oración. A diferencia de segmentar_oracion no se queda
+    con el primer j válido: registra todas las aristas, y luego descarta las posiciones desde las que no se
+    llega al final.
+    :param oracion: Oración sin espacios.
+    :param diccionario: Diccionario ya indexado, o lista de palabras.
+    :return: Reticulado (falso si la oración no se puede segmentar).
+    """
+    diccionario = como_diccionario(diccionario)
+    n = len(oracion)
+    if motivo_de_rechazo(oracion, diccionario) is not None:
+        return Reticulado(oracion, {})
+
+    conjunto_diccionario = diccionario.palabras
+    longitudes_por_final = diccionario.longitudes_por_final
+    max_long = diccionario.max_long
+    entrantes = {}
+    ultimo = 0
+    for i in range(1, n + 1):
+        origenes = []
+        for longitud in longitudes_por_final.get(oracion[i - 1], ()):
+            j = i - longitud
+            if j >= 0 and (j == 0 or j in entrantes) and oracion[j:i] in conjunto_diccionario:
+                origenes.append(j)
+        if origenes:
+            entrantes[i] = tuple(origenes)
+            ultimo = i
+        elif i - ultimo >= max_long:
+            break  # Ninguna de las últimas max_long posiciones es alcanzable
+
+    if n not in entrantes:
+        return Reticulado(oracion, {})
+
+    utiles = {n}
+    for i in sorted(entrantes, reverse=True):
+        if i in utiles:
+            utiles.update(entrantes[i])
+    return Reticulado(oracion, {i: origenes for i, origenes in entrantes.items() if i in utiles})
+
+
+def procesar_flujo_mejores(oraciones, diccionario, k, puntaje=menos_palabras):
+    """
+    Generador análogo a procesar_flujo que devuelve, para cada oración, sus k mejores segmentaciones
+    separadas por ' | ' (o "No es un mensaje" si no tiene ninguna).
+    """
+    diccionario = como_diccionario(diccionario)
+    for oracion in oraciones:
+        mejores = construir_reticulado(oracion, diccionario).mejores(k, puntaje)
+        if oracion and not mejores:
+            yield "No es un mensaje"
+        else:
+            yield " | ".join(" ".join(palabras) for _, palabras in mejores)
@@ -0,0 +1,312 @@
+import asyncio
+import json
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures.process import BrokenProcessPool
+from diccionario import como_diccionario
+from paralelo import crear_pool, dividir_en_chunks, _procesar_chunk, _procesar_chunk_de
+
+VENTANA_POR_DEFECTO = 0.005  # Segundos que se espera para juntar pedidos en un mismo lote
+LOTE_MAXIMO = 512  # Oraciones como máximo por lote enviado a un worker
+LIMITE_DE_LINEA = 64 * 1024 * 1024  # Tamaño máximo de un pedido o respuesta (las oraciones pueden ser largas)
+LATENCIAS_GUARDADAS = 10_000  # Cantidad de latencias recientes usadas para calcular percentiles
+
+
+def percentil(valores_ordenados, p):
+    """
+    Percentil p (entre 0 y 100) de una lista ya ordenada, por el método del rango más cercano.
+    """
+    if not valores_ordenados:
+        return 0.0
+    indice = max(0, min(len(valores_ordenados) - 1, round(p / 100 * len(valores_ordenados)) - 1))
+    return valores_ordenados[indice]
+
+
+class ServidorSegmentacion:
+    """
+    Servicio asyncio de segmentación que carga el diccionario una sola vez y atiende pedidos concurrentes.
+    Protocolo: JSON delimitado por saltos de línea sobre TCP o un socket Unix. Cada línea es un pedido:
+      {"id": 1, "oracion": "holaeso"}          -> {"id": 1, "resultado": "hola eso"}
+      {"id": 2, "oraciones": ["a", "b"]}       -> {"id": 2, "resultados": [...]}
+      {"id": 3, "comando": "estadisticas"}     -> {"id": 3, "estadisticas": {...}}
+    Con "diccionario": nombre se segmenta contra uno de los diccionarios adicionales registrados por nombre.
+    Los pedidos que llegan dentro de la misma ventana de tiempo se agrupan en un lote que se procesa
+    con procesar_texto en un pool de procesos.
+    """
+
+    def __init__(self, diccionario, workers=None, motor="conjunto", ventana=VENTANA_POR_DEFECTO,
+                 lote_maximo=LOTE_MAXIMO, diccionarios=None):
+        """
+        :param diccionario: Diccionario o lista de palabras (el que se usa si el pedido no indica otro).
+        :param workers: Cantidad de procesos del pool (por defecto, la cantidad de CPUs).
+        :param motor: Motor de segmentación.
+        :param ventana: Segundos que se espera para completar un lote desde que llega su primer pedido.
+        :param lote_maximo: Cantidad máxima de oraciones por lote.
+        :param diccionarios: Diccionario opcional nombre -> path con diccionarios adicionales. Cada worker los
+                             mantiene en un RegistroDiccionarios y los recarga cuando cambia su archivo.
+        """
+        self.diccionario = como_diccionario(diccionario)
+        self.workers = workers or os.cpu_count() or 1
+        self.motor = motor
+        self.ventana = ventana
+        self.lote_maximo = lote_maximo
+        self.diccionarios = dict(diccionarios or {})
+        self.rechazos = Counter()
+        self._latencias = deque(maxlen=LATENCIAS_GUARDADAS)
+        self._oraciones_procesadas = 0
+        self._lotes = 0
+        self._inicio = time.perf_counter()
+        self._pool = None
+        self._cola = None
+        self._servidor = None
+        self._tareas = set()
+        self._conexiones = set()
+
+    async def iniciar(self, host="127.0.0.1", puerto=0, path_unix=None):
+        """
+        Crea el pool de workers y empieza a escuchar. Con path_unix se usa un socket Unix en lugar de TCP.
+        :return: El asyncio.Server creado (con puerto 0 el sistema elige uno libre; ver direccion()).
+        """
+        self._pool = crear_pool(self.diccionario, self.workers, self.motor, self.diccionarios)
+        self._cola = asyncio.Queue()
+        self._tareas.add(asyncio.create_task(self._agrupar_lotes()))
+        if path_unix is not None:
+            self._servidor = await asyncio.start_unix_server(self._atender_conexion, path=path_unix,
+                                                             limit=LIMITE_DE_LINEA)
+        else:
+            self._servidor = await asyncio.start_server(self._atender_conexion, host, puerto, limit=LIMITE_DE_LINEA)
+        return self._servidor
+
+    def direccion(self):
+        return self._servidor.sockets[0].getsockname()
+
+    async def cerrar(self):
+        self._servidor.close()
+        for escritor in list(self._conexiones):
+            escritor.close()
+        await self._servidor.wait_closed()
+        for tarea in self._tareas:
+            tarea.cancel()
+        await asyncio.gather(*self._tareas, return_exceptions=True)
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    async def segmentar(self, oraciones, nombre=None):
+        """
+        Encola las oraciones para el próximo lote y espera sus resultados.
+        :param nombre: Nombre de un diccionario adicional, o None para el diccionario principal.
+        """
+        if nombre is not None and nombre not in self.diccionarios:
+            raise KeyError(f"Diccionario desconocido: {nombre}")
+        futuro = asyncio.get_running_loop().create_future()
+        await self._cola.put((nombre, oraciones, futuro))
+        return await futuro
+
+    async def _agrupar_lotes(self):
+        loop = asyncio.get_running_loop()
+        en_vuelo = asyncio.Semaphore(self.workers * 2)
+        while True:
+            pedidos = [await self._cola.get()]
+            cantidad = len(pedidos[0][1])
+            limite = loop.time() + self.ventana
+            while cantidad < self.lote_maximo:
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    pedido = await asyncio.wait_for(self._cola.get(), restante)
+                except asyncio.TimeoutError:
+                    break
+                pedidos.append(pedido)
+                cantidad += len(pedido[1])
+
+            await en_vuelo.acquire()
+            tarea = asyncio.create_task(self._procesar_lote(pedidos, en_vuelo))
+            self._tareas.add(tarea)
+            tarea.add_done_callback(self._tareas.discard)
+
+    async def _procesar_lote(self, pedidos, en_vuelo):
+        try:
+            por_diccionario = {}
+            for pedido in pedidos:
+                por_diccionario.setdefault(pedido[0], []).append(pedido)
+            await asyncio.gather(*(self._procesar_grupo(nombre, grupo) for nombre, grupo in por_diccionario.items()))
+            self._lotes += 1
+        finally:
+            en_vuelo.release()
+
+    async def _procesar_grupo(self, nombre, pedidos):
+        oraciones = [oracion for _, pedido, _ in pedidos for oracion in pedido]
+        loop = asyncio.get_running_loop()
+        # El lote se reparte entre los workers para que una ráfaga no quede en un único proceso.
+        tamanio = max(1, -(-len(oraciones) // self.workers))
+        chunks = dividir_en_chunks(oraciones, tamanio)
+        pool = self._pool
+        try:
+            if nombre is None:
+                tareas = [loop.run_in_executor(pool, _procesar_chunk, chunk) for chunk in chunks]
+            else:
+                tareas = [loop.run_in_executor(pool, _procesar_chunk_de, nombre, chunk) for chunk in chunks]
+        except Exception as error:
+            # Con el pool roto (por ejemplo, si murió un worker) submit falla enseguida: se crea uno nuevo
+            # para los próximos lotes y los pedidos de este grupo reciben el error.
+            if isinstance(error, BrokenProcessPool):
+                self._reiniciar_pool(pool)
+            for _, _, futuro in pedidos:
+                if not futuro.done():
+                    futuro.set_exception(error)
+            return
+        parciales = await asyncio.gather(*tareas, return_exceptions=True)
+        if any(isinstance(parcial, BrokenProcessPool) for parcial in parciales):
+            self._reiniciar_pool(pool)
+
+        # Un chunk que falla solo hace fallar a los pedidos con alguna oración en ese chunk.
+        resultados = []
+        for chunk, parcial in zip(chunks, parciales):
+            if isinstance(parcial, BaseException):
+                resultados.extend([None] * len(chunk))
+            else:
+                resultados.extend(parcial[0])
+                self.rechazos.update(parcial[1])
+                self._oraciones_procesadas += len(parcial[0])
+        desde = 0
+        for _, pedido, futuro in pedidos:
+            hasta = desde + len(pedido)
+            errores = [parciales[i] for i in range(desde // tamanio, -(-hasta // tamanio))
+                       if isinstance(parciales[i], BaseException)]
+            if not futuro.done():
+                if errores:
+                    futuro.set_exception(errores[0])
+                else:
+                    futuro.set_result(resultados[desde:hasta])
+            desde = hasta
+
+    def _reiniciar_pool(self, roto):
+        """
+        Reemplaza el pool roto por uno nuevo, salvo que otro grupo ya lo haya reemplazado.
+        """
+        if self._pool is roto:
+            roto.shutdown(wait=False, cancel_futures=True)
+            self._pool = crear_pool(self.diccionario, self.workers, self.motor, self.diccionarios)
+
+    async def _atender_conexion(self, lector, escritor):
+        self._conexiones.add(escritor)
+        tareas = set()
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                tarea = asyncio.create_task(self._responder(linea, escritor))
+                tareas.add(tarea)
+                tarea.add_done_callback(tareas.discard)
+            if tareas:
+                await asyncio.gather(*tareas)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            self._conexiones.discard(escritor)
+            escritor.close()
+
+    async def _responder(self, linea, escritor):
+        recibido = time.perf_counter()
+        respuesta = {"id": None}
+        try:
+            pedido = json.loads(linea)
+            if not isinstance(pedido, dict):
+                raise ValueError("se esperaba un objeto JSON")
+            respuesta["id"] = pedido.get("id")
+            nombre = pedido.get("diccionario")
+            if pedido.get("comando") == "estadisticas":
+                respuesta["estadisticas"] = self.estadisticas()
+            elif "oracion" in pedido:
+                if not isinstance(pedido["oracion"], str):
+                    raise ValueError("'oracion' debe ser un texto")
+                respuesta["resultado"] = (await self.segmentar([pedido["oracion"]], nombre))[0]
+            elif "oraciones" in pedido:
+                oraciones = pedido["oraciones"]
+                if not isinstance(oraciones, list) or not all(isinstance(oracion, str) for oracion in oraciones):
+                    raise ValueError("'oraciones' debe ser una lista de textos")
+                respuesta["resultados"] = await self.segmentar(oraciones, nombre)
+            else:
+                respuesta["error"] = "Pedido sin 'oracion', 'oraciones' ni 'comando'"
+        except KeyError as error:
+            respuesta = {"id": respuesta["id"], "error": error.args[0]}
+        except (ValueError, AttributeError, TypeError) as error:
+            respuesta = {"id": respuesta["id"], "error": f"Pedido inválido: {error}"}
+        except Exception as error:
+            respuesta = {"id": respuesta["id"], "error": f"Error al segmentar: {error!r}"}
+
+        if "resultado" in respuesta or "resultados" in respuesta:
+            self._latencias.append(time.perf_counter() - recibido)
+        escritor.write(json.dumps(respuesta, ensure_ascii=False).encode('utf-8') + b"\n")
+        await escritor.drain()
+
+    def estadisticas(self):
+        """
+        Latencias recientes (p50/p99 en milisegundos), rendimiento en oraciones por segundo y tamaño medio de lote.
+        """
+        latencias = sorted(self._latencias)
+        transcurrido = time.perf_counter() - self._inicio
+        return {
+            "pedidos": len(latencias),
+            "p50_ms": percentil(latencias, 50) * 1000,
+            "p99_ms": percentil(latencias, 99) * 1000,
+            "oraciones_por_segundo": self._oraciones_procesadas / transcurrido if transcurrido else 0.0,
+            "lotes": self._lotes,
+            "oraciones_por_lote": self._oraciones_procesadas / self._lotes if self._lotes else 0.0,
+            "rechazos": dict(self.rechazos),
+        }
+
+
+async def servir(diccionario, host="127.0.0.1", puerto=8765, path_unix=None, workers=None, motor="conjunto",
+                 ventana=VENTANA_POR_DEFECTO, diccionarios=None):
+    """
+    Levanta el servidor y atiende pedidos hasta que se interrumpe el proceso.
+    """
+    servidor = ServidorSegmentacion(diccionario, workers, motor, ventana, diccionarios=diccionarios)
+    await servidor.iniciar(host, puerto, path_unix)
+    print(f"Escuchando en {path_unix or servidor.direccion()}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await servidor.cerrar()
+
+
+async def prueba_de_carga(oraciones, host="127.0.0.1", puerto=8765, path_unix=None, conexiones=16):
+    """
+    Cliente de prueba de carga: envía cada oración como un pedido individual, repartidas entre varias conexiones
+    concurrentes, y mide la latencia vista por el cliente.
+    :return: Diccionario con p50/p99 en milisegundos, pedidos por segundo y los resultados en el orden de entrada.
+    """
+    resultados = [None] * len(oraciones)
+    latencias = []
+
+    async def cliente(indices):
+        if path_unix is not None:
+            lector, escritor = await asyncio.open_unix_connection(path_unix, limit=LIMITE_DE_LINEA)
+        else:
+            lector, escritor = await asyncio.open_connection(host, puerto, limit=LIMITE_DE_LINEA)
+        enviados = {}
+        for indice in indices:
+            enviados[indice] = time.perf_counter()
+            escritor.write(json.dumps({"id": indice, "oracion": oraciones[indice]}).encode('utf-8') + b"\n")
+        await escritor.drain()
+        for _ in indices:
+            respuesta = json.loads(await lector.readline())
+            resultados[respuesta["id"]] = respuesta["resultado"]
+            latencias.append(time.perf_counter() - enviados[respuesta["id"]])
+        escritor.close()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(range(k, len(oraciones), conexiones)) for k in range(conexiones)))
+    transcurrido = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        "pedidos": len(oraciones),
+        "p50_ms": percentil(latencias, 50) * 1000,
+        "p99_ms": percentil(latencias, 99) * 1000,
+        "pedidos_por_segundo": len(oraciones) / transcurrido if transcurrido else 0.0,
+        "resultados": resultados,
+    }
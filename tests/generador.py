@@ -1,16 +1,30 @@
 import random
-import requests
+from corpus import GeneradorCorpus
 
 MAX_LENGTH = 15
+URL_PALABRAS = "https://raw.githubusercontent.com/JorgeDuenasLerin/diccionario-espanol-txt/refs/heads/master/0_palabras_todas.txt"
 
 class Generador:
-    def __init__(self, cantidad):
-        self.todas_las_palabras = self.obtener_palabras_desde_url()
+    def __init__(self, cantidad, semilla=None, url=None):
+        """
+        :param cantidad: Cantidad de palabras del diccionario.
+        :param semilla: Semilla para que el diccionario y las oraciones sean reproducibles.
+        :param url: Si se indica, las palabras se eligen de la lista descargada de esa URL (por ejemplo URL_PALABRAS)
+                    en lugar de generarse localmente.
+        """
+        self.random = random.Random(semilla)
+        if url is None:
+            corpus = GeneradorCorpus(self.random.randrange(2 ** 32), max_long=MAX_LENGTH)
+            self.todas_las_palabras = corpus.generar_diccionario(cantidad)
+        else:
+            self.todas_las_palabras = self.obtener_palabras_desde_url(url)
         self.diccionario = self.generar_diccionario_aleatorio(self.todas_las_palabras, cantidad)
 
-    def obtener_palabras_desde_url(self):
+    def obtener_palabras_desde_url(self, url=URL_PALABRAS):
+        import requests
+
         try:
-            response = requests.get("https://raw.githubusercontent.com/JorgeDuenasLerin/diccionario-espanol-txt/refs/heads/master/0_palabras_todas.txt")
+            response = requests.get(url)
             response.raise_for_status()
             palabras = response.text.splitlines()
             return palabras
@@ -19,28 +33,27 @@ class Generador:
             print(f"Error al obtener las palabras desde la URL: {e}")
             return []
 
-    def generar_diccionario_aleatorio(self, url, cantidad):
-        todas_las_palabras = Generador.obtener_palabras_desde_url(url)
+    def generar_diccionario_aleatorio(self, todas_las_palabras, cantidad):
         if not todas_las_palabras:
             return []
-        return random.sample(todas_las_palabras, min(cantidad, len(todas_las_palabras)))
+        return self.random.sample(todas_las_palabras, min(cantidad, len(todas_las_palabras)))
 
     def generar_oracion_valida(self, cantidad_palabras):
         if not self.diccionario:
             return ""
         palabras = [palabra for palabra in self.diccionario if len(palabra) <= MAX_LENGTH]
-        oracion = [random.choice(palabras) for _ in range(cantidad_palabras)]
+        oracion = [self.random.choice(palabras) for _ in range(cantidad_palabras)]
         return "".join(oracion)
 
     def generar_oracion_invalida(self):
         caracteres = "abcdefghijklmnopqrstuvwxyz"
-        longitud = random.randint(5, 15)
-        return "".join(random.choice(caracteres) for _ in range(longitud))
+        longitud = self.random.randint(5, 15)
+        return "".join(self.random.choice(caracteres) for _ in range(longitud))
 
     def generar_oraciones(self, cantidad_oraciones, cantidad_palabras):
         oraciones = []
         for _ in range(cantidad_oraciones):
-            if random.choice([True]):
+            if self.random.choice([True]):
                 oracion = self.generar_oracion_valida(cantidad_palabras)
             else:
                 oracion = self.generar_oracion_invalida()
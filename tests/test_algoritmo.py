@@ -0,0 +1,250 @@
+import os
+import tempfile
+from collections import Counter
+from importlib.util import find_spec
+from unittest import TestCase, skipUnless
+from diccionario import Diccionario, como_diccionario, hash_polinomial
+from algoritmo import procesar_texto, procesar_flujo, segmentar_oracion, motivo_de_rechazo, CacheSegmentaciones, \
+    SegmentadorPorPrefijos, MOTORES, clave_de_cache
+from indice import cargar_diccionario, EXTENSION_COSTOS
+from paralelo import procesar_texto_paralelo, procesar_flujo_paralelo
+from utils import parsear_resultados, wrapper_leer_archivo
+
+
+class TestDiccionario(TestCase):
+    def setUp(self):
+        self.palabras = ["hola", "como", "es", "eso", "andar"]
+        self.diccionario = Diccionario(self.palabras)
+
+    def test_estadisticas(self):
+        self.assertEqual(self.diccionario.max_long, 5)
+        self.assertEqual(self.diccionario.min_long, 2)
+        self.assertEqual(self.diccionario.longitudes, [2, 3, 4, 5])
+
+    def test_como_diccionario_reutiliza_indice(self):
+        self.assertIs(como_diccionario(self.diccionario), self.diccionario)
+        self.assertIsInstance(como_diccionario(self.palabras), Diccionario)
+
+    def test_lista_y_diccionario_equivalentes(self):
+        oraciones = ["holacomoeso", "esandarhola", "holaxeso", ""]
+        self.assertEqual(procesar_texto(oraciones, self.palabras), procesar_texto(oraciones, self.diccionario))
+        self.assertEqual(segmentar_oracion("esohola", self.diccionario), ["eso", "hola"])
+
+    def test_diccionario_vacio(self):
+        self.assertEqual(procesar_texto(["hola"], []), ["No es un mensaje"])
+
+    def test_agregar_y_quitar_palabras_igual_que_reconstruir(self):
+        oraciones = ["holacomoeso", "esandarhola", "holaxeso", "andarines", "xx", ""]
+        for motor in MOTORES_DISPONIBLES:
+            procesar_texto(oraciones, self.diccionario, motor)  # Construye los índices antes de modificar
+        self.diccionario.huella
+        caracteres = self.diccionario.caracteres
+
+        self.assertEqual(self.diccionario.agregar_palabras(["x", "ines", "hola"]), {"x", "ines"})
+        self.assertEqual(self.diccionario.quitar_palabras(["andar", "no_esta"]), {"andar"})
+        esperado = Diccionario(["hola", "como", "es", "eso", "x", "ines"])
+
+        self.assertEqual(self.diccionario.longitudes, esperado.longitudes)
+        self.assertEqual(self.diccionario.max_long, 4)
+        self.assertEqual(self.diccionario.longitudes_por_final, esperado.longitudes_por_final)
+        self.assertEqual(self.diccionario.huella, esperado.huella)
+        self.assertEqual(self.diccionario.trie, esperado.trie)
+        self.assertIs(self.diccionario.caracteres, caracteres)  # Se actualizó sin reconstruirse
+        self.assertEqual(self.diccionario.caracteres, esperado.caracteres)
+        self.assertEqual(self.diccionario.iniciales, esperado.iniciales)
+        for motor in MOTORES_DISPONIBLES:
+            self.assertEqual(procesar_texto(oraciones, self.diccionario, motor), procesar_texto(oraciones, esperado),
+                             motor)
+
+
+HAY_NUMPY = find_spec("numpy") is not None
+# Motores que devuelven exactamente la misma segmentación ('viterbi' elige la de menor costo).
+MOTORES_DISPONIBLES = [motor for motor in MOTORES if motor != "viterbi" and (motor != "numpy" or HAY_NUMPY)]
+
+
+class TestMotores(TestCase):
+    def test_motores_equivalentes_en_casos(self):
+        for respuesta in parsear_resultados("casos/Resultados Esperados.txt"):
+            with self.subTest(entrada=respuesta["entrada"], palabras=respuesta["palabras"]):
+                oraciones, palabras = wrapper_leer_archivo(respuesta["entrada"], respuesta["palabras"])
+                diccionario = Diccionario(palabras)
+                esperado = procesar_texto(oraciones, diccionario)
+                for motor in MOTORES_DISPONIBLES:
+                    self.assertEqual(procesar_texto(oraciones, diccionario, motor), esperado, motor)
+                if HAY_NUMPY:
+                    from motor_numpy import procesar_lote_numpy
+                    self.assertEqual(procesar_lote_numpy(oraciones, diccionario), esperado)
+
+    @skipUnless(HAY_NUMPY, "numpy no está instalado")
+    def test_lote_numpy_con_caracteres_no_ascii(self):
+        from motor_numpy import procesar_lote_numpy
+        palabras = ["año", "ñandú", "sí", "a"]
+        oraciones = ["añoñandúsí", "sía", "ñandúx", "", "aaño"]
+        self.assertEqual(procesar_lote_numpy(oraciones, palabras), procesar_texto(oraciones, palabras))
+
+    def test_colision_de_hash_no_acepta_subcadena(self):
+        diccionario = Diccionario(["ab"])
+        diccionario._tablas_hash = {2: {hash_polinomial("xy"): ("ab",)}}
+        self.assertEqual(segmentar_oracion("xy", diccionario, "hash"), [])
+        self.assertEqual(segmentar_oracion("ab", Diccionario(["ab"]), "hash"), ["ab"])
+
+    def test_motor_desconocido(self):
+        with self.assertRaises(ValueError):
+            segmentar_oracion("hola", ["hola"], "inexistente")
+
+
+class TestViterbi(TestCase):
+    def test_menor_costo_igual_que_el_reticulado(self):
+        from reticulado import construir_reticulado
+        oraciones, palabras = wrapper_leer_archivo("casos/lorem_ipsum_in.txt", "casos/lorem_ipsum_words.txt")
+        diccionario = Diccionario(palabras + ["lo", "rem", "ip", "sum", "do", "lor"])
+        diccionario.asignar_costos({palabra: 1 + len(palabra) % 3 for palabra in diccionario.palabras})
+
+        for oracion in oraciones + ["loremipsumdolor"]:
+            resultado = segmentar_oracion(oracion, diccionario, "viterbi")
+            mejores = construir_reticulado(oracion, diccionario).mejores(
+                1, lambda palabra: -diccionario.costos[palabra])
+            self.assertEqual(bool(resultado), bool(mejores))
+            if mejores:
+                self.assertEqual(sum(diccionario.costos[palabra] for palabra in resultado), -mejores[0][0])
+                self.assertEqual("".join(resultado), oracion)
+
+    def test_costos_desde_frecuencias_junto_al_diccionario(self):
+        palabras = ["cas", "casa", "amarilla", "marilla"]
+        oracion = ["casamarilla"]
+        self.assertEqual(procesar_texto(oracion, palabras), ["cas amarilla"])
+        self.assertEqual(procesar_texto(oracion, palabras, "viterbi"), ["cas amarilla"])
+
+        with tempfile.TemporaryDirectory() as directorio:
+            path = os.path.join(directorio, "dic.txt")
+            with open(path, 'w', encoding='utf-8') as archivo:
+                archivo.write("\n".join(palabras))
+            with open(path + EXTENSION_COSTOS, 'w', encoding='utf-8') as archivo:
+                archivo.write("casa 100\nmarilla 40\ncas 1\n")
+            diccionario = cargar_diccionario(path)
+
+        cache = CacheSegmentaciones()
+        self.assertEqual(procesar_texto(oracion, diccionario, "viterbi", cache=cache), ["casa marilla"])
+        self.assertEqual(procesar_texto(oracion, diccionario, cache=cache), ["cas amarilla"])
+        self.assertEqual(cache.aciertos, 0)
+
+    def test_sin_segmentacion(self):
+        self.assertEqual(procesar_texto(["holax", "xhola", ""], ["hola"], "viterbi"),
+                         ["No es un mensaje", "No es un mensaje", ""])
+
+
+class TestBuckets(TestCase):
+    def test_buckets_por_ultimo_caracter(self):
+        diccionario = Diccionario(["a", "ba", "cba", "xyz"])
+        self.assertEqual(diccionario.longitudes_por_final, {"a": (3, 2, 1), "z": (3,)})
+        self.assertEqual(diccionario.estadisticas_buckets()["buckets"], 2)
+
+    def test_sondeos_por_caracter(self):
+        diccionario = Diccionario(["a", "ba", "cba", "xyz"])
+        sondeos, sondeos_contiguos = diccionario.sondeos_por_caracter(["cbaxyz"])
+        self.assertLess(sondeos, sondeos_contiguos)
+
+
+class TestParalelo(TestCase):
+    def test_paralelo_respeta_orden(self):
+        oraciones, palabras = wrapper_leer_archivo("casos/70_in.txt", "casos/mediano.txt")
+        esperado = procesar_texto(oraciones, palabras)
+        self.assertEqual(procesar_texto_paralelo(oraciones, palabras, workers=2, chunk_size=3), esperado)
+        self.assertEqual(procesar_texto_paralelo(oraciones, palabras, workers=1), esperado)
+
+    def test_flujo_paralelo_es_perezoso_y_ordenado(self):
+        oraciones, palabras = wrapper_leer_archivo("casos/70_in.txt", "casos/mediano.txt")
+        esperado = procesar_texto(oraciones, palabras)
+        flujo = procesar_flujo_paralelo(iter(oraciones), palabras, workers=2, chunk_size=3)
+        self.assertEqual(next(flujo), esperado[0])
+        self.assertEqual([esperado[0]] + list(flujo), esperado)
+        self.assertEqual(list(procesar_flujo(iter(oraciones), palabras)), esperado)
+
+
+class TestCache(TestCase):
+    def test_aciertos_y_desalojos(self):
+        cache = CacheSegmentaciones(capacidad=2)
+        palabras = ["hola", "como", "es", "eso"]
+        oraciones = ["holaeso", "comoes", "holaeso", "esohola", "holaxx"]
+        self.assertEqual(procesar_texto(oraciones, palabras, cache=cache), procesar_texto(oraciones, palabras))
+        self.assertEqual((cache.aciertos, cache.fallos, cache.desalojos), (1, 4, 2))
+        self.assertEqual(len(cache), 2)
+
+    def test_guardar_y_cargar(self):
+        diccionario = Diccionario(["hola", "eso"])
+        cache = CacheSegmentaciones()
+        procesar_texto(["holaeso", "esox"], diccionario, cache=cache)
+        with tempfile.TemporaryDirectory() as directorio:
+            path = os.path.join(directorio, "cache.json")
+            cache.guardar(path)
+            recargado = CacheSegmentaciones.cargar(path)
+        self.assertEqual(procesar_texto(["holaeso", "esox"], Diccionario(["eso", "hola"]), cache=recargado),
+                         ["hola eso", "No es un mensaje"])
+        self.assertEqual(recargado.aciertos, 2)
+
+
+    def test_modificar_diccionario_invalida_solo_lo_afectado(self):
+        diccionario = Diccionario(["hola", "como", "es", "eso"])
+        cache = CacheSegmentaciones()
+        oraciones = ["holaeso", "comoes", "holacomo", "esox"]
+        procesar_texto(oraciones, diccionario, cache=cache)
+        otra_huella = ("otra", "holaeso")
+        cache.agregar(otra_huella, "de otro diccionario")
+
+        diccionario.agregar_palabras(["x"], cache=cache)
+
+        self.assertEqual(cache.invalidaciones, 1)
+        self.assertEqual(len(cache), 4)
+        self.assertEqual(cache.obtener((diccionario.huella, "holaeso")), "hola eso")
+        self.assertEqual(cache.obtener(otra_huella), "de otro diccionario")
+        self.assertEqual(procesar_texto(oraciones, diccionario, cache=cache),
+                         procesar_texto(oraciones, Diccionario(["hola", "como", "es", "eso", "x"])))
+
+        diccionario.quitar_palabras(["como"], cache=cache)
+        self.assertEqual(cache.invalidaciones, 3)
+        self.assertEqual(procesar_texto(oraciones, diccionario, cache=cache), ["hola eso", "No es un mensaje",
+                                                                               "No es un mensaje", "eso x"])
+
+    def test_modificar_diccionario_conserva_claves_de_viterbi(self):
+        diccionario = Diccionario(["hola", "como", "es", "eso"])
+        diccionario.asignar_costos({"hola": 1, "eso": 2})
+        cache = CacheSegmentaciones()
+        oraciones = ["holaeso", "esox"]
+        procesar_texto(oraciones, diccionario, "viterbi", cache=cache)
+
+        diccionario.agregar_palabras(["x"], cache=cache)
+
+        self.assertEqual(cache.invalidaciones, 1)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.obtener((clave_de_cache(diccionario, "viterbi"), "holaeso")), "hola eso")
+        self.assertEqual(procesar_texto(oraciones, diccionario, "viterbi", cache=cache), ["hola eso", "eso x"])
+
+
+class TestPrefijos(TestCase):
+    def test_reutiliza_prefijos_con_mismo_resultado(self):
+        palabras = ["hola", "como", "es", "eso", "andar", "a"]
+        oraciones = ["holacomo", "holacomoeso", "esoandar", "holacomoesx", "holacomoesoandar", "eso"]
+        segmentador = SegmentadorPorPrefijos(palabras)
+        self.assertEqual(segmentador.procesar(oraciones), procesar_texto(oraciones, palabras))
+        self.assertEqual(segmentador.caracteres_totales, sum(len(oracion) for oracion in oraciones))
+        self.assertEqual(segmentador.caracteres_reutilizados, 3 + 8 + 11 + 10)
+        self.assertGreater(segmentador.tasa_reutilizacion, 0.5)
+
+
+class TestPrefiltro(TestCase):
+    def setUp(self):
+        self.diccionario = Diccionario(["hola", "como", "es", "eso", "andar"])
+
+    def test_motivos_de_rechazo(self):
+        for motor in MOTORES_DISPONIBLES:
+            with self.subTest(motor=motor):
+                rechazos = Counter()
+                oraciones = ["xhola", "holax", "holañeso", "holaeso" + "e" * 10 + "s", "holaesoholaesoa", "holaeso"]
+                resultado = procesar_texto(oraciones, self.diccionario, motor, rechazos=rechazos)
+                self.assertEqual(resultado[-1], "hola eso")
+                self.assertEqual(resultado[:-1], ["No es un mensaje"] * 5)
+                self.assertEqual(rechazos, Counter(inicio=1, fin=1, caracter=1, frontera=1, sin_camino=1))
+
+    def test_oracion_vacia(self):
+        self.assertIsNone(motivo_de_rechazo("", self.diccionario))
+        self.assertEqual(procesar_texto([""], self.diccionario), [""])
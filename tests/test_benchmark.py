@@ -0,0 +1,34 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from benchmark import generar_caso, correr_escenario, comparar, main
+
+
+class TestBenchmark(TestCase):
+    def test_generacion_determinista(self):
+        self.assertEqual(generar_caso(7, n=5, k=50, L=6, m=20), generar_caso(7, n=5, k=50, L=6, m=20))
+        self.assertNotEqual(generar_caso(7, n=5, k=50, L=6, m=20), generar_caso(8, n=5, k=50, L=6, m=20))
+        palabras, oraciones = generar_caso(0, n=5, k=50, L=6, m=20)
+        self.assertEqual(len(palabras), 50)
+        self.assertTrue(all(2 <= len(palabra) <= 6 for palabra in palabras))
+        self.assertEqual(len(oraciones), 20)
+
+    def test_comparar_marca_regresiones(self):
+        base = {"resultados": {"n": [{"valor": 10, "mediana": 1.0}, {"valor": 20, "mediana": 2.0}]}}
+        candidato = {"resultados": {"n": [{"valor": 10, "mediana": 1.05}, {"valor": 20, "mediana": 3.0}]}}
+        filas = comparar(base, candidato, umbral=0.1)
+        self.assertEqual([(valor, es_regresion) for _, valor, _, _, _, es_regresion in filas],
+                         [(10, False), (20, True)])
+
+    def test_correr_y_comparar_por_linea_de_comandos(self):
+        resultados = correr_escenario("m", repeticiones=2, valores=[10, 20])
+        self.assertEqual([resultado["valor"] for resultado in resultados], [10, 20])
+        self.assertTrue(all(resultado["mediana"] > 0 for resultado in resultados))
+
+        with tempfile.TemporaryDirectory() as directorio:
+            path = os.path.join(directorio, "resultados.json")
+            corrida = {"metadatos": {"motor": "conjunto"}, "resultados": {"m": resultados}}
+            with open(path, 'w', encoding='utf-8') as archivo:
+                json.dump(corrida, archivo)
+            self.assertEqual(main(["comparar", path, path]), 0)
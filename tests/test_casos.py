@@ -1,7 +1,11 @@
 from imaplib import ParseFlags
 from unittest import TestCase
+from unittest.mock import patch
 from utils import parsear_resultados, wrapper_leer_archivo
 from algoritmo import procesar_texto
+from diccionario import Diccionario
+from regresion import correr_casos, validar_resultado, verificar_caso
+from tests.test_algoritmo import MOTORES_DISPONIBLES
 
 
 class TestCasos(TestCase):
@@ -31,3 +35,31 @@ class TestCasos(TestCase):
                         self.assertEqual(mensaje, resultado[index])
                     else:
                         self.assertNotEqual(resultado[index], "No es un mensaje")
+
+    def test_parsear_resultados(self):
+        self.assertEqual(len(self.respuestas), 14)
+        entradas = [respuesta["entrada"] for respuesta in self.respuestas]
+        self.assertIn("casos/70_in.txt", entradas)  # Encabezado sin dos puntos después de 'entrada'
+        for respuesta in self.respuestas:
+            with self.subTest(entrada=respuesta["entrada"]):
+                self.assertEqual(len(respuesta["mensajes"]), len(wrapper_leer_archivo(respuesta["entrada"],
+                                                                                      respuesta["palabras"])[0]))
+
+    def test_validar_resultado(self):
+        diccionario = Diccionario(["hola", "eso", "h", "ola"])
+        self.assertIsNone(validar_resultado("holaeso", "h ola eso", "hola eso", diccionario))
+        self.assertIsNone(validar_resultado("holax", "No es un mensaje", "No es un mensaje", diccionario))
+        self.assertIsNotNone(validar_resultado("holaeso", "No es un mensaje", "hola eso", diccionario))
+        self.assertIsNotNone(validar_resultado("holaeso", "hola eso", "No es un mensaje", diccionario))
+        self.assertIsNotNone(validar_resultado("holaeso", "hola es", "hola eso", diccionario))
+        self.assertIsNotNone(validar_resultado("holaes", "hola es", "hola es", diccionario))
+
+    def test_presupuesto_excedido(self):
+        caso = self.respuestas[0]
+        with patch("regresion.presupuesto", return_value=-1.0):
+            self.assertIn("presupuesto", verificar_caso(caso, "conjunto")["errores"][-1])
+
+    def test_regresion_todos_los_motores(self):
+        for resultado in correr_casos(self.respuestas, MOTORES_DISPONIBLES + ["viterbi"]):
+            with self.subTest(entrada=resultado["entrada"], motor=resultado["motor"]):
+                self.assertEqual(resultado["errores"], [])
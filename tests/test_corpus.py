@@ -0,0 +1,54 @@
+import os
+import tempfile
+from unittest import TestCase
+from algoritmo import procesar_texto
+from corpus import GeneradorCorpus, CARACTER_INVALIDO, main
+from reticulado import construir_reticulado
+from tests.generador import Generador
+
+
+class TestGeneradorCorpus(TestCase):
+    def test_determinista(self):
+        generador = GeneradorCorpus(semilla=5)
+        palabras = generador.generar_diccionario(200)
+        self.assertEqual(palabras, GeneradorCorpus(semilla=5).generar_diccionario(200))
+        self.assertNotEqual(palabras, GeneradorCorpus(semilla=6).generar_diccionario(200))
+        self.assertEqual(list(generador.generar_oraciones(palabras, 50)),
+                         list(GeneradorCorpus(semilla=5).generar_oraciones(palabras, 50)))
+        # Las primeras oraciones no dependen de cuántas se pidan
+        self.assertEqual(list(generador.generar_oraciones(palabras, 10)),
+                         list(generador.generar_oraciones(palabras, 50))[:10])
+
+    def test_longitudes_y_palabras_distintas(self):
+        palabras = GeneradorCorpus(pesos_longitud={3: 1, 7: 3}, densidad_ambigua=0).generar_diccionario(500)
+        self.assertEqual(len(set(palabras)), 500)
+        self.assertEqual({len(palabra) for palabra in palabras}, {3, 7})
+        with self.assertRaises(ValueError):
+            GeneradorCorpus(min_long=1, max_long=1).generar_diccionario(100)
+
+    def test_oraciones_invalidas_y_ambiguas(self):
+        generador = GeneradorCorpus(semilla=1, densidad_ambigua=0.5, fraccion_invalidas=0.3)
+        palabras = generador.generar_diccionario(300)
+        oraciones = list(generador.generar_oraciones(palabras, 400, palabras_por_oracion=(2, 6)))
+        resultados = procesar_texto(oraciones, palabras)
+        for oracion, resultado in zip(oraciones, resultados):
+            self.assertEqual(resultado == "No es un mensaje", CARACTER_INVALIDO in oracion)
+        invalidas = sum(CARACTER_INVALIDO in oracion for oracion in oraciones)
+        self.assertTrue(80 <= invalidas <= 160)
+        ambiguas = sum(construir_reticulado(oracion, palabras).cantidad() > 1 for oracion in oraciones)
+        self.assertGreater(ambiguas, 0)
+
+    def test_escribe_archivos(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            path_diccionario = os.path.join(directorio, "diccionario.txt")
+            path_oraciones = os.path.join(directorio, "oraciones.txt")
+            self.assertEqual(main([path_diccionario, path_oraciones, "--palabras", "100", "--cantidad", "5000"]), 0)
+            with open(path_diccionario, encoding='utf-8') as archivo:
+                self.assertEqual(len(archivo.read().splitlines()), 100)
+            with open(path_oraciones, encoding='utf-8') as archivo:
+                self.assertEqual(len(archivo.read().splitlines()), 5000)
+
+    def test_generador_sin_red(self):
+        generador = Generador(100, semilla=2)
+        self.assertEqual(len(generador.diccionario), 100)
+        self.assertEqual(generador.generar_oraciones(3, 2), Generador(100, semilla=2).generar_oraciones(3, 2))
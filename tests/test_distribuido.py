@@ -0,0 +1,158 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import tempfile
+from unittest import IsolatedAsyncioTestCase, TestCase
+from algoritmo import procesar_texto
+from corpus import GeneradorCorpus
+from distribuido import Coordinador, FragmentoFallido, dividir_en_fragmentos, leer_fragmento, correr_trabajador
+from utils import leer_archivo_como_list
+
+# Los trabajadores se lanzan con 'spawn': el proceso del test ya tiene hilos (los de asyncio.to_thread), y un
+# fork con hilos puede dejar locks tomados en el hijo.
+PROCESOS = multiprocessing.get_context("spawn")
+
+
+def generar_entrada(directorio, cantidad=400):
+    generador = GeneradorCorpus(semilla=4)
+    path_diccionario = os.path.join(directorio, "diccionario.txt")
+    path_oraciones = os.path.join(directorio, "oraciones.txt")
+    palabras = generador.escribir_diccionario(path_diccionario, 300)
+    generador.escribir_oraciones(path_oraciones, palabras, cantidad)
+    return path_diccionario, path_oraciones
+
+
+class TestFragmentos(TestCase):
+    def test_fragmentos_alineados_a_lineas(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            _, path_oraciones = generar_entrada(directorio, 50)
+            oraciones = leer_archivo_como_list(path_oraciones)
+            for tamanio in (1, 100, 1000, 10 ** 9):
+                with self.subTest(tamanio=tamanio):
+                    fragmentos = dividir_en_fragmentos(path_oraciones, tamanio)
+                    self.assertEqual(fragmentos[0][0], 0)
+                    self.assertEqual(fragmentos[-1][1], os.path.getsize(path_oraciones))
+                    self.assertTrue(all(fin == inicio for (_, fin), (inicio, _) in zip(fragmentos, fragmentos[1:])))
+                    self.assertEqual([oracion for inicio, fin in fragmentos
+                                      for oracion in leer_fragmento(path_oraciones, inicio, fin)], oraciones)
+
+    def test_rezagados(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            _, path_oraciones = generar_entrada(directorio, 50)
+            coordinador = Coordinador(path_oraciones, os.path.join(directorio, "salida.txt"), tamanio_fragmento=500)
+            coordinador._inicio = 0.0
+            for id_fragmento, rendimiento in enumerate([100.0, 90.0, 110.0, 30.0]):
+                coordinador.intentos[id_fragmento] = 1
+                coordinador.informes[id_fragmento] = {"id": id_fragmento, "nodo": f"n{id_fragmento % 2}",
+                                                      "oraciones": 1, "bytes": 500, "segundos": 500 / rendimiento,
+                                                      "bytes_por_segundo": rendimiento}
+            informe = coordinador.informe()
+            self.assertEqual(informe["rezagados"], [3])
+            self.assertEqual(informe["por_nodo"]["n1"]["fragmentos"], 2)
+
+
+class TestDistribuido(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.path_diccionario, self.path_oraciones = generar_entrada(self.directorio.name)
+        self.path_salida = os.path.join(self.directorio.name, "salida.txt")
+        self.procesos = []
+
+    async def asyncTearDown(self):
+        for proceso in self.procesos:
+            proceso.join(10)
+            if proceso.is_alive():
+                proceso.terminate()
+        self.directorio.cleanup()
+
+    async def iniciar(self, trabajadores, **opciones):
+        coordinador = Coordinador(self.path_oraciones, self.path_salida, tamanio_fragmento=2000, **opciones)
+        await coordinador.iniciar()
+        host, puerto = coordinador.direccion()[:2]
+        for indice in range(trabajadores):
+            proceso = PROCESOS.Process(target=correr_trabajador,
+                                       args=(self.path_diccionario, host, puerto, f"nodo{indice}"))
+            proceso.start()
+            self.procesos.append(proceso)
+        return coordinador, host, puerto
+
+    def esperado(self):
+        oraciones = leer_archivo_como_list(self.path_oraciones)
+        palabras = leer_archivo_como_list(self.path_diccionario)
+        return [f"Oración {i}: {resultado}" for i, resultado in enumerate(procesar_texto(oraciones, palabras), 1)]
+
+    async def trabajador_que_falla(self, host, puerto):
+        """
+        Toma un fragmento y se desconecta sin responder, como un nodo que se cae.
+        """
+        lector, escritor = await asyncio.open_connection(host, puerto)
+        escritor.write(json.dumps({"tipo": "hola", "nodo": "caido"}).encode('utf-8') + b"\n")
+        await escritor.drain()
+        await lector.readline()
+        escritor.close()
+
+    async def trabajador_que_responde(self, host, puerto, respuesta):
+        """
+        Toma un fragmento y contesta con la respuesta dada (JSON válido con otra forma).
+        """
+        lector, escritor = await asyncio.open_connection(host, puerto)
+        escritor.write(json.dumps({"tipo": "hola", "nodo": "roto"}).encode('utf-8') + b"\n")
+        await escritor.drain()
+        fragmento = json.loads(await lector.readline())
+        escritor.write(json.dumps(respuesta(fragmento)).encode('utf-8') + b"\n")
+        await escritor.drain()
+        escritor.close()
+
+    async def test_resultados_en_orden_e_informe(self):
+        coordinador, _, _ = await self.iniciar(3)
+        informe = await asyncio.wait_for(coordinador.esperar(), 60)
+
+        self.assertEqual(leer_archivo_como_list(self.path_salida), self.esperado())
+        self.assertEqual([fragmento["id"] for fragmento in informe["fragmentos"]],
+                         list(range(len(coordinador.fragmentos))))
+        self.assertGreater(len(informe["fragmentos"]), 3)
+        self.assertEqual(informe["reintentos"], 0)
+        self.assertEqual(sum(nodo["oraciones"] for nodo in informe["por_nodo"].values()), 400)
+        self.assertTrue(all(fragmento["bytes_por_segundo"] > 0 for fragmento in informe["fragmentos"]))
+
+    async def test_reintento_de_fragmento_fallido(self):
+        coordinador, host, puerto = await self.iniciar(0)
+        await self.trabajador_que_falla(host, puerto)
+        await self.trabajador_que_falla(host, puerto)
+        self.procesos.append(PROCESOS.Process(target=correr_trabajador,
+                                              args=(self.path_diccionario, host, puerto)))
+        self.procesos[-1].start()
+        informe = await asyncio.wait_for(coordinador.esperar(), 60)
+
+        self.assertEqual(leer_archivo_como_list(self.path_salida), self.esperado())
+        self.assertEqual(informe["reintentos"], 2)
+        self.assertEqual(max(fragmento["intentos"] for fragmento in informe["fragmentos"]), 3)
+
+    async def test_respuestas_mal_formadas(self):
+        coordinador, host, puerto = await self.iniciar(0, reintentos=5)
+        await self.trabajador_que_responde(host, puerto, lambda fragmento: [1])
+        await self.trabajador_que_responde(host, puerto, lambda fragmento: {"tipo": "resultado", "id": fragmento["id"],
+                                                                            "resultados": 3})
+        self.procesos.append(PROCESOS.Process(target=correr_trabajador, args=(self.path_diccionario, host, puerto)))
+        self.procesos[-1].start()
+        informe = await asyncio.wait_for(coordinador.esperar(), 60)
+
+        self.assertEqual(leer_archivo_como_list(self.path_salida), self.esperado())
+        self.assertGreaterEqual(informe["reintentos"], 2)
+
+    async def test_reintentos_agotados(self):
+        coordinador, host, puerto = await self.iniciar(0, reintentos=1)
+        await self.trabajador_que_falla(host, puerto)
+        await self.trabajador_que_falla(host, puerto)
+        with self.assertRaises(FragmentoFallido):
+            await asyncio.wait_for(coordinador.esperar(), 10)
+
+    async def test_trabajador_con_otro_diccionario(self):
+        coordinador, host, puerto = await self.iniciar(0, huella="otra")
+        self.procesos.append(PROCESOS.Process(target=correr_trabajador,
+                                              args=(self.path_diccionario, host, puerto, "intruso")))
+        self.procesos[-1].start()
+        await asyncio.to_thread(self.procesos[-1].join, 10)
+        self.assertEqual(coordinador.rechazados, ["intruso"])
+        await coordinador.cerrar()
@@ -0,0 +1,71 @@
+import os
+import pickle
+import tempfile
+from unittest import TestCase
+from algoritmo import procesar_texto
+from diccionario import Diccionario
+from indice import compilar_diccionario, cargar_diccionario, diccionario_compacto
+from utils import wrapper_leer_archivo
+
+
+class TestIndiceCompilado(TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.path_indice = os.path.join(self.directorio.name, "gigante.idx")
+        compilar_diccionario("casos/gigante.txt", self.path_indice)
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def test_mismas_palabras_y_estadisticas(self):
+        oraciones, palabras = wrapper_leer_archivo("casos/500_in.txt", "casos/gigante.txt")
+        texto = Diccionario(palabras)
+        compilado = cargar_diccionario(self.path_indice)
+
+        self.assertEqual(set(compilado.palabras), texto.palabras)
+        self.assertEqual(compilado.longitudes, texto.longitudes)
+        self.assertEqual(compilado.longitudes_por_final, texto.longitudes_por_final)
+        self.assertNotIn("inexistente", compilado)
+        self.assertEqual(procesar_texto(oraciones, compilado), procesar_texto(oraciones, texto))
+        self.assertEqual(procesar_texto(oraciones, compilado, "trie"), procesar_texto(oraciones, texto))
+
+    def test_serializacion_reabre_el_archivo(self):
+        compilado = cargar_diccionario(self.path_indice)
+        copia = pickle.loads(pickle.dumps(compilado))
+        self.assertEqual(len(copia), len(compilado))
+        self.assertEqual(list(copia), list(compilado))
+
+    def test_modificar_diccionario_compilado(self):
+        oraciones, palabras = wrapper_leer_archivo("casos/500_in.txt", "casos/gigante.txt")
+        compilado = cargar_diccionario(self.path_indice)
+        quitadas = set(palabras[:50])
+
+        compilado.agregar_palabras(["zzzz", "yy"])
+        compilado.quitar_palabras(quitadas | {"zzzz"})
+        esperado = Diccionario(set(palabras) - quitadas | {"yy"})
+
+        self.assertEqual(len(compilado), len(esperado))
+        self.assertEqual(set(compilado.palabras), esperado.palabras)
+        self.assertEqual(compilado.longitudes, esperado.longitudes)
+        self.assertEqual(compilado.longitudes_por_final, esperado.longitudes_por_final)
+        self.assertEqual(compilado.huella, esperado.huella)
+        self.assertEqual(procesar_texto(oraciones, compilado), procesar_texto(oraciones, esperado))
+
+
+class TestDiccionarioCompacto(TestCase):
+    def test_equivalente_al_conjunto(self):
+        oraciones, palabras = wrapper_leer_archivo("casos/500_in.txt", "casos/gigante.txt")
+        texto = Diccionario(palabras)
+        compacto = diccionario_compacto(palabras + palabras[:100] + ["", "año"])
+        texto.agregar_palabras(["año"])
+
+        self.assertEqual(len(compacto), len(texto))
+        self.assertEqual(set(compacto.palabras), texto.palabras)
+        self.assertEqual(compacto.longitudes, texto.longitudes)
+        self.assertEqual(compacto.longitudes_por_final, texto.longitudes_por_final)
+        self.assertEqual(compacto.huella, texto.huella)
+        self.assertEqual(compacto.caracteres, texto.caracteres)
+        self.assertIn("año", compacto)
+        self.assertNotIn("inexistente", compacto)
+        self.assertEqual(procesar_texto(oraciones, compacto), procesar_texto(oraciones, texto))
+        self.assertEqual(list(pickle.loads(pickle.dumps(compacto)).palabras), list(compacto.palabras))
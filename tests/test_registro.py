@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import TestCase
+from algoritmo import procesar_texto
+from indice import compilar_diccionario
+from registro import RegistroDiccionarios
+from utils import wrapper_leer_archivo
+
+
+class TestRegistroDiccionarios(TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directorio.name, "dic.txt")
+        self.escribir(["hola", "eso"])
+        self.registro = RegistroDiccionarios()
+
+    def tearDown(self):
+        self.registro.detener()
+        self.directorio.cleanup()
+
+    def escribir(self, palabras):
+        temporal = self.path + ".tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            archivo.write("\n".join(palabras))
+        os.replace(temporal, self.path)
+
+    def esperar_hasta(self, condicion, plazo=10.0):
+        """
+        Espera a que la vigilancia cumpla la condición; falla (en lugar de colgar la suite) si vence el plazo.
+        """
+        limite = time.monotonic() + plazo
+        while not condicion():
+            if time.monotonic() > limite:
+                self.fail(f"La condición no se cumplió en {plazo}s")
+            threading.Event().wait(0.005)
+
+    def test_varios_diccionarios_y_memoria_compartida(self):
+        oraciones, palabras = wrapper_leer_archivo("casos/lorem_ipsum_in.txt", "casos/lorem_ipsum_words.txt")
+        copia = os.path.join(self.directorio.name, "copia.txt")
+        shutil.copy("casos/lorem_ipsum_words.txt", copia)
+        compilado = os.path.join(self.directorio.name, "gigante.idx")
+        compilar_diccionario("casos/gigante.txt", compilado)
+
+        self.registro.registrar("lorem", "casos/lorem_ipsum_words.txt")
+        self.registro.registrar("copia", copia)
+        self.registro.registrar("gigante", compilado)
+
+        self.assertIs(self.registro.obtener("lorem"), self.registro.obtener("copia"))
+        self.assertEqual(self.registro.procesar_texto("lorem", oraciones), procesar_texto(oraciones, palabras))
+        self.assertIn("gigante", self.registro)
+        self.assertRaises(KeyError, self.registro.obtener, "inexistente")
+
+    def test_recarga_atomica(self):
+        self.registro.registrar("dic", self.path)
+        anterior = self.registro.obtener("dic")
+        self.assertEqual(self.registro.recargar_cambiados(), [])
+
+        self.escribir(["hola", "es", "o"])
+        self.assertEqual(self.registro.recargar_cambiados(), ["dic"])
+
+        # Quien ya tenía la versión anterior la sigue usando sin cambios.
+        self.assertEqual(procesar_texto(["holaeso"], anterior), ["hola eso"])
+        self.assertEqual(self.registro.procesar_texto("dic", ["holaeso"]), ["hola es o"])
+        self.assertEqual(self.registro.recargas, 1)
+
+    def test_error_al_recargar_conserva_la_version_vigente(self):
+        self.registro.registrar("dic", self.path)
+        os.remove(self.path)
+
+        self.assertEqual(self.registro.recargar_cambiados(), [])
+        self.assertIn("dic", self.registro.errores)
+        self.assertEqual(self.registro.procesar_texto("dic", ["holaeso"]), ["hola eso"])
+
+    def test_compilado_truncado_no_detiene_la_vigilancia(self):
+        compilado = os.path.join(self.directorio.name, "dic.idx")
+        compilar_diccionario(self.path, compilado)
+        with open(compilado, 'rb') as archivo:
+            contenido = archivo.read()
+        self.registro.registrar("dic", compilado)
+        self.registro.vigilar(intervalo=0.001)
+
+        # Un compilado a medio escribir, publicado por renombre para no tocar las páginas del vigente.
+        with open(compilado + ".tmp", 'wb') as archivo:
+            archivo.write(contenido[:12])
+        os.replace(compilado + ".tmp", compilado)
+        self.esperar_hasta(lambda: "dic" in self.registro.errores)
+        self.assertTrue(self.registro._vigilancia.is_alive())
+        self.assertEqual(self.registro.procesar_texto("dic", ["holaeso"]), ["hola eso"])
+
+        self.escribir(["hola", "es", "o"])
+        compilar_diccionario(self.path, compilado + ".tmp")
+        os.replace(compilado + ".tmp", compilado)
+        self.esperar_hasta(lambda: self.registro.recargas)
+        self.assertNotIn("dic", self.registro.errores)
+        self.assertEqual(self.registro.procesar_texto("dic", ["holaeso"]), ["hola es o"])
+
+    def test_actualizar_un_nombre_quitado(self):
+        self.registro.registrar("dic", self.path)
+        self.registro.quitar("dic")
+        self.assertFalse(self.registro.actualizar("dic"))
+
+    def test_vigilancia_sin_bloquear_lecturas(self):
+        self.registro.registrar("dic", self.path)
+        self.registro.vigilar(intervalo=0.001)
+        detener = threading.Event()
+        resultados = set()
+
+        def leer():
+            while not detener.is_set():
+                resultados.update(self.registro.procesar_texto("dic", ["holaeso"]))
+
+        lector = threading.Thread(target=leer)
+        lector.start()
+        for palabras in (["hola", "es", "o"], ["hola", "eso"]) * 5:
+            self.escribir(palabras)
+            threading.Event().wait(0.01)
+        detener.set()
+        lector.join()
+
+        self.assertLessEqual(resultados, {"hola eso", "hola es o"})
+        self.assertGreater(self.registro.recargas, 0)
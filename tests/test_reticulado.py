@@ -0,0 +1,63 @@
+from itertools import islice
+from unittest import TestCase
+from algoritmo import segmentar_oracion
+from reticulado import construir_reticulado, puntaje_por_longitud
+
+
+def todas_por_fuerza_bruta(oracion, palabras):
+    if not oracion:
+        return [[]]
+    return [[oracion[:i]] + resto for i in range(1, len(oracion) + 1) if oracion[:i] in palabras
+            for resto in todas_por_fuerza_bruta(oracion[i:], palabras)]
+
+
+class TestReticulado(TestCase):
+    def setUp(self):
+        self.palabras = ["hola", "h", "ola", "o", "la", "es", "eso", "so", "s"]
+
+    def test_todas_las_segmentaciones(self):
+        for oracion in ["holaeso", "holaesox", "oso", "", "sola"]:
+            with self.subTest(oracion=oracion):
+                reticulado = construir_reticulado(oracion, self.palabras)
+                esperadas = todas_por_fuerza_bruta(oracion, set(self.palabras))
+                self.assertEqual(sorted(reticulado.enumerar()), sorted(esperadas))
+                self.assertEqual(reticulado.cantidad(), len(esperadas))
+                self.assertEqual(bool(reticulado), bool(esperadas))
+                if esperadas and oracion:
+                    self.assertIn(segmentar_oracion(oracion, self.palabras), esperadas)
+
+    def test_mejores_k(self):
+        oracion = "holaesoholaeso"
+        esperadas = todas_por_fuerza_bruta(oracion, set(self.palabras))
+        reticulado = construir_reticulado(oracion, self.palabras)
+
+        mejores = reticulado.mejores(5, puntaje_por_longitud)
+        puntajes = sorted((sum(len(palabra) ** 2 for palabra in segmentacion) for segmentacion in esperadas),
+                          reverse=True)
+        self.assertEqual([puntaje for puntaje, _ in mejores], puntajes[:5])
+        for puntaje, segmentacion in mejores:
+            self.assertIn(segmentacion, esperadas)
+            self.assertEqual(puntaje, sum(len(palabra) ** 2 for palabra in segmentacion))
+        self.assertEqual(reticulado.mejores(1)[0], (-4, ["hola", "eso", "hola", "eso"]))
+        self.assertEqual(len(reticulado.mejores(10 ** 6)), len(esperadas))
+
+    def test_cantidad_exponencial_sin_enumerar(self):
+        oracion = "a" * 300
+        reticulado = construir_reticulado(oracion, ["a", "aa"])
+
+        fibonacci = [1, 1]
+        while len(fibonacci) <= len(oracion):
+            fibonacci.append(fibonacci[-1] + fibonacci[-2])
+        self.assertEqual(reticulado.cantidad(), fibonacci[len(oracion)])
+        self.assertEqual(len(reticulado.aristas()), 2 * len(oracion) - 1)
+        self.assertEqual(len(list(islice(reticulado.enumerar(), 3))), 3)
+        self.assertEqual(reticulado.mejores(1)[0][1], ["aa"] * 150)
+
+    def test_descarta_posiciones_sin_salida(self):
+        reticulado = construir_reticulado("holax", ["hola", "ho", "x"])
+        self.assertEqual(reticulado.posiciones, [0, 4, 5])
+        self.assertEqual(reticulado.a_dict()["aristas"], [(0, 4), (4, 5)])
+        sin_segmentacion = construir_reticulado("hoxla", ["hola", "ho", "x"])
+        self.assertFalse(sin_segmentacion)
+        self.assertEqual(sin_segmentacion.posiciones, [])
+        self.assertEqual(sin_segmentacion.mejores(3), [])
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import os
+import signal
+from unittest import IsolatedAsyncioTestCase
+from algoritmo import procesar_texto
+from servidor import ServidorSegmentacion, prueba_de_carga
+from utils import wrapper_leer_archivo
+
+
+class TestServidor(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.oraciones, self.palabras = wrapper_leer_archivo("casos/10_in.txt", "casos/gigante.txt")
+        self.servidor = ServidorSegmentacion(self.palabras, workers=1)
+        await self.servidor.iniciar()
+        self.host, self.puerto = self.servidor.direccion()[:2]
+
+    async def asyncTearDown(self):
+        await self.servidor.cerrar()
+
+    async def test_pedidos_concurrentes_igual_que_procesar_texto(self):
+        metricas = await prueba_de_carga(self.oraciones, self.host, self.puerto, conexiones=3)
+
+        self.assertEqual(metricas["resultados"], procesar_texto(self.oraciones, self.palabras))
+        estadisticas = self.servidor.estadisticas()
+        self.assertEqual(estadisticas["pedidos"], len(self.oraciones))
+        self.assertLessEqual(estadisticas["lotes"], len(self.oraciones))
+
+    async def test_lote_estadisticas_y_pedido_invalido(self):
+        lector, escritor = await asyncio.open_connection(self.host, self.puerto)
+        escritor.write(json.dumps({"id": 1, "oraciones": self.oraciones}).encode('utf-8') + b"\n")
+        escritor.write(b"no es json\n")
+        escritor.write(json.dumps({"id": 2, "comando": "estadisticas"}).encode('utf-8') + b"\n")
+        await escritor.drain()
+
+        respuestas = [json.loads(await lector.readline()) for _ in range(3)]
+        escritor.close()
+
+        lote = next(respuesta for respuesta in respuestas if respuesta.get("id") == 1)
+        self.assertEqual(lote["resultados"], procesar_texto(self.oraciones, self.palabras))
+        self.assertTrue(any("error" in respuesta for respuesta in respuestas))
+        self.assertTrue(any("estadisticas" in respuesta for respuesta in respuestas))
+
+    async def test_diccionario_por_nombre(self):
+        await self.servidor.cerrar()
+        oraciones, palabras = wrapper_leer_archivo("casos/lorem_ipsum_in.txt", "casos/lorem_ipsum_words.txt")
+        self.servidor = ServidorSegmentacion(self.palabras, workers=1,
+                                             diccionarios={"lorem": "casos/lorem_ipsum_words.txt"})
+        await self.servidor.iniciar()
+        host, puerto = self.servidor.direccion()[:2]
+
+        lector, escritor = await asyncio.open_connection(host, puerto)
+        for indice, nombre in enumerate(["lorem", "inexistente"]):
+            pedido = {"id": indice, "oraciones": oraciones, "diccionario": nombre}
+            escritor.write(json.dumps(pedido).encode('utf-8') + b"\n")
+        await escritor.drain()
+        respuestas = {respuesta["id"]: respuesta for respuesta in
+                      [json.loads(await lector.readline()) for _ in range(2)]}
+        escritor.close()
+
+        self.assertEqual(respuestas[0]["resultados"], procesar_texto(oraciones, palabras))
+        self.assertIn("error", respuestas[1])
+
+    async def test_pedido_invalido_no_afecta_a_los_demas_del_lote(self):
+        await self.servidor.cerrar()
+        self.servidor = ServidorSegmentacion(self.palabras, workers=1, ventana=0.2)
+        await self.servidor.iniciar()
+        host, puerto = self.servidor.direccion()[:2]
+
+        lector, escritor = await asyncio.open_connection(host, puerto)
+        pedidos = [{"id": 1, "oracion": self.oraciones[0]}, {"id": 2, "oracion": None},
+                   {"id": 3, "oraciones": "abc"}, {"id": 4, "oraciones": ["a", 5]}, [1, 2]]
+        for pedido in pedidos:
+            escritor.write(json.dumps(pedido).encode('utf-8') + b"\n")
+        await escritor.drain()
+        respuestas = [json.loads(await lector.readline()) for _ in pedidos]
+        escritor.close()
+
+        por_id = {respuesta["id"]: respuesta for respuesta in respuestas}
+        self.assertEqual(por_id[1], {"id": 1, "resultado": procesar_texto(self.oraciones[:1], self.palabras)[0]})
+        for id_pedido in (2, 3, 4, None):
+            self.assertIn("error", por_id[id_pedido])
+
+    async def test_worker_muerto_no_cuelga_pedidos(self):
+        lector, escritor = await asyncio.open_connection(self.host, self.puerto)
+
+        async def pedir(id_pedido):
+            escritor.write(json.dumps({"id": id_pedido, "oracion": self.oraciones[0]}).encode('utf-8') + b"\n")
+            await escritor.drain()
+            return json.loads(await asyncio.wait_for(lector.readline(), 10))
+
+        self.assertIn("resultado", await pedir(1))
+        for proceso in list(self.servidor._pool._processes.values()):
+            os.kill(proceso.pid, signal.SIGKILL)
+            await asyncio.to_thread(proceso.join, 10)
+
+        # Los pedidos en vuelo al romperse el pool reciben un error; los siguientes usan un pool nuevo.
+        respuestas = [await pedir(id_pedido) for id_pedido in range(2, 5)]
+        escritor.close()
+        self.assertEqual([respuesta["id"] for respuesta in respuestas], [2, 3, 4])
+        self.assertEqual(respuestas[-1]["resultado"], procesar_texto(self.oraciones[:1], self.palabras)[0])
@@ -0,0 +1,45 @@
+import random
+from unittest import TestCase
+from algoritmo import segmentar_oracion
+from diccionario import Diccionario
+from texto_largo import segmentar_texto_largo, TextoNoSegmentable
+from utils import wrapper_leer_archivo
+
+
+def en_fragmentos(texto, tamanio):
+    return (texto[i:i + tamanio] for i in range(0, len(texto), tamanio))
+
+
+class TestTextoLargo(TestCase):
+    def test_igual_que_segmentar_oracion(self):
+        oraciones, palabras = wrapper_leer_archivo("casos/2000_in.txt", "casos/supergigante.txt")
+        diccionario = Diccionario(palabras)
+        texto = "".join(oracion for oracion in oraciones if segmentar_oracion(oracion, diccionario))
+        self.assertEqual(list(segmentar_texto_largo(en_fragmentos(texto, 4096), diccionario)),
+                         segmentar_oracion(texto, diccionario))
+
+    def test_casos_aleatorios(self):
+        generador = random.Random(3)
+        for _ in range(500):
+            diccionario = Diccionario(generador.sample(["a", "ab", "b", "ba", "abb", "bab", "c", "ca"],
+                                                       generador.randint(1, 5)))
+            texto = "".join(generador.choices("abc", k=generador.randint(0, 30)))
+            with self.subTest(palabras=sorted(diccionario.palabras), texto=texto):
+                esperado = segmentar_oracion(texto, diccionario)
+                fragmentos = en_fragmentos(texto, generador.randint(1, 5))
+                if esperado or not texto:
+                    self.assertEqual(list(segmentar_texto_largo(fragmentos, diccionario)), esperado)
+                else:
+                    self.assertRaises(TextoNoSegmentable, list, segmentar_texto_largo(fragmentos, diccionario))
+
+    def test_emite_palabras_antes_de_terminar(self):
+        emitidas = []
+        with self.assertRaises(TextoNoSegmentable):
+            for palabra in segmentar_texto_largo(iter(["hola", "eso" * 10, "x"]), ["hola", "eso", "es", "o"]):
+                emitidas.append(palabra)
+        self.assertEqual(emitidas[:3], ["hola", "eso", "eso"])
+
+    def test_sin_cortes_forzados(self):
+        # Sin cortes forzados (caminos pares e impares que nunca se juntan) se guarda todo, pero en un array.
+        palabras = list(segmentar_texto_largo(en_fragmentos("a" * 10_000, 1000), ["a", "aa"]))
+        self.assertEqual(palabras, ["aa"] * 5000)
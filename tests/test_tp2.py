@@ -0,0 +1,74 @@
+import io
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from contextlib import redirect_stderr
+from unittest import TestCase
+import tp2
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Tiempo máximo de 'import tp2' medido con -X importtime (acumulado, en microsegundos). Sin las importaciones
+# perezosas tardaba más de 80 ms; el margen cubre máquinas lentas.
+PRESUPUESTO_IMPORTACION_US = 40_000
+# Módulos que ningún camino de 'run' sin opciones debería cargar.
+MODULOS_PESADOS = {"asyncio", "unittest", "concurrent.futures", "multiprocessing", "requests", "numpy", "casos",
+                   "servidor", "paralelo", "reticulado"}
+
+
+def importaciones(*argumentos):
+    """
+    Corre python -X importtime con los argumentos y devuelve un diccionario módulo -> tiempo acumulado en µs.
+    """
+    proceso = subprocess.run([sys.executable, "-X", "importtime", *argumentos], cwd=RAIZ, capture_output=True,
+                             text=True, check=True)
+    tiempos = {}
+    for linea in proceso.stderr.splitlines():
+        match = re.match(r"import time:\s*\d+ \|\s*(\d+) \|\s*(\S+)", linea)
+        if match:
+            tiempos[match.group(2)] = int(match.group(1))
+    return tiempos
+
+
+class TestArranque(TestCase):
+    def test_presupuesto_de_importacion(self):
+        tiempos = importaciones("-c", "import tp2")
+        self.assertLess(tiempos["tp2"], PRESUPUESTO_IMPORTACION_US)
+        self.assertFalse(MODULOS_PESADOS & set(tiempos))
+
+    def test_run_no_carga_modulos_pesados(self):
+        tiempos = importaciones("tp2.py", "casos/10_in.txt", "casos/corto.txt")
+        self.assertIn("algoritmo", tiempos)
+        self.assertFalse(MODULOS_PESADOS & set(tiempos))
+
+
+class TestLineaDeComandos(TestCase):
+    def test_run_implicito_y_explicito(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            implicito = os.path.join(directorio, "implicito.txt")
+            explicito = os.path.join(directorio, "explicito.txt")
+            self.assertEqual(tp2.main(["casos/10_in.txt", "casos/corto.txt", "--salida", implicito]), 0)
+            self.assertEqual(tp2.main(["run", "casos/10_in.txt", "casos/corto.txt", "--motor", "trie",
+                                       "--salida", explicito]), 0)
+            with open(implicito, encoding='utf-8') as archivo_implicito, \
+                    open(explicito, encoding='utf-8') as archivo_explicito:
+                lineas = archivo_implicito.read().splitlines()
+                self.assertEqual(lineas, archivo_explicito.read().splitlines())
+            self.assertEqual(len(lineas), 20)
+            self.assertTrue(lineas[0].startswith("Oración 1: "))
+
+    def test_motor_desconocido(self):
+        self.assertEqual(tp2.main(["casos/10_in.txt", "casos/corto.txt", "--motor", "otro"]), 2)
+
+    def test_opciones_invalidas_de_run(self):
+        for opciones in (["--mejores", "2", "--motor", "trie"], ["--mejores", "2", "--workers", "2"],
+                         ["--prefijos", "--cache", "cache.json"], ["--prefijos", "--mejores", "2"],
+                         ["--mejores", "0"], ["--mejores", "-3"], ["--mejores", "x"]):
+            with self.subTest(opciones=opciones), redirect_stderr(io.StringIO()):
+                with self.assertRaises(SystemExit) as salida:
+                    tp2.main(["casos/10_in.txt", "casos/corto.txt", *opciones])
+                self.assertEqual(salida.exception.code, 2)
+
+    def test_parsear_diccionarios(self):
+        self.assertEqual(tp2.parsear_diccionarios("a=x.txt,b=y.idx"), {"a": "x.txt", "b": "y.idx"})
@@ -0,0 +1,94 @@
+import io
+import json
+from collections import Counter
+from unittest import TestCase
+from algoritmo import procesar_texto, segmentar_oracion
+from diccionario import Diccionario
+from trazas import Traza, TrazaEnMemoria, TrazaJSON, MetricasSegmentacion
+from tests.test_algoritmo import MOTORES_DISPONIBLES
+
+
+class TrazaDeSondas(Traza):
+    sondas = True
+
+    def __init__(self):
+        self.eventos = []
+
+    def inicio(self, oracion):
+        self.eventos.append(("inicio", oracion))
+
+    def sonda(self, oracion, subcadena, encontrada):
+        self.eventos.append((subcadena, encontrada))
+
+
+class TestTrazas(TestCase):
+    def setUp(self):
+        self.diccionario = Diccionario(["hola", "como", "es", "eso", "andar", "h"])
+        self.oraciones = ["holacomoes", "holaeso", "xhola", "holao", ""]
+
+    def test_resultados_iguales_con_y_sin_traza(self):
+        for motor in MOTORES_DISPONIBLES + ["viterbi"]:
+            with self.subTest(motor=motor):
+                traza = TrazaEnMemoria()
+                rechazos, rechazos_trazados = Counter(), Counter()
+                self.assertEqual(procesar_texto(self.oraciones, self.diccionario, motor, traza=traza,
+                                                rechazos=rechazos_trazados),
+                                 procesar_texto(self.oraciones, self.diccionario, motor, rechazos=rechazos))
+                self.assertEqual(rechazos, rechazos_trazados)
+                self.assertEqual(len(traza.registros), len(self.oraciones))
+
+    def test_contadores(self):
+        traza = TrazaEnMemoria()
+        segmentar_oracion("holacomoes", self.diccionario, traza=traza)
+        segmentar_oracion("xhola", self.diccionario, traza=traza)
+        segmentar_oracion("holao", self.diccionario, "trie", traza=traza)
+        valido, rechazado, trie = traza.registros
+        self.assertEqual(valido["segmentacion"], ["hola", "como", "es"])
+        self.assertIsNone(valido["motivo"])
+        self.assertEqual(valido["palabras"], 3)
+        self.assertEqual(valido["alcanzables"], 4)  # 1 (h), 4, 8, 10
+        self.assertGreaterEqual(valido["sondas"], valido["aciertos"])
+        self.assertEqual(valido["aciertos"], 4)
+        self.assertGreater(valido["ns"], 0)
+        self.assertEqual(rechazado["motivo"], "inicio")
+        self.assertEqual(rechazado["alcanzables"], 0)
+        self.assertEqual((trie["motivo"], trie["alcanzables"]), ("sin_camino", 2))
+        self.assertEqual(rechazado["sondas"], 0)
+
+    def test_contadores_de_todos_los_motores(self):
+        traza = TrazaEnMemoria()
+        for motor in MOTORES_DISPONIBLES + ["viterbi"]:
+            segmentar_oracion("holacomoes", self.diccionario, motor, traza=traza)
+        por_motor = {registro["motor"]: registro for registro in traza.registros}
+        for motor, registro in por_motor.items():
+            with self.subTest(motor=motor):
+                self.assertGreater(registro["sondas"], 0)
+                self.assertGreaterEqual(registro["sondas"], registro["aciertos"])
+                self.assertGreaterEqual(registro["aciertos"], 3)
+        # El motor por hash prueba las mismas subcadenas que el motor por conjunto.
+        self.assertEqual((por_motor["hash"]["sondas"], por_motor["hash"]["aciertos"]),
+                         (por_motor["conjunto"]["sondas"], por_motor["conjunto"]["aciertos"]))
+
+    def test_sondas(self):
+        for motor in ("conjunto", "trie", "hash", "viterbi"):
+            with self.subTest(motor=motor):
+                traza = TrazaDeSondas()
+                segmentar_oracion("holaes", self.diccionario, motor, traza=traza)
+                self.assertEqual(traza.eventos[0], ("inicio", "holaes"))
+                self.assertIn(("hola", True), traza.eventos)
+                self.assertIn(("es", True), traza.eventos)
+
+    def test_registros_json_y_metricas(self):
+        salida = io.StringIO()
+        metricas = MetricasSegmentacion()
+        procesar_texto(self.oraciones, self.diccionario, traza=TrazaJSON(salida))
+        procesar_texto(self.oraciones, self.diccionario, traza=metricas)
+        registros = [json.loads(linea) for linea in salida.getvalue().splitlines()]
+        self.assertEqual([registro["oracion"] for registro in registros], self.oraciones)
+
+        resumen = metricas.a_dict()
+        self.assertEqual(resumen["oraciones"], 5)
+        self.assertEqual(resumen["rechazos"], {"inicio": 1, "sin_camino": 1})
+        self.assertEqual(resumen["totales"]["palabras"], 5)
+        self.assertEqual(sum(resumen["histogramas"]["palabras"].values()), 5)
+        self.assertEqual(resumen["histogramas"]["palabras"], {0: 3, 2: 2})
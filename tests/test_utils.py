@@ -0,0 +1,42 @@
+import io
+import os
+import tempfile
+from unittest import TestCase
+from utils import leer_archivo_como_list, leer_lineas, escribir_resultados
+
+
+class TestEntradaSalida(TestCase):
+    TEXTOS = ["", "a", "a\n", "a\n\nb", "hola\r\nañoñería\r\n", "x\ry\n", "ñ" * 50 + "\n" + "é" * 7, "\n\n"]
+
+    def _en_archivo(self, texto):
+        archivo = tempfile.NamedTemporaryFile('wb', suffix=".txt", delete=False)
+        archivo.write(texto.encode('utf-8'))
+        archivo.close()
+        self.addCleanup(os.remove, archivo.name)
+        return archivo.name
+
+    def test_igual_que_modo_texto(self):
+        for texto in self.TEXTOS:
+            path = self._en_archivo(texto)
+            with open(path, 'r', encoding='utf-8') as archivo:
+                esperado = [linea.rstrip('\n') for linea in archivo]
+            with self.subTest(texto=texto):
+                self.assertEqual(leer_archivo_como_list(path), esperado)
+                # Bloques diminutos: cortan caracteres de varios bytes y saltos '\r\n' por la mitad
+                for tamanio_bloque in (1, 2, 3, 7):
+                    self.assertEqual(list(leer_lineas(path, tamanio_bloque)), esperado)
+
+    def test_linea_de_varios_bloques(self):
+        lineas = ["ab" * 5000, "corta", "", "ñ" * 3001 + "x", "c" * 64]
+        path = self._en_archivo("\n".join(lineas))
+        for tamanio_bloque in (16, 64, 1000):
+            with self.subTest(tamanio_bloque=tamanio_bloque):
+                self.assertEqual(list(leer_lineas(path, tamanio_bloque)), lineas)
+
+    def test_escribir_por_lotes(self):
+        resultados = [f"oracion {i}" for i in range(10)]
+        esperado = "".join(f"Oración {i + 1}: {oracion}\n" for i, oracion in enumerate(resultados))
+        for lineas_por_lote in (1, 3, 4096):
+            salida = io.StringIO()
+            escribir_resultados(iter(resultados), salida, lineas_por_lote)
+            self.assertEqual(salida.getvalue(), esperado)
@@ -0,0 +1,103 @@
+from array import array
+from diccionario import como_diccionario
+
+TAMANIO_DE_FRAGMENTO = 1 << 16  # Caracteres leídos por vez al segmentar un archivo
+
+
+class TextoNoSegmentable(ValueError):
+    """
+    El texto no se puede segmentar. Las palabras anteriores a posicion ya pueden haberse emitido.
+    """
+
+    def __init__(self, posicion):
+        super().__init__(f"No es un mensaje (sin segmentación posible a partir del carácter {posicion})")
+        self.posicion = posicion
+
+
+def leer_fragmentos(path, tamanio=TAMANIO_DE_FRAGMENTO):
+    """
+    Generador que lee un archivo de texto de a tamanio caracteres, sin saltos de línea.
+    """
+    with open(path, 'r', encoding='utf-8') as archivo:
+        for fragmento in iter(lambda: archivo.read(tamanio), ""):
+            yield fragmento.replace("\r", "").replace("\n", "")
+
+
+def segmentar_texto_largo(fragmentos, diccionario):
+    """
+    Segmenta un texto sin espacios de longitud arbitraria que llega de a fragmentos, devolviendo cada palabra
+    apenas queda fija. Da la misma segmentación que segmentar_oracion sobre el texto completo.
+    Una posición es un corte forzado cuando los caminos de todas las posiciones alcanzables de la ventana de
+    las últimas max_long pasan por ella: cualquier segmentación del texto completo pasa por alguna de esas
+    posiciones, así que todo lo anterior al corte ya no puede cambiar. Solo se guarda el texto y los punteros
+    hacia atrás (en un array('q'), así las posiciones pueden superar 2**31) desde el último corte emitido.
+    :param fragmentos: Iterable de cadenas que concatenadas forman el texto.
+    :param diccionario: Diccionario ya indexado, o lista de palabras.
+    :raises TextoNoSegmentable: Si el texto no se puede segmentar (después de emitir las palabras ya fijas).
+    """
+    diccionario = como_diccionario(diccionario)
+    conjunto_diccionario = diccionario.palabras
+    longitudes_por_final = diccionario.longitudes_por_final
+    max_long = diccionario.max_long
+
+    base = 0  # Posición del último corte emitido; texto y atras empiezan ahí
+    texto = ""
+    atras = array('q', [base])  # atras[i - base] = inicio j de la palabra que termina en i, o -1 si i no es alcanzable
+    posicion = 0
+    ultimo = 0  # Última posición alcanzable
+    proximo_chequeo = max_long
+
+    for fragmento in fragmentos:
+        texto += fragmento
+        for caracter in fragmento:
+            posicion += 1
+            inicio = -1
+            for longitud in longitudes_por_final.get(caracter, ()):
+                j = posicion - longitud
+                if j >= base and atras[j - base] >= 0 and texto[j - base:posicion - base] in conjunto_diccionario:
+                    inicio = j
+                    break
+            atras.append(inicio)
+            if inicio >= 0:
+                ultimo = posicion
+            elif posicion - ultimo >= max_long:
+                raise TextoNoSegmentable(ultimo)
+
+        if posicion >= proximo_chequeo:
+            corte = _corte_forzado(atras, base, posicion, max_long)
+            if corte > base:
+                yield from _palabras_hasta(texto, atras, base, corte)
+                texto = texto[corte - base:]
+                del atras[:corte - base]
+                base = corte
+            # Si no aparece un corte, los chequeos se espacian para que el costo total siga siendo lineal.
+            proximo_chequeo = posicion + max(max_long, posicion - base)
+
+    if posicion and atras[posicion - base] < 0:
+        raise TextoNoSegmentable(ultimo)
+    yield from _palabras_hasta(texto, atras, base, posicion)
+
+
+def _corte_forzado(atras, base, posicion, max_long):
+    """
+    Ancestro común de los caminos de las posiciones alcanzables entre posicion - max_long + 1 y posicion:
+    se reemplaza repetidamente la mayor posición de la frontera por su puntero hasta que queda una sola.
+    """
+    frontera = {i for i in range(max(base, posicion - max_long + 1), posicion + 1) if atras[i - base] >= 0}
+    while len(frontera) > 1:
+        mayor = max(frontera)
+        frontera.remove(mayor)
+        frontera.add(atras[mayor - base])
+    return frontera.pop() if frontera else base
+
+
+def _palabras_hasta(texto, atras, base, corte):
+    cortes = []
+    i = corte
+    while i > base:
+        cortes.append(i)
+        i = atras[i - base]
+    inicio = base
+    for fin in reversed(cortes):
+        yield texto[inicio - base:fin - base]
+        inicio = fin
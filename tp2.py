@@ -1,46 +1,271 @@
-import unittest
-from algoritmo import procesar_texto
-from utils import wrapper_leer_archivo
-from casos import test_procesar_texto
+import argparse
+import importlib
+import sys
 
+# Subcomandos que delegan todos sus argumentos al main de otro módulo.
+DELEGADOS = {"bench": "benchmark", "regresion": "regresion", "corpus": "corpus", "distribuido": "distribuido"}
+SUBCOMANDOS = {"run", "test", "ejemplo", "compile", "largo", "servir", "carga"} | set(DELEGADOS)
 
-def main(argc, argv):
+
+def parsear_diccionarios(texto):
+    """
+    Convierte 'nombre=path,nombre=path' en un diccionario nombre -> path.
+    """
+    diccionarios = {}
+    for par in filter(None, texto.split(",")):
+        nombre, _, path = par.partition("=")
+        diccionarios[nombre] = path
+    return diccionarios
+
+
+def entero_positivo(texto):
+    """
+    Tipo de argparse para enteros mayores que 0.
+    """
+    valor = int(texto)
+    if valor < 1:
+        raise argparse.ArgumentTypeError(f"se esperaba un entero mayor que 0 y se recibió {valor}")
+    return valor
+
+
+def crear_parser():
+    """
+    Parser de la línea de comandos. Cada subcomando tiene una función que importa recién al ejecutarse los módulos
+    que usa, así el arranque no paga por dependencias que ese subcomando no necesita (asyncio, unittest, numpy...).
+    """
+    parser = argparse.ArgumentParser(
+        prog="tp2.py", description="Segmentación de oraciones sin espacios en palabras de un diccionario.",
+        epilog="Sin subcomando se asume 'run': python tp2.py <archivo_oraciones> <archivo_diccionario>. "
+               f"Además: {', '.join(f'{nombre} (ver python {modulo}.py -h)' for nombre, modulo in DELEGADOS.items())}.")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    run = subcomandos.add_parser("run", help="segmenta cada línea de un archivo de oraciones")
+    run.add_argument("oraciones", help="archivo de oraciones, o '-' para leerlas de la entrada estándar")
+    run.add_argument("diccionario", help="archivo de diccionario (texto o compilado)")
+    run.add_argument("--motor", default="conjunto", help="conjunto, trie, hash, numpy o viterbi")
+    run.add_argument("--workers", type=int, default=1)
+    run.add_argument("--salida", help="archivo de resultados (por defecto, la salida estándar)")
+    run.add_argument("--cache", help="archivo del cache de segmentaciones entre ejecuciones")
+    run.add_argument("--cache-capacidad", type=int, default=100_000)
+    run.add_argument("--compacto", action="store_true", help="indexa el diccionario en una tabla compacta")
+    # Modos con su propio algoritmo: no admiten --motor, --workers ni --cache (ver _conflicto_de_run).
+    modo = run.add_mutually_exclusive_group()
+    modo.add_argument("--prefijos", action="store_true",
+                      help="reutiliza el cálculo entre oraciones con prefijo común (carga todas las oraciones)")
+    modo.add_argument("--mejores", type=entero_positivo, metavar="K", help="devuelve las K segmentaciones con menos palabras")
+    run.set_defaults(funcion=ejecutar_run)
+
+    test = subcomandos.add_parser("test", help="corre los tests")
+    test.set_defaults(funcion=ejecutar_test)
+
+    ejemplo = subcomandos.add_parser("ejemplo", help="segmenta un ejemplo mostrando cada paso")
+    ejemplo.set_defaults(funcion=ejecutar_ejemplo)
+
+    compilar = subcomandos.add_parser("compile", help="compila un diccionario a un índice binario")
+    compilar.add_argument("diccionario")
+    compilar.add_argument("compilado")
+    compilar.set_defaults(funcion=ejecutar_compile)
+
+    largo = subcomandos.add_parser("largo", help="segmenta todo un archivo como un único texto")
+    largo.add_argument("texto")
+    largo.add_argument("diccionario")
+    largo.add_argument("--compacto", action="store_true")
+    largo.set_defaults(funcion=ejecutar_largo)
+
+    servidor = subcomandos.add_parser("servir", help="atiende pedidos de segmentación por TCP o socket Unix")
+    servidor.add_argument("diccionario")
+    servidor.add_argument("--host", default="127.0.0.1")
+    servidor.add_argument("--puerto", type=int, default=8765)
+    servidor.add_argument("--unix", help="path del socket Unix (en lugar de TCP)")
+    servidor.add_argument("--workers", type=int)
+    servidor.add_argument("--motor", default="conjunto")
+    servidor.add_argument("--ventana-ms", type=float, default=5)
+    servidor.add_argument("--diccionarios", default="", help="diccionarios con nombre: nombre=path,...")
+    servidor.add_argument("--compacto", action="store_true")
+    servidor.set_defaults(funcion=ejecutar_servir)
+
+    carga = subcomandos.add_parser("carga", help="mide latencia y pedidos por segundo contra un servidor")
+    carga.add_argument("oraciones")
+    carga.add_argument("--host", default="127.0.0.1")
+    carga.add_argument("--puerto", type=int, default=8765)
+    carga.add_argument("--unix")
+    carga.add_argument("--conexiones", type=int, default=16)
+    carga.set_defaults(funcion=ejecutar_carga)
+
+    return parser
+
+
+def main(argv=None):
     """
     Función principal que ejecuta el programa.
-    :param argc: Número de argumentos de la línea de comandos.
-    :param argv: Lista de argumentos de la línea de comandos.
+    :param argv: Argumentos de la línea de comandos, sin el nombre del programa.
+    :return: Código de salida.
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in DELEGADOS:
+        return importlib.import_module(DELEGADOS[argv[0]]).main(argv[1:])
+    if argv and argv[0] not in SUBCOMANDOS and (argv[0] == "-" or not argv[0].startswith("-")):
+        argv.insert(0, "run")
+
+    parser = crear_parser()
+    argumentos = parser.parse_args(argv)
+    if argumentos.comando == "run":
+        conflicto = _conflicto_de_run(argumentos)
+        if conflicto:
+            parser.error(f"run: {conflicto}")
+    return argumentos.funcion(argumentos) or 0
+
+
+def _conflicto_de_run(argumentos):
+    """
+    --prefijos y --mejores usan su propio algoritmo en un único proceso y sin cache, así que en lugar de
+    ignorar en silencio las opciones que no aplican se rechaza la combinación.
+    :return: Descripción del conflicto, o None si las opciones son compatibles.
     """
-    if argc == 2:
-        if argv[1] == "test":
-            loader = unittest.TestLoader()
-            tests = loader.discover('./tests', pattern='test_*.py')
-            test_runner = unittest.TextTestRunner()
-            test_runner.run(tests)
-            sys.exit(0)
+    modo = "--prefijos" if argumentos.prefijos else "--mejores" if argumentos.mejores is not None else None
+    if modo is None:
+        return None
+    incompatibles = [opcion for opcion, usada in [("--motor", argumentos.motor != "conjunto"),
+                                                  ("--workers", argumentos.workers != 1),
+                                                  ("--cache", argumentos.cache is not None)] if usada]
+    if incompatibles:
+        return f"{modo} no se puede combinar con {', '.join(incompatibles)}"
+    return None
+
+
+def _validar_motor(motor):
+    from algoritmo import MOTORES
+
+    if motor not in MOTORES:
+        print(f"Motor desconocido: {motor}. Opciones: {', '.join(MOTORES)}", file=sys.stderr)
+        return False
+    return True
 
-        if argv[1] == "ejemplo":
-            test_procesar_texto()
-            sys.exit(0)
 
-        print("Uso: python tp2.py test")
-        print("Uso: python tp2.py <archivo_oraciones> <archivo_diccionario>")
-        return
+def ejecutar_run(argumentos):
+    from collections import Counter
+    from algoritmo import procesar_flujo, CacheSegmentaciones, SegmentadorPorPrefijos
+    from indice import cargar_diccionario
+    from utils import leer_lineas, escribir_resultados, LINEAS_POR_LOTE, TAMANIO_DE_BLOQUE
 
-    if argc != 3:
-        print("Uso: python tp2.py <archivo_oraciones> <archivo_diccionario>")
-        return
+    if not _validar_motor(argumentos.motor):
+        return 2
 
-    path_oraciones = argv[1]
-    path_diccionario = argv[2]
+    diccionario = cargar_diccionario(argumentos.diccionario, argumentos.compacto)
+    oraciones = leer_lineas(argumentos.oraciones)
 
-    oraciones, diccionario = wrapper_leer_archivo(path_oraciones, path_diccionario)
+    cache = None
+    if argumentos.cache:
+        cache = CacheSegmentaciones.cargar(argumentos.cache, argumentos.cache_capacidad)
 
-    resultado = procesar_texto(oraciones, diccionario)
+    rechazos = Counter()
+    segmentador = None
+    if argumentos.mejores is not None:
+        from reticulado import procesar_flujo_mejores
+
+        resultado = procesar_flujo_mejores(oraciones, diccionario, argumentos.mejores)
+    elif argumentos.prefijos:
+        segmentador = SegmentadorPorPrefijos(diccionario)
+        resultado = segmentador.procesar(list(oraciones))
+    elif argumentos.workers > 1:
+        from paralelo import procesar_flujo_paralelo
+
+        resultado = procesar_flujo_paralelo(oraciones, diccionario, workers=argumentos.workers,
+                                            motor=argumentos.motor, cache=cache, rechazos=rechazos)
+    else:
+        resultado = procesar_flujo(oraciones, diccionario, argumentos.motor, cache, rechazos)
+
+    # Leyendo de la entrada estándar cada resultado se escribe apenas se calcula; si no, se escriben por lotes.
+    lineas_por_lote = 1 if argumentos.oraciones == "-" else LINEAS_POR_LOTE
+    if argumentos.salida:
+        with open(argumentos.salida, 'w', encoding='utf-8', buffering=TAMANIO_DE_BLOQUE) as salida:
+            escribir_resultados(resultado, salida, lineas_por_lote)
+    else:
+        escribir_resultados(resultado, sys.stdout, lineas_por_lote)
+
+    if rechazos:
+        print(f"Rechazos por motivo: {dict(rechazos)}", file=sys.stderr)
+
+    if segmentador is not None:
+        print(f"Prefijos reutilizados: {segmentador.caracteres_reutilizados}/{segmentador.caracteres_totales} "
+              f"caracteres ({segmentador.tasa_reutilizacion:.1%})", file=sys.stderr)
+
+    if cache is not None:
+        cache.guardar(argumentos.cache)
+        print(f"Cache: {cache.estadisticas()}", file=sys.stderr)
+
+
+def ejecutar_test(argumentos):
+    import unittest
+
+    loader = unittest.TestLoader()
+    tests = loader.discover('./tests', pattern='test_*.py')
+    test_runner = unittest.TextTestRunner()
+    test_runner.run(tests)
+
+
+def ejecutar_ejemplo(argumentos):
+    from casos import test_procesar_texto
+
+    test_procesar_texto()
+
+
+def ejecutar_compile(argumentos):
+    from indice import compilar_diccionario
+
+    compilar_diccionario(argumentos.diccionario, argumentos.compilado)
+
+
+def ejecutar_largo(argumentos):
+    from indice import cargar_diccionario
+
+    return segmentar_archivo_largo(argumentos.texto, cargar_diccionario(argumentos.diccionario, argumentos.compacto))
+
+
+def ejecutar_servir(argumentos):
+    import asyncio
+    from indice import cargar_diccionario
+    from servidor import servir
+
+    if not _validar_motor(argumentos.motor):
+        return 2
+    try:
+        asyncio.run(servir(cargar_diccionario(argumentos.diccionario, argumentos.compacto), argumentos.host,
+                           argumentos.puerto, argumentos.unix, argumentos.workers, argumentos.motor,
+                           argumentos.ventana_ms / 1000, parsear_diccionarios(argumentos.diccionarios)))
+    except KeyboardInterrupt:
+        pass
+
+
+def ejecutar_carga(argumentos):
+    import asyncio
+    from servidor import prueba_de_carga
+    from utils import leer_lineas
+
+    metricas = asyncio.run(prueba_de_carga(list(leer_lineas(argumentos.oraciones)), argumentos.host,
+                                           argumentos.puerto, argumentos.unix, argumentos.conexiones))
+    del metricas["resultados"]
+    print(metricas)
+
+
+def segmentar_archivo_largo(path_texto, diccionario):
+    """
+    Segmenta todo el archivo como un único texto, escribiendo las palabras a medida que quedan fijas.
+    :return: Código de salida (1 si el texto no se puede segmentar).
+    """
+    from texto_largo import segmentar_texto_largo, leer_fragmentos, TextoNoSegmentable
 
-    for i, oracion in enumerate(resultado):
-        print(f"Oración {i + 1}: {oracion}")
+    try:
+        for palabra in segmentar_texto_largo(leer_fragmentos(path_texto), diccionario):
+            sys.stdout.write(palabra)
+            sys.stdout.write(" ")
+    except TextoNoSegmentable as error:
+        print()
+        print(error, file=sys.stderr)
+        return 1
+    print()
+    return 0
 
 
 if __name__ == "__main__":
-    import sys
-    main(len(sys.argv), sys.argv)
+    sys.exit(main())
@@ -0,0 +1,103 @@
+import json
+from collections import Counter
+
+METRICAS = ("sondas", "aciertos", "alcanzables", "palabras", "ns_por_caracter")
+
+
+class Traza:
+    """
+    Receptor de los eventos de segmentar_oracion (ver su parámetro traza). Esta clase base no hace nada;
+    las subclases redefinen los métodos que les interesan. Sin traza la segmentación no paga ningún costo extra.
+    """
+
+    sondas = False  # Si es True se llama a sonda() en cada consulta al diccionario (mucho más lento)
+
+    def inicio(self, oracion):
+        """
+        Se llama antes de segmentar cada oración.
+        """
+
+    def sonda(self, oracion, subcadena, encontrada):
+        """
+        Se llama en cada consulta de una subcadena al diccionario, solo si sondas es True. El motor numpy
+        consulta de forma vectorizada y no llama a este método (solo suma sus contadores).
+        """
+
+    def registrar(self, registro):
+        """
+        Se llama al terminar cada oración con un diccionario con sus contadores:
+        - oracion, motor, longitud (caracteres) y segmentacion (lista de palabras, vacía si no hay).
+        - motivo: motivo del rechazo (ver segmentar_oracion), o None si se pudo segmentar.
+        - sondas y aciertos: consultas del motor al diccionario y cuántas encontraron lo buscado (0 si la oración
+          no llega a la programación dinámica). Cada motor consulta su propia estructura: conjunto y viterbi
+          una subcadena en el conjunto de palabras, hash un hash en las tablas (acierto si la subcadena está
+          entre las candidatas), trie un paso a un hijo (acierto si el prefijo existe) y numpy una ventana
+          en las tablas vectorizadas (acierto si coincide con alguna palabra).
+        - alcanzables: posiciones de corte alcanzadas por la programación dinámica, sin contar la 0.
+        - palabras: largo del camino reconstruido hacia atrás.
+        - ns y ns_por_caracter: tiempo de la segmentación sin instrumentar, en nanosegundos.
+        """
+
+
+class TrazaEnMemoria(Traza):
+    """
+    Guarda todos los registros en la lista registros.
+    """
+
+    def __init__(self):
+        self.registros = []
+
+    def registrar(self, registro):
+        self.registros.append(registro)
+
+
+class TrazaJSON(Traza):
+    """
+    Escribe cada registro como una línea JSON en un archivo de texto abierto.
+    """
+
+    def __init__(self, salida):
+        self.salida = salida
+
+    def registrar(self, registro):
+        self.salida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+
+class MetricasSegmentacion(Traza):
+    """
+    Acumula los registros en totales e histogramas, sin guardar cada oración: la memoria no crece con la entrada.
+    Los histogramas agrupan los valores en potencias de dos (el balde b cuenta los valores en [b, 2b); el 0 aparte).
+    """
+
+    def __init__(self):
+        self.oraciones = 0
+        self.rechazos = Counter()
+        self.totales = Counter()
+        self.histogramas = {metrica: Counter() for metrica in METRICAS}
+
+    def registrar(self, registro):
+        self.oraciones += 1
+        if registro["motivo"] is not None:
+            self.rechazos[registro["motivo"]] += 1
+        self.totales["caracteres"] += registro["longitud"]
+        self.totales["ns"] += registro["ns"]
+        for metrica in METRICAS:
+            valor = registro[metrica]
+            if valor is not None:
+                valor = int(valor)
+                if metrica != "ns_por_caracter":
+                    self.totales[metrica] += valor
+                self.histogramas[metrica][1 << valor.bit_length() >> 1] += 1
+
+    def a_dict(self):
+        """
+        Resumen serializable: totales, rechazos por motivo e histogramas (balde -> cantidad, en orden creciente).
+        """
+        return {
+            "oraciones": self.oraciones,
+            "ns_por_caracter": self.totales["ns"] / self.totales["caracteres"] if self.totales["caracteres"] else 0.0,
+            "totales": dict(self.totales),
+            "rechazos": dict(self.rechazos),
+            "histogramas": {metrica: dict(sorted(histograma.items()))
+                            for metrica, histograma in self.histogramas.items()},
+        }
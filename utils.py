@@ -1,19 +1,86 @@
+import os
 import re
+import sys
+from itertools import islice
+
+TAMANIO_DE_BLOQUE = 1 << 20  # Caracteres leídos por vez; cada bloque se divide en líneas de una sola vez
+LINEAS_POR_LOTE = 4096  # Resultados que se juntan en una única escritura
+
+
+def dividir_lineas(texto):
+    """
+    Divide un texto en líneas de una sola vez, igual que leer un archivo en modo texto línea por línea
+    (los saltos '\r\n' y '\r' cuentan como '\n' y un salto al final no agrega una línea vacía).
+    """
+    if "\r" in texto:
+        texto = texto.replace("\r\n", "\n").replace("\r", "\n")
+    lineas = texto.split("\n")
+    if lineas[-1] == "":
+        lineas.pop()
+    return lineas
+
 
 def leer_archivo_como_set(nombre_archivo):
-    resultado = set()
-    with open(nombre_archivo, 'r', encoding='utf-8') as archivo:
-        for linea in archivo:
-            resultado.add(linea.rstrip('\n'))
-    return resultado
+    return set(leer_archivo_como_list(nombre_archivo))
 
 
 def leer_archivo_como_list(nombre_archivo):
-    resultado = []
+    """
+    Lee el archivo entero con una única lectura, lo decodifica una vez y lo divide en líneas en bloque.
+    """
+    with open(nombre_archivo, 'rb') as archivo:
+        return dividir_lineas(archivo.read().decode('utf-8'))
+
+
+def leer_lineas(nombre_archivo, tamanio_bloque=TAMANIO_DE_BLOQUE):
+    """
+    Generador que lee un archivo línea por línea, sin cargarlo completo en memoria.
+    Con '-' se lee de la entrada estándar, de modo que se puede procesar a medida que llegan los datos.
+    Los archivos se leen de a bloques grandes, que se dividen en líneas de una sola vez; la decodificación y
+    los saltos '\r\n' los resuelve la capa de texto de io, también por bloque.
+    :param nombre_archivo: Ruta del archivo, o '-' para la entrada estándar.
+    :param tamanio_bloque: Caracteres por lectura.
+    """
+    if nombre_archivo == "-":
+        # Línea por línea: un bloque de la entrada estándar esperaría a que lleguen tamanio_bloque caracteres.
+        for linea in sys.stdin:
+            yield linea.rstrip('\n')
+        return
+
     with open(nombre_archivo, 'r', encoding='utf-8') as archivo:
-        for linea in archivo:
-            resultado.append(linea.rstrip('\n'))
-    return resultado
+        # Trozos de la línea que sigue en el próximo bloque; se unen una sola vez, al aparecer su fin, para que
+        # una línea más larga que un bloque no se vuelva a copiar en cada lectura.
+        partes = []
+        while bloque := archivo.read(tamanio_bloque):
+            if "\n" not in bloque:
+                partes.append(bloque)
+                continue
+            lineas = bloque.split("\n")
+            if partes:
+                partes.append(lineas[0])
+                lineas[0] = "".join(partes)
+                partes = []
+            resto = lineas.pop()
+            if resto:
+                partes.append(resto)
+            yield from lineas
+        if partes:
+            yield "".join(partes)
+
+
+def escribir_resultados(resultados, salida, lineas_por_lote=LINEAS_POR_LOTE):
+    """
+    Escribe los resultados numerados a medida que se producen, juntando hasta lineas_por_lote en cada escritura.
+    :param resultados: Iterable de oraciones segmentadas.
+    :param salida: Archivo de texto abierto donde escribir (cualquier objeto con write y flush).
+    :param lineas_por_lote: Resultados por escritura; con 1 cada resultado se escribe apenas se calcula.
+    """
+    numerados = enumerate(resultados, 1)
+    while lote := list(islice(numerados, lineas_por_lote)):
+        salida.write("".join([f"Oración {i}: {oracion}\n" for i, oracion in lote]))
+        if lineas_por_lote == 1:
+            salida.flush()
+    salida.flush()
 
 
 def wrapper_leer_archivo(path_oraciones, path_diccionario):
@@ -30,26 +97,28 @@ def wrapper_leer_archivo(path_oraciones, path_diccionario):
 def parsear_resultados(path):
     """
     Extrae los casos de prueba de un archivo de texto.
-    Busca patrones como 'Palabras: file1.txt, entrada: file2.txt'
+    Busca encabezados como 'Palabras: file1.txt, entrada: file2.txt' (los dos puntos después de 'entrada' son
+    opcionales); las líneas no vacías que siguen a cada encabezado son los resultados esperados del caso.
+    Las rutas de los archivos se toman relativas al directorio del archivo de resultados.
     """
     casos = []
+    directorio = os.path.dirname(path)
+    patron = re.compile(r'Palabras:\s*([^,\s]+),\s*entrada:?\s*(\S+)')
+    caso = None
 
     with open(path, 'r', encoding='utf-8') as f:
-        contenido = f.read()
-
-    patron = r'Palabras:\s*([^,\s]+),\s*entrada:\s*([^\s]+)'
-    matches = re.finditer(patron, contenido)
-
-    for match in matches:
-        palabras_file = match.group(1)
-        entrada_file = match.group(2)
-
-        caso = {
-            "palabras": f"casos/{palabras_file}",
-            "entrada": f"casos/{entrada_file}",
-            "mensajes": []
-        }
-        casos.append(caso)
+        for linea in f:
+            linea = linea.strip()
+            match = patron.match(linea)
+            if match:
+                caso = {
+                    "palabras": os.path.join(directorio, match.group(1)),
+                    "entrada": os.path.join(directorio, match.group(2)),
+                    "mensajes": []
+                }
+                casos.append(caso)
+            elif linea and caso is not None:
+                caso["mensajes"].append(linea)
 
     return casos
 